@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""Бенчмарки клиента, сравнения и конвейера с JSON-эталоном для поиска регрессий.
+
+Запуск из папки lr1:
+    python benchmarks/run_benchmarks.py                    # прогон и сверка с benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --update-baseline  # записать новый эталон
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+from api_client.providers import configure_endpoint
+from api_client.rapidapi_client import clear_cache, reset_breakers, reset_rate_limits, translate_text
+from analizer.batch import compare_translations_batch
+from analizer.comparator import _calculate_similarity
+from analizer.similarity import SIMILARITY_BACKENDS
+from pipeline.corpus import run_pipeline
+from benchmarks.stub_server import StubTranslationServer
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SIMILARITY_LENGTHS = (16, 64, 256, 1024)
+
+_WORDS = ("перевод", "текст", "сравнение", "модель", "качество", "слово", "предложение", "язык",
+          "пример", "результат", "быстрый", "новый", "первый", "данные", "ответ", "запрос")
+
+
+def _sample_text(rng: random.Random, length: int) -> str:
+    """Случайный текст из словаря ровно length символов."""
+    words: List[str] = []
+    size = 0
+    while size < length:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def _mutate(rng: random.Random, text: str, rate: float = 0.1) -> str:
+    """Заменяет долю rate слов текста, но не меньше одного (похожий, но не одинаковый перевод)."""
+    words = text.split(" ")
+    for position in rng.sample(range(len(words)), max(1, round(len(words) * rate))):
+        words[position] = rng.choice([word for word in _WORDS if word != words[position]])
+    return " ".join(words)
+
+
+def _percentile(values: Sequence[float], percent: float) -> float:
+    """Перцентиль percent (0-100) по ближайшему рангу."""
+    ordered = sorted(values)
+    rank = math.ceil(percent / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def _reset_client(*api_urls: str) -> None:
+    """Сбрасывает кэш, лимиты и выключатели клиента, чтобы прогоны не влияли друг на друга.
+
+    С api_urls (URL заменителя) снимает лимит частоты настоящего провайдера: бенчмарк меряет сам клиент.
+    """
+    for api_url in api_urls:
+        configure_endpoint(api_url, max_requests_per_second=0)
+    clear_cache()
+    reset_rate_limits()
+    reset_breakers()
+
+
+def bench_translate_text(api_url: str, requests: int = 200, concurrency: int = 8) -> Dict[str, Any]:
+    """Пропускная способность и перцентили задержки translate_text.
+
+    Что делаю:
+        Отправляю requests уникальных текстов (мимо кэша) из concurrency потоков
+        и замеряю время каждого вызова.
+
+    Вход:
+        api_url: URL заменителя провайдера,
+        requests: число вызовов,
+        concurrency: число потоков.
+
+    Возвращаю:
+        Словарь {'requests', 'concurrency', 'throughput_per_sec', 'p50_ms', 'p95_ms',
+                 'p99_ms', 'success_rate'}.
+    """
+    _reset_client(api_url)
+
+    def call(index: int) -> Any:
+        started = time.perf_counter()
+        result = translate_text(api_url, f"benchmark segment {index}", "en", "ru")
+        return time.perf_counter() - started, "error" not in result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(call, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency * 1000 for latency, _ in samples]
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "throughput_per_sec": requests / elapsed,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "success_rate": sum(ok for _, ok in samples) / requests,
+    }
+
+
+def bench_similarity(lengths: Sequence[int] = SIMILARITY_LENGTHS, budget: int = 20000,
+                     repeats: int = 3, seed: int = 0) -> Dict[str, Any]:
+    """Время _calculate_similarity на пару текстов разной длины для каждого алгоритма.
+
+    Что делаю:
+        Для каждой длины строю пару похожих текстов (10% слов заменено) и
+        вызываю _calculate_similarity budget / длина раз; из repeats прогонов
+        беру лучший, чтобы убрать шум планировщика.
+
+    Вход:
+        lengths: длины текстов в символах,
+        budget: сколько символов обработать за прогон (задаёт число вызовов),
+        repeats: число прогонов,
+        seed: зерно генератора текстов.
+
+    Возвращаю:
+        Словарь вида {'indel.len_256_us': микросекунды на вызов, ...}.
+    """
+    rng = random.Random(seed)
+    pairs = {}
+    for length in lengths:
+        text = _sample_text(rng, length)
+        pairs[length] = (text, _mutate(rng, text))
+
+    results: Dict[str, Any] = {}
+    for backend in sorted(SIMILARITY_BACKENDS):
+        for length, (text_a, text_b) in pairs.items():
+            number = max(3, budget // length)
+            best = float("inf")
+            for _ in range(repeats):
+                started = time.perf_counter()
+                for _ in range(number):
+                    _calculate_similarity(text_a, text_b, backend)
+                best = min(best, time.perf_counter() - started)
+            results[f"{backend}.len_{length}_us"] = best / number * 1e6
+    return results
+
+
+def bench_batch(pairs: int = 200_000, length: int = 60, repeats: int = 3, seed: int = 0) -> Dict[str, Any]:
+    """Пропускная способность compare_translations_batch со схожестью indel.
+
+    Что делаю:
+        Строю pairs пар похожих текстов около length символов (10% слов
+        заменено) и сравниваю их одним вызовом; из repeats прогонов беру лучший.
+
+    Вход:
+        pairs: число пар,
+        length: длина текстов в символах,
+        repeats: число прогонов,
+        seed: зерно генератора текстов.
+
+    Возвращаю:
+        Словарь {'pairs', 'length', 'pairs_per_sec'}.
+    """
+    rng = random.Random(seed)
+    texts_a = [_sample_text(rng, rng.randint(length // 2, length * 3 // 2)) for _ in range(pairs)]
+    texts_b = [_mutate(rng, text) for text in texts_a]
+
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        compare_translations_batch(texts_a, texts_b, backend="indel")
+        best = min(best, time.perf_counter() - started)
+    return {"pairs": pairs, "length": length, "pairs_per_sec": pairs / best}
+
+
+def bench_pipeline(api_a_url: str, api_b_url: str, segments: int = 500, batch_size: int = 100,
+                   seed: int = 0) -> Dict[str, Any]:
+    """Пропускная способность run_pipeline на корпусе из segments уникальных сегментов.
+
+    Вход:
+        api_a_url: URL первого заменителя,
+        api_b_url: URL второго заменителя,
+        segments: размер корпуса,
+        batch_size: размер пачки конвейера,
+        seed: зерно генератора текстов.
+
+    Возвращаю:
+        Словарь {'segments', 'batch_size', 'segments_per_sec'}.
+    """
+    _reset_client(api_a_url, api_b_url)
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "corpus.txt")
+        with open(corpus, "w", encoding="utf-8") as f:
+            for index in range(segments):
+                f.write(f"{index} {_sample_text(rng, 40)}\n")
+
+        started = time.perf_counter()
+        processed = run_pipeline(corpus, os.path.join(tmp, "out.jsonl"), api_a_url, api_b_url, "en", "ru",
+                                 batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+    return {"segments": processed, "batch_size": batch_size, "segments_per_sec": processed / elapsed}
+
+
+def run_all(quick: bool = False, latency: float = 0.005, jitter: float = 0.005,
+            error_rate: float = 0.05, seed: int = 0) -> Dict[str, Any]:
+    """Прогоняет все бенчмарки против локальных заменителей провайдеров.
+
+    Вход:
+        quick: уменьшенные объёмы (для проверки, что всё работает),
+        latency: базовая задержка ответа заменителя в секундах,
+        jitter: случайная добавка к задержке (до jitter секунд),
+        error_rate: доля ответов 503 в сценарии с ошибками,
+        seed: зерно заменителей и генераторов текстов.
+
+    Возвращаю:
+        Словарь {'meta': {...}, 'results': {имя бенчмарка: {метрика: значение}}}.
+    """
+    scale = 5 if quick else 1
+    results: Dict[str, Any] = {}
+
+    with StubTranslationServer(latency, jitter, seed=seed) as server:
+        results["translate_text.mymemory"] = bench_translate_text(server.mymemory_url, 200 // scale)
+        results["translate_text.lingva"] = bench_translate_text(server.lingva_url, 200 // scale)
+        results["pipeline"] = bench_pipeline(server.lingva_url, server.mymemory_url, 500 // scale)
+
+    with StubTranslationServer(latency, jitter, error_rate=error_rate, seed=seed) as server:
+        errors = bench_translate_text(server.mymemory_url, 200 // scale)
+    # Хвост задержек здесь - случайные паузы повторов, он слишком шумный для сверки с эталоном
+    results["translate_text.errors"] = {metric: value for metric, value in errors.items()
+                                        if metric not in ("p95_ms", "p99_ms")}
+
+    results["similarity"] = bench_similarity(budget=20000 // scale)
+    results["compare_translations_batch"] = bench_batch(200_000 // scale)
+
+    meta = {"python": platform.python_version(), "machine": platform.machine(), "cpu_count": os.cpu_count(),
+            "quick": quick, "latency": latency, "jitter": jitter, "error_rate": error_rate, "seed": seed}
+    return {"meta": meta, "results": results}
+
+
+# Поля meta, от которых зависят времена: эталон с другой машины или Python сравнивать нельзя
+MACHINE_FIELDS = ("python", "machine", "cpu_count")
+# Параметры прогона: при расхождении сравнение возможно, но ненадёжно
+RUN_FIELDS = ("quick", "latency", "jitter", "error_rate", "seed")
+
+
+def meta_mismatches(current: Dict[str, Any], baseline: Dict[str, Any], fields: Sequence[str]) -> List[str]:
+    """Поля fields, значения которых в meta прогона и эталона различаются (в виде 'поле: эталон -> прогон')."""
+    current_meta, baseline_meta = current.get("meta", {}), baseline.get("meta", {})
+    return [f"{field}: {baseline_meta.get(field)} -> {current_meta.get(field)}"
+            for field in fields if baseline_meta.get(field) != current_meta.get(field)]
+
+
+def _direction(metric: str) -> int:
+    """+1 - больше значит лучше, -1 - меньше значит лучше, 0 - метрика не сравнивается."""
+    if metric.endswith("_per_sec") or metric.endswith("success_rate"):
+        return 1
+    if metric.endswith("_ms") or metric.endswith("_us"):
+        return -1
+    return 0
+
+
+def compare_to_baseline(current: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float = 0.3) -> List[Dict[str, Any]]:
+    """Ищет метрики, ухудшившиеся относительно эталона больше чем на tolerance.
+
+    Вход:
+        current: результат run_all,
+        baseline: сохранённый эталон того же формата,
+        tolerance: допустимое относительное ухудшение (0.3 - на 30%).
+
+    Возвращаю:
+        Список регрессий {'benchmark', 'metric', 'baseline', 'current', 'change'},
+        где change - относительное изменение в сторону ухудшения.
+    """
+    regressions: List[Dict[str, Any]] = []
+    for name, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            direction = _direction(metric)
+            reference = baseline.get("results", {}).get(name, {}).get(metric)
+            if not direction or not reference:
+                continue
+            change = (reference - value) / reference if direction > 0 else (value - reference) / reference
+            if change > tolerance:
+                regressions.append({"benchmark": name, "metric": metric, "baseline": reference,
+                                    "current": value, "change": change})
+    return regressions
+
+
+def _load(path: str) -> Optional[Dict[str, Any]]:
+    """Читает JSON-файл или возвращает None, если его нет."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save(path: str, data: Dict[str, Any]) -> None:
+    """Записывает результат в JSON-файл."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Прогоняет бенчмарки, сверяет с эталоном и возвращает код выхода.
+
+    Код 1 - есть регрессии, 2 - эталон снят на другой машине или версии Python
+    (без --ignore-machine сверка не выполняется).
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарки клиента переводов, сравнения и конвейера")
+    parser.add_argument("--quick", action="store_true", help="уменьшенные объёмы")
+    parser.add_argument("--output", help="куда записать результаты прогона (JSON)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="файл эталона")
+    parser.add_argument("--update-baseline", action="store_true", help="записать результаты как новый эталон")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="допустимое ухудшение (0.3 - 30%%)")
+    parser.add_argument("--latency", type=float, default=0.005, help="задержка заменителя, с")
+    parser.add_argument("--jitter", type=float, default=0.005, help="случайная добавка к задержке, с")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="доля ошибок в сценарии с ошибками")
+    parser.add_argument("--seed", type=int, default=0, help="зерно случайности")
+    parser.add_argument("--ignore-machine", action="store_true",
+                        help="сверять с эталоном, снятым на другой машине или версии Python")
+    args = parser.parse_args(argv)
+
+    current = run_all(args.quick, args.latency, args.jitter, args.error_rate, args.seed)
+    for name, metrics in current["results"].items():
+        print(name, json.dumps({metric: round(value, 3) for metric, value in metrics.items()}, ensure_ascii=False))
+    if args.output:
+        _save(args.output, current)
+    if args.update_baseline:
+        _save(args.baseline, current)
+        print(f"Эталон записан: {args.baseline}")
+        return 0
+
+    baseline = _load(args.baseline)
+    if baseline is None:
+        print(f"Эталон {args.baseline} не найден, сверка пропущена")
+        return 0
+    machine = meta_mismatches(current, baseline, MACHINE_FIELDS)
+    if machine and not args.ignore_machine:
+        print(f"Эталон снят в другом окружении ({', '.join(machine)}), сверка пропущена; "
+              f"обновите его через --update-baseline или сверьте с --ignore-machine")
+        return 2
+    if machine:
+        print(f"Внимание: эталон снят в другом окружении ({', '.join(machine)})")
+    settings = meta_mismatches(current, baseline, RUN_FIELDS)
+    if settings:
+        print(f"Внимание: параметры прогона отличаются от эталона ({', '.join(settings)}), "
+              f"сравнение может быть некорректным")
+
+    regressions = compare_to_baseline(current, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"РЕГРЕССИЯ {regression['benchmark']}.{regression['metric']}: "
+              f"{regression['baseline']:.3f} -> {regression['current']:.3f} ({regression['change']:+.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
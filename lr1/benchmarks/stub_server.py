@@ -0,0 +1,134 @@
+"""Локальный заменитель MyMemory и Lingva для бенчмарков: задержка и доля ошибок настраиваются."""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+MYMEMORY_PATH = "/mymemory/get"
+LINGVA_PREFIX = "/lingva/api/v1/"
+
+
+def stub_translate(text: str, target_lang: str) -> str:
+    """Детерминированный «перевод»: префикс языка у каждой строки (число строк сохраняется)."""
+    return "\n".join(f"[{target_lang}] {line}" for line in text.split("\n"))
+
+
+class StubTranslationServer:
+    """HTTP/1.1 сервер с keep-alive, отвечающий в форматах MyMemory и Lingva.
+
+    MyMemory: GET {url}/mymemory/get?q=...&langpair=en|ru.
+    Lingva: GET {url}/lingva/api/v1/{source}/{target}/{текст}.
+    Перед ответом сервер ждёт latency + случайное время до jitter секунд,
+    а с вероятностью error_rate отвечает кодом error_status. Случайность
+    задаётся seed, поэтому последовательность ошибок воспроизводима.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: int = 0, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Базовый URL сервера вида http://127.0.0.1:port."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def mymemory_url(self) -> str:
+        """URL конечной точки в формате MyMemory (распознаётся клиентом как mymemory)."""
+        return self.url + MYMEMORY_PATH
+
+    @property
+    def lingva_url(self) -> str:
+        """URL конечной точки в формате Lingva (распознаётся клиентом как lingva)."""
+        return self.url + LINGVA_PREFIX.rstrip("/")
+
+    def _decide(self) -> Tuple[float, bool]:
+        """Задержка и признак ошибки для очередного запроса."""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return delay, failed
+
+    def _handler_class(self) -> Any:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Заголовки и тело уходят одним пакетом: иначе задержанный ACK
+            # добавляет к каждому ответу ~40 мс, которых у настоящих серверов нет
+            wbufsize = 64 * 1024
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                delay, failed = stub._decide()
+                if delay > 0:
+                    time.sleep(delay)
+                if failed:
+                    self._send(stub.error_status, b"stub error", "text/plain")
+                    return
+
+                parts = urlsplit(self.path)
+                if parts.path == MYMEMORY_PATH:
+                    query = parse_qs(parts.query)
+                    target_lang = query.get("langpair", ["en|ru"])[0].split("|")[-1]
+                    payload = {"responseStatus": 200,
+                               "responseData": {"translatedText": stub_translate(query.get("q", [""])[0], target_lang)}}
+                elif parts.path.startswith(LINGVA_PREFIX):
+                    pieces = parts.path[len(LINGVA_PREFIX):].split("/", 2)
+                    if len(pieces) < 3:
+                        self._send(404, b"not found", "text/plain")
+                        return
+                    payload = {"translation": stub_translate(unquote(pieces[2]), pieces[1])}
+                else:
+                    self._send(404, b"not found", "text/plain")
+                    return
+                self._send(200, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json")
+
+            def _send(self, status: int, body: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "StubTranslationServer":
+        """Запускает сервер в фоновом потоке."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер и закрывает сокет."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubTranslationServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -0,0 +1,207 @@
+"""Выравнивание переводов по предложениям и посегментная схожесть."""
+
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from config import CONFIG
+from analizer.similarity import get_similarity_backend
+
+# Конец предложения (знак и пробелы после него) или перевод строки
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…。！？])\s+|\s*\n\s*")
+
+# Допустимые шаги выравнивания (предложений первого текста, второго) и их штрафы:
+# -log априорной вероятности по Гейлу и Черчу (1-1 - 0.89, 2-1 и 1-2 - 0.089, 1-0 и 0-1 - 0.01)
+_BEADS: Tuple[Tuple[int, int, float], ...] = (
+    (1, 1, 0.12), (2, 1, 2.42), (1, 2, 2.42), (1, 0, 4.6), (0, 1, 4.6),
+)
+# Дисперсия отношения длин переведённых предложений (оценка Гейла и Черча)
+_LENGTH_VARIANCE = 6.8
+
+# Пара выровненных групп: (начало, конец) по предложениям первого и второго текста
+Bead = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+def split_sentences(text: str) -> List[str]:
+    """Разбивает текст на предложения по знакам конца предложения и переводам строк."""
+    return [sentence for sentence in _SENTENCE_BOUNDARY.split((text or "").strip()) if sentence]
+
+
+def _bead_cost(length_a: int, length_b: int, ratio: float) -> float:
+    """Цена сопоставления групп длиной length_a и length_b символов (меньше - правдоподобнее)."""
+    expected = length_a * ratio
+    delta = (length_b - expected) / math.sqrt(_LENGTH_VARIANCE * (expected + length_b) / 2 + 1)
+    return delta * delta / 2
+
+
+def align_sentences(sentences_a: List[str], sentences_b: List[str], band: int = 10) -> List[Bead]:
+    """Выравнивает предложения двух переводов по длинам (алгоритм Гейла - Черча в полосе).
+
+    Что делаю:
+        Динамическим программированием ищу самую дешёвую последовательность
+        шагов 1-1, 2-1, 1-2, 1-0 и 0-1, где цена шага - отклонение длины
+        группы второго текста от ожидаемой (ожидаемое отношение длин - отношение
+        длин текстов целиком) плюс штраф за тип шага. Считаю только клетки
+        в полосе шириной band вокруг диагонали, поэтому время линейно по числу
+        предложений.
+
+    Вход:
+        sentences_a: предложения первого перевода,
+        sentences_b: предложения второго перевода,
+        band: полуширина полосы в предложениях.
+
+    Возвращаю:
+        Список шагов ((начало, конец) в sentences_a, (начало, конец) в sentences_b)
+        по порядку; пустой диапазон означает предложение без пары.
+    """
+    count_a, count_b = len(sentences_a), len(sentences_b)
+    prefix_a, prefix_b = [0], [0]
+    for sentence in sentences_a:
+        prefix_a.append(prefix_a[-1] + len(sentence))
+    for sentence in sentences_b:
+        prefix_b.append(prefix_b[-1] + len(sentence))
+    ratio = prefix_b[-1] / prefix_a[-1] if prefix_a[-1] else 1.0
+    # Шагам 2-1 и 1-2 нужна полоса хотя бы в 2 предложения
+    band = max(band, 2)
+
+    def columns(i: int) -> range:
+        center = i * count_b // count_a if count_a else count_b
+        return range(max(0, center - band), min(count_b, center + band) + 1)
+
+    # cost[(i, j)] = (цена, шаг, которым пришли в клетку)
+    cost: Dict[Tuple[int, int], Tuple[float, Tuple[int, int]]] = {(0, 0): (0.0, (0, 0))}
+    for i in range(count_a + 1):
+        for j in columns(i):
+            if i == 0 and j == 0:
+                continue
+            best: Optional[Tuple[float, Tuple[int, int]]] = None
+            for step_a, step_b, penalty in _BEADS:
+                previous = cost.get((i - step_a, j - step_b))
+                if previous is None:
+                    continue
+                total = previous[0] + penalty
+                if step_a and step_b:
+                    total += _bead_cost(prefix_a[i] - prefix_a[i - step_a], prefix_b[j] - prefix_b[j - step_b], ratio)
+                if best is None or total < best[0]:
+                    best = (total, (step_a, step_b))
+            if best is not None:
+                cost[(i, j)] = best
+
+    if (count_a, count_b) not in cost:
+        # Конец вне полосы (очень разное число предложений) - расширяю полосу
+        return align_sentences(sentences_a, sentences_b, band=max(band * 2, abs(count_a - count_b) + 2))
+
+    beads: List[Bead] = []
+    i, j = count_a, count_b
+    while i or j:
+        step_a, step_b = cost[(i, j)][1]
+        beads.append(((i - step_a, i), (j - step_b, j)))
+        i, j = i - step_a, j - step_b
+    beads.reverse()
+    return beads
+
+
+class SegmentComparator:
+    """Посегментное сравнение переводов с запоминанием схожести пар предложений.
+
+    Схожесть каждой выровненной пары запоминается (LRU до max_entries пар),
+    поэтому при повторном сравнении отредактированного текста заново
+    считаются только изменившиеся сегменты, а выравнивание по длинам
+    дёшево (линейно) и пересчитывается целиком.
+    """
+
+    def __init__(self, max_entries: int = 4096, band: int = 10) -> None:
+        self.max_entries = max_entries
+        self.band = band
+        self._scores: "OrderedDict[Tuple[str, str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _similarity(self, text_a: str, text_b: str, backend: str) -> Tuple[float, bool]:
+        """Схожесть пары сегментов и признак того, что она посчитана заново."""
+        normalized_a, normalized_b = text_a.lower().strip(), text_b.lower().strip()
+        key = (backend, normalized_a, normalized_b)
+        with self._lock:
+            score = self._scores.get(key)
+            if score is not None:
+                self._scores.move_to_end(key)
+                self.hits += 1
+                return score, False
+            self.misses += 1
+
+        if not normalized_a or not normalized_b:
+            score = 0.0
+        elif normalized_a == normalized_b:
+            score = 1.0
+        else:
+            score = get_similarity_backend(backend)(normalized_a, normalized_b, 0.0)
+        if self.max_entries > 0:
+            with self._lock:
+                self._scores[key] = score
+                self._scores.move_to_end(key)
+                while len(self._scores) > self.max_entries:
+                    self._scores.popitem(last=False)
+        return score, True
+
+    def compare(self, text_a: str, text_b: str, backend: Optional[str] = None) -> Dict[str, Any]:
+        """Сравнивает два перевода по выровненным предложениям.
+
+        Что делаю:
+            Разбиваю оба текста на предложения, выравниваю их по длинам
+            (align_sentences) и считаю схожесть каждой пары групп; группы без
+            пары получают схожесть 0. Общая схожесть - среднее по сегментам,
+            взвешенное по длине большей группы.
+
+        Вход:
+            text_a: первый перевод,
+            text_b: второй перевод,
+            backend: алгоритм схожести (по умолчанию CONFIG.similarity_backend).
+
+        Возвращаю:
+            словарь:
+                'similarity' (float) - взвешенная схожесть (0-1),
+                'mean_similarity' (float) - простое среднее по сегментам,
+                'min_similarity' (float) - схожесть самого несхожего сегмента,
+                'unaligned' (int) - число сегментов без пары,
+                'recomputed' (int) - сколько сегментов посчитано заново (не из памяти),
+                'segments' (list) - {'text_a', 'text_b', 'sentences_a', 'sentences_b',
+                    'similarity'} для каждого сегмента по порядку.
+        """
+        backend = backend or CONFIG.similarity_backend
+        sentences_a, sentences_b = split_sentences(text_a), split_sentences(text_b)
+        segments: List[Dict[str, Any]] = []
+        recomputed = 0
+        for (start_a, end_a), (start_b, end_b) in align_sentences(sentences_a, sentences_b, self.band):
+            segment_a = " ".join(sentences_a[start_a:end_a])
+            segment_b = " ".join(sentences_b[start_b:end_b])
+            score, fresh = self._similarity(segment_a, segment_b, backend)
+            recomputed += fresh
+            segments.append({"text_a": segment_a, "text_b": segment_b, "sentences_a": [start_a, end_a],
+                             "sentences_b": [start_b, end_b], "similarity": score})
+
+        weights = [max(len(segment["text_a"]), len(segment["text_b"])) for segment in segments]
+        scores = [segment["similarity"] for segment in segments]
+        return {
+            "similarity": sum(w * s for w, s in zip(weights, scores)) / sum(weights) if sum(weights) else 0.0,
+            "mean_similarity": sum(scores) / len(scores) if scores else 0.0,
+            "min_similarity": min(scores) if scores else 0.0,
+            "unaligned": sum(1 for segment in segments if not segment["text_a"] or not segment["text_b"]),
+            "recomputed": recomputed,
+            "segments": segments,
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счётчики памяти сегментов: {'entries', 'hits', 'misses'}."""
+        with self._lock:
+            return {"entries": len(self._scores), "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        """Очищает запомненные схожести и счётчики."""
+        with self._lock:
+            self._scores.clear()
+            self.hits = self.misses = 0
+
+
+SEGMENT_COMPARATOR = SegmentComparator(CONFIG.alignment_cache_size)
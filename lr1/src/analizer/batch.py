@@ -0,0 +1,161 @@
+"""Пакетное сравнение переводов над колонками (списками или массивами NumPy)."""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from config import CONFIG
+from analizer.comparator import ngram_metrics_batch
+from analizer.similarity import get_similarity_backend, indel_ratio, indel_ratio_batch, real_quick_ratio
+
+# Классы ошибок в колонке 'error_class'
+ERROR_NONE = 0
+ERROR_ONE = 1
+ERROR_BOTH = 2
+
+
+def to_columns(translations: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Раскладывает список результатов translate_text по колонкам.
+
+    Вход:
+        translations: список словарей результатов перевода.
+
+    Возвращаю:
+        Словарь колонок: 'text' (object), 'confidence' (float64), 'error' (bool), 'api' (object).
+    """
+    count = len(translations)
+    texts = np.empty(count, dtype=object)
+    apis = np.empty(count, dtype=object)
+    confidence = np.zeros(count, dtype=np.float64)
+    error = np.zeros(count, dtype=bool)
+    for index, translation in enumerate(translations):
+        texts[index] = translation.get("translated_text", "")
+        apis[index] = translation.get("api", "Unknown")
+        confidence[index] = translation.get("confidence", 0)
+        error[index] = "error" in translation
+    return {"text": texts, "confidence": confidence, "error": error, "api": apis}
+
+
+def _as_bool(values: Optional[Sequence[bool]], count: int) -> np.ndarray:
+    """Приводит колонку флагов к массиву bool длины count."""
+    if values is None:
+        return np.zeros(count, dtype=bool)
+    return np.asarray(values, dtype=bool)
+
+
+def _as_float(values: Optional[Sequence[float]], count: int) -> np.ndarray:
+    """Приводит колонку чисел к массиву float64 длины count."""
+    if values is None:
+        return np.zeros(count, dtype=np.float64)
+    return np.asarray(values, dtype=np.float64)
+
+
+def compare_translations_batch(texts_a: Sequence[str], texts_b: Sequence[str],
+                               confidence_a: Optional[Sequence[float]] = None,
+                               confidence_b: Optional[Sequence[float]] = None,
+                               error_a: Optional[Sequence[bool]] = None,
+                               error_b: Optional[Sequence[bool]] = None,
+                               backend: Optional[str] = None, score_cutoff: float = 0.0,
+                               with_similarity: bool = True, with_ngrams: bool = False) -> Dict[str, np.ndarray]:
+    """Сравнивает массивы пар переводов за один проход.
+
+    Что делаю:
+        Считаю длины и число слов каждого текста ровно один раз, а разницы,
+        классы ошибок и маски - векторно в NumPy. Схожесть считаю только
+        для пар, где оба перевода успешны: для indel - векторно
+        (indel_ratio_batch), для других алгоритмов - по парам, причём
+        одинаковые после нормализации пары получают 1.0 без вызова
+        алгоритма, а повторяющиеся считаются один раз. При score_cutoff > 0
+        пары, не проходящие оценку по длинам, отбрасываются заранее.
+        Значения совпадают с compare_translations для каждой пары.
+
+    Вход:
+        texts_a: переводы первого API,
+        texts_b: переводы второго API,
+        confidence_a: уверенность первого API (по умолчанию 0),
+        confidence_b: уверенность второго API (по умолчанию 0),
+        error_a: флаги ошибки первого API (по умолчанию нет ошибок),
+        error_b: флаги ошибки второго API (по умолчанию нет ошибок),
+        backend: алгоритм схожести (по умолчанию CONFIG.similarity_backend),
+        score_cutoff: схожесть ниже порога записывается как 0.0,
+        with_similarity: False - не считать схожесть (колонка заполнена нулями),
+        with_ngrams: True - добавить колонки chrF и BLEU (ngram_metrics_batch).
+
+    Возвращаю:
+        Словарь колонок NumPy длины n:
+            'similarity' (float64), 'length_diff' (int64), 'word_count_diff' (int64),
+            'confidence_diff' (float64), 'both_successful' (bool),
+            'error_class' (int8: ERROR_NONE, ERROR_ONE, ERROR_BOTH),
+            'chrf' и 'bleu' (float64, только при with_ngrams; 0 для пар с ошибкой).
+    """
+    count = len(texts_a)
+    if len(texts_b) != count:
+        raise ValueError("texts_a и texts_b должны быть одной длины")
+
+    texts_a = [text or "" for text in texts_a]
+    texts_b = [text or "" for text in texts_b]
+    failed_a = _as_bool(error_a, count)
+    failed_b = _as_bool(error_b, count)
+    both_successful = ~failed_a & ~failed_b
+    error_class = failed_a.astype(np.int8) + failed_b.astype(np.int8)
+
+    length_a = np.fromiter(map(len, texts_a), dtype=np.int64, count=count)
+    length_b = np.fromiter(map(len, texts_b), dtype=np.int64, count=count)
+    words_a = np.fromiter((len(text.split()) for text in texts_a), dtype=np.int64, count=count)
+    words_b = np.fromiter((len(text.split()) for text in texts_b), dtype=np.int64, count=count)
+
+    length_diff = np.where(both_successful, np.abs(length_a - length_b), 0)
+    word_count_diff = np.where(both_successful, np.abs(words_a - words_b), 0)
+    confidence_diff = np.where(both_successful,
+                               np.abs(_as_float(confidence_a, count) - _as_float(confidence_b, count)), 0.0)
+
+    similarity = np.zeros(count, dtype=np.float64)
+    if with_similarity:
+        candidates = np.flatnonzero(both_successful & (length_a > 0) & (length_b > 0))
+        values = _similarity_for(candidates, texts_a, texts_b, backend, score_cutoff)
+        similarity[candidates] = values
+
+    columns = {
+        "similarity": similarity,
+        "length_diff": length_diff,
+        "word_count_diff": word_count_diff,
+        "confidence_diff": confidence_diff,
+        "both_successful": both_successful,
+        "error_class": error_class,
+    }
+    if with_ngrams:
+        successful = np.flatnonzero(both_successful)
+        metrics = ngram_metrics_batch([texts_a[index] for index in successful],
+                                      [texts_b[index] for index in successful])
+        for name, values in metrics.items():
+            column = np.zeros(count, dtype=np.float64)
+            column[successful] = values
+            columns[name] = column
+    return columns
+
+
+def _similarity_for(indices: np.ndarray, texts_a: List[str], texts_b: List[str],
+                    backend: Optional[str], score_cutoff: float) -> np.ndarray:
+    """Считает схожесть для выбранных пар: indel - векторно, остальные алгоритмы - по парам с дедупликацией."""
+    similarity = get_similarity_backend(backend or CONFIG.similarity_backend)
+    normalized_a = [texts_a[index].lower().strip() for index in indices]
+    normalized_b = [texts_b[index].lower().strip() for index in indices]
+    if similarity is indel_ratio:
+        return indel_ratio_batch(normalized_a, normalized_b, score_cutoff)
+
+    values = np.zeros(len(indices), dtype=np.float64)
+    seen: Dict[Tuple[str, str], float] = {}
+
+    for position, (text_a, text_b) in enumerate(zip(normalized_a, normalized_b)):
+        if text_a == text_b:
+            values[position] = 1.0
+            continue
+        if not text_a or not text_b:
+            continue
+        if score_cutoff > 0 and real_quick_ratio(text_a, text_b) < score_cutoff:
+            continue
+        key = (text_a, text_b)
+        value = seen.get(key)
+        if value is None:
+            value = seen[key] = similarity(text_a, text_b, score_cutoff)
+        values[position] = value
+
+    return values
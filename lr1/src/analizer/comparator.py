@@ -1,18 +1,36 @@
 """Сравнение результатов переводов двух API."""
 
-from typing import Dict, Any, List
-import difflib
+import math
+from collections import Counter
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+from config import CONFIG
+from analizer.alignment import SEGMENT_COMPARATOR
+from analizer.normalized import NormalizedText, as_normalized, normalize_translation
+from analizer.profiling import PROFILER
+from analizer.similarity import get_similarity_backend
 
 
-def compare_translations(translation_a: Dict[str, Any], translation_b: Dict[str, Any]) -> Dict[str, Any]:
+def compare_translations(translation_a: Dict[str, Any], translation_b: Dict[str, Any],
+                         normalized_a: Optional[NormalizedText] = None,
+                         normalized_b: Optional[NormalizedText] = None,
+                         aligned: Optional[bool] = None) -> Dict[str, Any]:
     """Сравнивает результаты переводов двух API.
 
     Что делаю:
         Анализирую переводы с двух разных API и вычисляю метрики сравнения.
+        Разобранные тексты можно передать готовыми (normalize_translation),
+        чтобы не разбирать перевод заново для каждой пары и оценки качества.
+        В режиме aligned выравниваю переводы по предложениям и считаю
+        схожесть посегментно (SEGMENT_COMPARATOR): общая схожесть - взвешенное
+        среднее по сегментам, а при повторном сравнении отредактированного
+        текста пересчитываются только изменившиеся сегменты.
 
     Вход:
         translation_a: результат первого API (словарь),
-        translation_b: результат второго API (словарь).
+        translation_b: результат второго API (словарь),
+        normalized_a: разобранный текст первого перевода (по умолчанию разбираю здесь),
+        normalized_b: разобранный текст второго перевода (по умолчанию разбираю здесь),
+        aligned: сравнивать по выровненным предложениям (по умолчанию CONFIG.aligned_comparison).
 
     Возвращаю:
         словарь с метриками сравнения:
@@ -22,7 +40,15 @@ def compare_translations(translation_a: Dict[str, Any], translation_b: Dict[str,
             'api_a_name' (str) - название первого API,
             'api_b_name' (str) - название второго API,
             'both_successful' (bool) - успешны ли оба перевода,
-            'confidence_diff' (int) - разница в уверенности API.
+            'confidence_diff' (int) - разница в уверенности API,
+            'segment_similarity' (list) - схожесть по участкам исходного текста
+                {'start', 'end', 'similarity'}, если оба длинных перевода
+                выполнены по сегментам (поле segments результата),
+            'alignment' (dict) - в режиме aligned: посегментные и общие оценки
+                (см. SegmentComparator.compare),
+            'chrf' (float), 'bleu' (float) - согласие переводов по n-граммам
+                символов и слов (0-1, см. ngram_metrics), если включён
+                CONFIG.ngram_metrics.
     """
     # Проверяем успешность переводов
     has_error_a = "error" in translation_a
@@ -55,14 +81,23 @@ def compare_translations(translation_a: Dict[str, Any], translation_b: Dict[str,
     # Извлекаем переведенные тексты
     text_a = translation_a.get("translated_text", "")
     text_b = translation_b.get("translated_text", "")
+    with PROFILER.stage("normalization"):
+        normalized_a = normalized_a or NormalizedText(text_a)
+        normalized_b = normalized_b or NormalizedText(text_b)
     
     # Вычисляем метрики
-    similarity = _calculate_similarity(text_a, text_b)
-    length_diff = abs(len(text_a) - len(text_b))
-    word_count_diff = abs(len(text_a.split()) - len(text_b.split()))
+    alignment = None
+    if aligned if aligned is not None else CONFIG.aligned_comparison:
+        with PROFILER.stage("alignment"):
+            alignment = SEGMENT_COMPARATOR.compare(normalized_a.text, normalized_b.text)
+        similarity = alignment["similarity"]
+    else:
+        similarity = _calculate_similarity(normalized_a, normalized_b)
+    length_diff = abs(normalized_a.char_count - normalized_b.char_count)
+    word_count_diff = abs(normalized_a.word_count - normalized_b.word_count)
     confidence_diff = abs(translation_a.get("confidence", 0) - translation_b.get("confidence", 0))
     
-    return {
+    result = {
         "similarity": similarity,
         "length_diff": length_diff,
         "word_count_diff": word_count_diff,
@@ -75,44 +110,370 @@ def compare_translations(translation_a: Dict[str, Any], translation_b: Dict[str,
         "source_language_a": translation_a.get("source_language", "Unknown"),
         "source_language_b": translation_b.get("source_language", "Unknown")
     }
+    if alignment is not None:
+        result["alignment"] = alignment
+    if CONFIG.ngram_metrics:
+        with PROFILER.stage("ngrams"):
+            result.update(ngram_metrics(normalized_a, normalized_b))
+    if translation_a.get("segments") and translation_b.get("segments"):
+        result["segment_similarity"] = _segment_similarity(translation_a["segments"], translation_b["segments"])
+    return result
+
 
+def _align_segments(segments_a: List[Dict[str, Any]],
+                    segments_b: List[Dict[str, Any]]) -> List[Tuple[int, int, str, str]]:
+    """Сопоставляет сегменты двух переводов одного текста по границам в исходном тексте.
+
+    Что делаю:
+        Провайдеры режут текст по разным лимитам, но всегда по границам
+        предложений исходного текста. Двумя указателями набираю группы
+        сегментов каждого перевода, пока их концы не совпадут, - получаю
+        самое мелкое общее разбиение исходного текста за линейное время.
+        Если концы так и не совпали, остаток обоих переводов идёт одной группой.
 
-def _calculate_similarity(text_a: str, text_b: str) -> float:
+    Вход:
+        segments_a: сегменты первого перевода ({'start', 'end', 'translated_text'}),
+        segments_b: сегменты второго перевода.
+
+    Возвращаю:
+        Список (start, end, текст первого перевода, текст второго перевода).
+    """
+    groups: List[Tuple[int, int, str, str]] = []
+    i = j = 0
+    while i < len(segments_a) and j < len(segments_b):
+        group_a, group_b = [segments_a[i]], [segments_b[j]]
+        while group_a[-1]["end"] != group_b[-1]["end"]:
+            if group_a[-1]["end"] < group_b[-1]["end"] and i + 1 < len(segments_a):
+                i += 1
+                group_a.append(segments_a[i])
+            elif group_b[-1]["end"] < group_a[-1]["end"] and j + 1 < len(segments_b):
+                j += 1
+                group_b.append(segments_b[j])
+            else:
+                group_a.extend(segments_a[i + 1:])
+                group_b.extend(segments_b[j + 1:])
+                i, j = len(segments_a), len(segments_b)
+                break
+        groups.append((min(group_a[0]["start"], group_b[0]["start"]), max(group_a[-1]["end"], group_b[-1]["end"]),
+                       " ".join(segment["translated_text"] for segment in group_a),
+                       " ".join(segment["translated_text"] for segment in group_b)))
+        i += 1
+        j += 1
+    return groups
+
+
+def _segment_similarity(segments_a: List[Dict[str, Any]], segments_b: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Считает схожесть переводов по сопоставленным участкам исходного текста."""
+    return [{"start": start, "end": end, "similarity": _calculate_similarity(text_a, text_b)}
+            for start, end, text_a, text_b in _align_segments(segments_a, segments_b)]
+
+
+def _calculate_similarity(text_a: Union[str, NormalizedText], text_b: Union[str, NormalizedText],
+                          backend: Optional[str] = None, score_cutoff: float = 0.0) -> float:
     """Вычисляет схожесть двух текстов.
     
     Что делаю:
-        Использую SequenceMatcher для вычисления схожести текстов.
+        Нормализую тексты и считаю схожесть выбранным алгоритмом:
+        'indel' (быстрый нормализованный Indel/LCS, по умолчанию) или
+        'sequence_matcher' (эталонный difflib.SequenceMatcher).
     
     Вход:
-        text_a: первый текст (строка),
-        text_b: второй текст (строка).
+        text_a: первый текст (строка или уже разобранный NormalizedText),
+        text_b: второй текст (строка или уже разобранный NormalizedText),
+        backend: имя алгоритма (по умолчанию CONFIG.similarity_backend),
+        score_cutoff: схожесть ниже этого порога возвращается как 0.0.
     
     Возвращаю:
         Коэффициент схожести от 0 до 1 (float).
     """
-    if not text_a or not text_b:
+    # Нормализуем тексты для лучшего сравнения (если они ещё не разобраны)
+    if isinstance(text_a, NormalizedText) and isinstance(text_b, NormalizedText):
+        normalized_a, normalized_b = text_a, text_b
+    else:
+        with PROFILER.stage("normalization"):
+            normalized_a, normalized_b = as_normalized(text_a), as_normalized(text_b)
+    if not normalized_a.text or not normalized_b.text:
         return 0.0
-    
-    # Нормализуем тексты для лучшего сравнения
-    normalized_a = text_a.lower().strip()
-    normalized_b = text_b.lower().strip()
-    
-    if normalized_a == normalized_b:
-        return 1.0
-    
-    # Используем difflib для вычисления схожести
-    matcher = difflib.SequenceMatcher(None, normalized_a, normalized_b)
-    return matcher.ratio()
+    return _normalized_similarity(normalized_a, normalized_b, backend, score_cutoff)
+
+
+def _normalized_similarity(normalized_a: NormalizedText, normalized_b: NormalizedText,
+                           backend: Optional[str] = None, score_cutoff: float = 0.0) -> float:
+    """Схожесть уже разобранных текстов (без повторной нормализации)."""
+    with PROFILER.stage("similarity"):
+        if normalized_a.same_as(normalized_b):
+            return 1.0
+
+        similarity = get_similarity_backend(backend or CONFIG.similarity_backend)
+        return similarity(normalized_a.normalized, normalized_b.normalized, score_cutoff)
+
+
+# chrF: символьные n-граммы 1..6 без пробелов, F-мера с весом полноты beta = 2
+CHRF_ORDER = 6
+CHRF_BETA = 2.0
+# BLEU: словесные n-граммы 1..4 со сглаживанием +1 для n > 1 (Лин и Ох)
+BLEU_ORDER = 4
+
+
+class NgramProfile:
+    """Счётчики хешированных n-грамм одного текста для chrF и BLEU.
+
+    Ключи счётчиков - хеши n-грамм, а не сами строки: подстроки не хранятся,
+    и сравнение счётчиков идёт по целым числам. Хеши зависят от процесса
+    (hash()), поэтому профили нельзя сохранять между запусками.
+
+    Атрибуты:
+        chars: счётчики символьных n-грамм порядков 1..CHRF_ORDER,
+        words: счётчики словесных n-грамм порядков 1..BLEU_ORDER,
+        char_totals, word_totals: число n-грамм каждого порядка,
+        word_count: число слов.
+    """
 
+    __slots__ = ("chars", "words", "char_totals", "word_totals", "word_count")
+
+    def __init__(self, normalized: NormalizedText) -> None:
+        text = "".join(normalized.tokens)
+        # Срезы собираются списком, а хеширование и подсчёт идут в C (map и Counter)
+        self.chars: List[Counter] = [
+            Counter(map(hash, [text[i:i + order] for i in range(len(text) - order + 1)]))
+            for order in range(1, CHRF_ORDER + 1)
+        ]
+        tokens = normalized.token_hashes
+        self.words: List[Counter] = [Counter(tokens)] + [
+            Counter(map(hash, [tokens[i:i + order] for i in range(len(tokens) - order + 1)]))
+            for order in range(2, BLEU_ORDER + 1)
+        ]
+        self.char_totals = [max(0, len(text) - order + 1) for order in range(1, CHRF_ORDER + 1)]
+        self.word_totals = [max(0, len(tokens) - order + 1) for order in range(1, BLEU_ORDER + 1)]
+        self.word_count = len(tokens)
+
+
+def _ngram_profile(normalized: NormalizedText) -> NgramProfile:
+    """Профиль n-грамм текста, сохранённый в NormalizedText (строится при первом обращении)."""
+    if normalized.ngram_profile is None:
+        normalized.ngram_profile = NgramProfile(normalized)
+    return normalized.ngram_profile
+
+
+def _matches(counter_a: Counter, counter_b: Counter) -> int:
+    """Число общих n-грамм с учётом кратности (обход меньшего счётчика)."""
+    if len(counter_a) > len(counter_b):
+        counter_a, counter_b = counter_b, counter_a
+    return sum(min(count, counter_b[key]) for key, count in counter_a.items() if key in counter_b)
+
+
+def _f_score(precision: float, recall: float, beta: float) -> float:
+    """F-мера с весом полноты beta."""
+    if precision <= 0 or recall <= 0:
+        return 0.0
+    beta2 = beta * beta
+    return (1 + beta2) * precision * recall / (beta2 * precision + recall)
+
+
+def chrf_score(profile_a: NgramProfile, profile_b: NgramProfile, beta: float = CHRF_BETA) -> float:
+    """Симметричный chrF двух переводов (0-1).
+
+    Что делаю:
+        Для каждого порядка n считаю общие символьные n-граммы, точность
+        (доля n-грамм перевода A, найденных в B) и полноту (наоборот),
+        усредняю их по порядкам, которые есть в обоих текстах, и считаю
+        F-меру. Ни один перевод не эталон, поэтому возвращаю среднее
+        chrF в обе стороны (при beta != 1 они различаются).
+
+    Вход:
+        profile_a: n-граммы первого перевода,
+        profile_b: n-граммы второго перевода,
+        beta: вес полноты.
+
+    Возвращаю:
+        chrF от 0 до 1 (float).
+    """
+    precisions, recalls = [], []
+    for counter_a, counter_b, total_a, total_b in zip(profile_a.chars, profile_b.chars,
+                                                      profile_a.char_totals, profile_b.char_totals):
+        if not total_a or not total_b:
+            continue
+        matches = _matches(counter_a, counter_b)
+        precisions.append(matches / total_a)
+        recalls.append(matches / total_b)
+    if not precisions:
+        return 0.0
+    precision, recall = sum(precisions) / len(precisions), sum(recalls) / len(recalls)
+    return (_f_score(precision, recall, beta) + _f_score(recall, precision, beta)) / 2
+
+
+def bleu_score(profile_a: NgramProfile, profile_b: NgramProfile) -> float:
+    """Симметричный сглаженный BLEU двух переводов (0-1).
+
+    Что делаю:
+        Считаю общие словесные n-граммы порядков 1..BLEU_ORDER (они одинаковы
+        в обе стороны), точности со сглаживанием +1 для n > 1 и штраф за
+        краткость. Возвращаю среднее BLEU, где гипотезой по очереди выступает
+        каждый перевод.
+
+    Вход:
+        profile_a: n-граммы первого перевода,
+        profile_b: n-граммы второго перевода.
 
-def get_translation_quality_score(translation: Dict[str, Any]) -> Dict[str, Any]:
+    Возвращаю:
+        BLEU от 0 до 1 (float).
+    """
+    if not profile_a.word_count or not profile_b.word_count:
+        return 0.0
+    matches = [_matches(counter_a, counter_b) for counter_a, counter_b in zip(profile_a.words, profile_b.words)]
+    if not matches[0]:
+        return 0.0
+
+    def directed(hypothesis: NgramProfile, reference: NgramProfile) -> float:
+        log_precision = 0.0
+        for order, (match, total) in enumerate(zip(matches, hypothesis.word_totals)):
+            smoothing = 1 if order else 0
+            log_precision += math.log((match + smoothing) / (total + smoothing))
+        brevity = min(0.0, 1 - reference.word_count / hypothesis.word_count)
+        return math.exp(brevity + log_precision / BLEU_ORDER)
+
+    return (directed(profile_a, profile_b) + directed(profile_b, profile_a)) / 2
+
+
+def ngram_metrics(text_a: Union[str, NormalizedText], text_b: Union[str, NormalizedText]) -> Dict[str, float]:
+    """Считает chrF и BLEU между двумя переводами.
+
+    Профиль n-грамм сохраняется в переданном NormalizedText, поэтому при
+    сравнении одного перевода с несколькими он строится один раз.
+
+    Вход:
+        text_a: первый перевод (строка или NormalizedText),
+        text_b: второй перевод (строка или NormalizedText).
+
+    Возвращаю:
+        Словарь {'chrf': float, 'bleu': float} со значениями 0..1.
+    """
+    normalized_a = text_a if isinstance(text_a, NormalizedText) else NormalizedText(text_a)
+    normalized_b = text_b if isinstance(text_b, NormalizedText) else NormalizedText(text_b)
+    profile_a, profile_b = _ngram_profile(normalized_a), _ngram_profile(normalized_b)
+    return {"chrf": chrf_score(profile_a, profile_b), "bleu": bleu_score(profile_a, profile_b)}
+
+
+def ngram_metrics_batch(texts_a: Sequence[str], texts_b: Sequence[str]) -> Dict[str, List[float]]:
+    """Считает chrF и BLEU для массива пар переводов.
+
+    Что делаю:
+        Строю профиль n-грамм для каждого различного (после нормализации)
+        текста один раз, даже если он встречается во многих парах, а каждую
+        различную пару считаю один раз. Одинаковые тексты получают 1.0,
+        пары с пустым текстом - 0.0. Значения совпадают с ngram_metrics.
+
+    Вход:
+        texts_a: переводы первого API,
+        texts_b: переводы второго API той же длины.
+
+    Возвращаю:
+        Словарь {'chrf': [...], 'bleu': [...]} в порядке пар.
+    """
+    if len(texts_a) != len(texts_b):
+        raise ValueError("texts_a и texts_b должны быть одной длины")
+
+    profiles: Dict[str, NgramProfile] = {}
+    scores: Dict[Tuple[str, str], Tuple[float, float]] = {}
+    chrf: List[float] = []
+    bleu: List[float] = []
+
+    def profile(normalized: NormalizedText) -> NgramProfile:
+        cached = profiles.get(normalized.normalized)
+        if cached is None:
+            cached = profiles[normalized.normalized] = NgramProfile(normalized)
+        return cached
+
+    for text_a, text_b in zip(texts_a, texts_b):
+        normalized_a, normalized_b = NormalizedText(text_a), NormalizedText(text_b)
+        key = (normalized_a.normalized, normalized_b.normalized)
+        pair = scores.get(key)
+        if pair is None:
+            profile_a, profile_b = profile(normalized_a), profile(normalized_b)
+            pair = scores[key] = (chrf_score(profile_a, profile_b), bleu_score(profile_a, profile_b))
+        chrf.append(pair[0])
+        bleu.append(pair[1])
+    return {"chrf": chrf, "bleu": bleu}
+
+
+def compare_translations_multi(translations: List[Dict[str, Any]], backend: Optional[str] = None,
+                               normalized: Optional[List[NormalizedText]] = None) -> Dict[str, Any]:
+    """Сравнивает переводы произвольного числа API.
+
+    Что делаю:
+        Разбираю каждый перевод один раз и считаю попарную матрицу схожести
+        (матрица симметрична, поэтому каждая пара считается один раз).
+        Консенсусным считаю перевод с наибольшей средней схожестью
+        с остальными успешными переводами (центроид).
+
+    Вход:
+        translations: список результатов перевода (словари),
+        backend: алгоритм схожести (по умолчанию CONFIG.similarity_backend),
+        normalized: разобранные тексты переводов (по умолчанию разбираю здесь).
+
+    Возвращаю:
+        словарь с метриками сравнения:
+            'api_names' (list) - названия API,
+            'successful' (list) - успешен ли каждый перевод,
+            'successful_count' (int) - число успешных переводов,
+            'similarity_matrix' (list) - матрица схожести N x N (0 для ошибок),
+            'mean_similarity' (list) - средняя схожесть каждого перевода с остальными,
+            'consensus_index' (int) - номер консенсусного перевода (-1, если его нет),
+            'consensus_api' (str) - название API консенсусного перевода,
+            'consensus_text' (str) - консенсусный перевод,
+            'error_message' (str) - если успешных переводов меньше двух.
+    """
+    count = len(translations)
+    api_names = [translation.get("api", "Unknown") for translation in translations]
+    successful = ["error" not in translation for translation in translations]
+    texts = [translation.get("translated_text", "") if ok else "" for translation, ok in zip(translations, successful)]
+    if normalized is None:
+        with PROFILER.stage("normalization"):
+            normalized = [normalize_translation(translation) for translation in translations]
+    matrix = [[0.0] * count for _ in range(count)]
+
+    for i in range(count):
+        if not successful[i]:
+            continue
+        matrix[i][i] = 1.0
+        for j in range(i + 1, count):
+            if not successful[j]:
+                continue
+            if texts[i] and texts[j]:
+                matrix[i][j] = matrix[j][i] = _normalized_similarity(normalized[i], normalized[j], backend)
+
+    ok_indices = [index for index in range(count) if successful[index]]
+    mean_similarity = [0.0] * count
+    if len(ok_indices) > 1:
+        for i in ok_indices:
+            mean_similarity[i] = sum(matrix[i][j] for j in ok_indices if j != i) / (len(ok_indices) - 1)
+
+    consensus_index = max(ok_indices, key=lambda index: mean_similarity[index]) if ok_indices else -1
+    result = {
+        "api_names": api_names,
+        "successful": successful,
+        "successful_count": len(ok_indices),
+        "similarity_matrix": matrix,
+        "mean_similarity": mean_similarity,
+        "consensus_index": consensus_index,
+        "consensus_api": api_names[consensus_index] if consensus_index >= 0 else "",
+        "consensus_text": texts[consensus_index] if consensus_index >= 0 else "",
+    }
+    if len(ok_indices) < 2:
+        result["error_message"] = "Меньше двух API вернули перевод"
+    return result
+
+
+def get_translation_quality_score(translation: Dict[str, Any],
+                                  normalized: Optional[NormalizedText] = None) -> Dict[str, Any]:
     """Оценивает качество перевода.
     
     Что делаю:
         Анализирую различные аспекты качества перевода.
     
     Вход:
-        translation: результат перевода (словарь).
+        translation: результат перевода (словарь),
+        normalized: разобранный текст перевода (по умолчанию разбираю здесь).
     
     Возвращаю:
         Словарь с оценками качества (словарь).
@@ -129,24 +490,27 @@ def get_translation_quality_score(translation: Dict[str, Any]) -> Dict[str, Any]
     confidence = translation.get("confidence", 0)
     
     # Простые метрики качества
-    word_count = len(text.split())
-    char_count = len(text)
+    with PROFILER.stage("normalization"):
+        normalized = normalized or NormalizedText(text)
+    word_count = normalized.word_count
+    char_count = normalized.char_count
     
-    # Базовый скор на основе уверенности API
-    base_score = min(confidence / 100.0, 1.0)
-    
-    # Штраф за очень короткие или длинные переводы
-    length_penalty = 0
-    if word_count < 2:
-        length_penalty = 0.2
-    elif word_count > 100:
-        length_penalty = 0.1
-    
-    # Штраф за пустые переводы
-    if not text.strip():
-        length_penalty = 1.0
-    
-    final_score = max(0, base_score - length_penalty)
+    with PROFILER.stage("scoring"):
+        # Базовый скор на основе уверенности API
+        base_score = min(confidence / 100.0, 1.0)
+
+        # Штраф за очень короткие или длинные переводы
+        length_penalty = 0
+        if word_count < 2:
+            length_penalty = 0.2
+        elif word_count > 100:
+            length_penalty = 0.1
+
+        # Штраф за пустые переводы
+        if normalized.is_blank:
+            length_penalty = 1.0
+
+        final_score = max(0, base_score - length_penalty)
     
     return {
         "overall_score": final_score,
@@ -0,0 +1,249 @@
+"""Индекс MinHash/LSH для поиска похожих переводов в истории сравнений."""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+# Хеш-функции вида ((a * x + b) mod 2^64) >> 32 с нечётным a (multiply-shift, Дицфельбингер):
+# переполнение uint64 и есть взятие по модулю 2^64, а старшие биты хорошо перемешаны
+_SHIFT = np.uint64(32)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    signature BLOB NOT NULL,
+    payload TEXT
+);
+"""
+
+
+def shingle_hashes(text: str, size: int = 5) -> np.ndarray:
+    """Хеширует различные символьные шинглы нормализованного текста.
+
+    Что делаю:
+        Привожу текст к нижнему регистру, схлопываю пробелы и беру все
+        подстроки длины size (текст короче - одним шинглом). Хеш каждого
+        шингла - crc32 от UTF-8: он одинаков во всех процессах и запусках,
+        в отличие от hash(), поэтому сигнатуры можно сохранять на диск.
+
+    Вход:
+        text: текст перевода,
+        size: длина шингла в символах.
+
+    Возвращаю:
+        Массив uint64 различных хешей (пустой для пустого текста).
+    """
+    normalized = " ".join((text or "").lower().split())
+    if not normalized:
+        return np.empty(0, dtype=np.uint64)
+    shingles = {normalized[i:i + size] for i in range(max(1, len(normalized) - size + 1))}
+    return np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+                       dtype=np.uint64, count=len(shingles))
+
+
+class MinHashIndex:
+    """Приближённый поиск похожих текстов: сигнатуры MinHash и LSH по полосам.
+
+    Сигнатура текста - минимумы num_perm универсальных хеш-функций по его
+    шинглам; доля совпадающих позиций двух сигнатур оценивает коэффициент
+    Жаккара множеств шинглов. Сигнатура делится на bands полос по
+    num_perm / bands значений, и тексты с совпадающей полосой попадают в одну
+    корзину. Запрос сравнивает сигнатуры только с текстами из своих корзин,
+    а не со всей историей, поэтому время запроса растёт сублинейно. Тексты с похожестью
+    выше примерно (1 / bands) ** (bands / num_perm) находятся с высокой
+    вероятностью.
+
+    При заданном path сигнатуры и данные записей хранятся в SQLite: каждая
+    вставка сразу пишется на диск, а при открытии корзины строятся заново по
+    сохранённым сигнатурам (ключи корзин - hash() в памяти, на диск не идут).
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, shingle_size: int = 5, seed: int = 1,
+                 path: Optional[str] = None) -> None:
+        if bands <= 0 or num_perm % bands:
+            raise ValueError("num_perm должно делиться на bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.path = path
+
+        # random.Random с целым seed даёт одну и ту же последовательность во всех версиях Python
+        generator = random.Random(seed)
+        self._a = np.array([generator.getrandbits(64) | 1 for _ in range(num_perm)], dtype=np.uint64)
+        self._b = np.array([generator.getrandbits(64) for _ in range(num_perm)], dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._signatures = np.empty((0, num_perm), dtype=np.uint64)
+        self._size = 0
+        self._keys: List[str] = []
+        self._payloads: List[Any] = []
+        self._rows_by_key: Dict[str, int] = {}
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            self._open(path)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Сигнатура MinHash текста (uint64 длины num_perm) или None для пустого текста."""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not hashes.size:
+            return None
+        return ((np.outer(self._a, hashes) + self._b[:, None]) >> _SHIFT).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        """Ключи корзин сигнатуры по полосам."""
+        return [hash(signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def add(self, key: str, text: str, payload: Any = None) -> bool:
+        """Добавляет текст в индекс (запись с тем же ключом заменяется).
+
+        Вход:
+            key: идентификатор записи (например, номер сравнения),
+            text: текст перевода,
+            payload: данные записи, возвращаемые в query (JSON-совместимые,
+                например результат compare_translations).
+
+        Возвращаю:
+            True, если текст добавлен; False для пустого текста.
+        """
+        return self.add_many([(key, text, payload)]) == 1
+
+    def add_many(self, items: Iterable[Tuple[str, str, Any]]) -> int:
+        """Добавляет записи (ключ, текст, данные) пачкой; на диск - одной транзакцией.
+
+        Возвращаю:
+            Число добавленных записей (пустые тексты пропускаются).
+        """
+        rows = []
+        for key, text, payload in items:
+            signature = self.signature(text)
+            if signature is not None:
+                rows.append((str(key), signature, payload))
+        if not rows:
+            return 0
+
+        with self._lock:
+            for key, signature, payload in rows:
+                self._insert(key, signature, payload)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO entries (key, signature, payload) VALUES (?, ?, ?)",
+                        [(key, signature.tobytes(), json.dumps(payload, ensure_ascii=False))
+                         for key, signature, payload in rows])
+        return len(rows)
+
+    def _insert(self, key: str, signature: np.ndarray, payload: Any) -> None:
+        """Кладёт сигнатуру в массив и корзины (вызывать под блокировкой)."""
+        row = self._rows_by_key.get(key)
+        if row is not None:
+            for band, band_key in enumerate(self._band_keys(self._signatures[row])):
+                self._buckets[band][band_key].remove(row)
+            self._payloads[row] = payload
+        else:
+            row = self._size
+            if row == len(self._signatures):
+                grown = np.empty((max(16, row * 2), self.num_perm), dtype=np.uint64)
+                grown[:row] = self._signatures[:row]
+                self._signatures = grown
+            self._size += 1
+            self._keys.append(key)
+            self._payloads.append(payload)
+            self._rows_by_key[key] = row
+        self._signatures[row] = signature
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(band_key, []).append(row)
+
+    def query(self, text: str, k: int = 10, min_similarity: float = 0.0) -> List[Dict[str, Any]]:
+        """Ищет до k ранее добавленных текстов, похожих на text.
+
+        Что делаю:
+            Собираю кандидатов из корзин всех полос сигнатуры запроса
+            и оцениваю их схожесть долей совпавших позиций сигнатуры (векторно).
+
+        Вход:
+            text: текст перевода,
+            k: максимальное число результатов,
+            min_similarity: отбрасываю кандидатов с меньшей оценкой.
+
+        Возвращаю:
+            Список {'key', 'similarity', 'payload'} по убыванию оценки
+            коэффициента Жаккара шинглов.
+        """
+        signature = self.signature(text)
+        if signature is None or k <= 0:
+            return []
+        with self._lock:
+            candidates = set()
+            for band, band_key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(band_key, ()))
+            if not candidates:
+                return []
+            rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            scores = (self._signatures[rows] == signature).mean(axis=1)
+            order = np.argsort(-scores, kind="stable")[:k]
+            return [{"key": self._keys[rows[index]], "similarity": float(scores[index]),
+                     "payload": self._payloads[rows[index]]}
+                    for index in order if scores[index] >= min_similarity]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: object) -> bool:
+        return str(key) in self._rows_by_key
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает размер и параметры индекса.
+
+        Возвращаю:
+            Словарь {'size', 'num_perm', 'bands', 'rows', 'threshold', 'buckets', 'path'},
+            где threshold - схожесть, с которой пара находится с вероятностью около 1/2.
+        """
+        with self._lock:
+            return {"size": self._size, "num_perm": self.num_perm, "bands": self.bands, "rows": self.rows,
+                    "threshold": (1 / self.bands) ** (1 / self.rows),
+                    "buckets": sum(len(buckets) for buckets in self._buckets), "path": self.path}
+
+    def _params(self) -> Dict[str, str]:
+        """Параметры, от которых зависят сигнатуры (сверяются при открытии файла)."""
+        return {"num_perm": str(self.num_perm), "bands": str(self.bands),
+                "shingle_size": str(self.shingle_size), "seed": str(self.seed)}
+
+    def _open(self, path: str) -> None:
+        """Открывает или создаёт файл индекса и загружает сохранённые записи."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        stored = dict(conn.execute("SELECT name, value FROM meta").fetchall())
+        params = self._params()
+        if stored and stored != params:
+            conn.close()
+            raise ValueError(f"Индекс {path} создан с другими параметрами: {stored}")
+        if not stored:
+            with conn:
+                conn.executemany("INSERT INTO meta (name, value) VALUES (?, ?)", params.items())
+
+        with self._lock:
+            for key, signature, payload in conn.execute("SELECT key, signature, payload FROM entries"):
+                self._insert(key, np.frombuffer(signature, dtype=np.uint64),
+                             json.loads(payload) if payload is not None else None)
+        self._conn = conn
+
+    def close(self) -> None:
+        """Закрывает файл индекса (записи в памяти остаются доступными)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,69 @@
+"""Текст перевода, разобранный один раз для всех метрик сравнения."""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class NormalizedText:
+    """Нормализованная форма, токены, счётчики и хеши одного перевода.
+
+    Создаётся один раз на результат перевода и передаётся во все функции
+    сравнения (compare_translations, compare_translations_multi,
+    get_translation_quality_score), поэтому при сравнении одного перевода
+    с несколькими другими lower/strip/split выполняются один раз, а не на
+    каждую пару.
+
+    Атрибуты:
+        text: исходный текст,
+        normalized: нижний регистр без пробелов по краям (вход алгоритмов схожести),
+        tokens: слова нормализованного текста,
+        char_count: длина исходного текста в символах,
+        word_count: число слов,
+        hash: хеш normalized для быстрой проверки совпадения
+            (hash() строк зависит от процесса - не сохранять между запусками),
+        ngram_profile: n-граммы для chrF и BLEU (заполняет comparator при первом
+            расчёте, чтобы каждый текст разбирался на n-граммы один раз).
+    """
+
+    __slots__ = ("text", "normalized", "tokens", "char_count", "word_count", "hash", "_token_hashes",
+                 "ngram_profile")
+
+    def __init__(self, text: Optional[str]) -> None:
+        self.text = text or ""
+        self.normalized = self.text.lower().strip()
+        self.tokens: List[str] = self.normalized.split()
+        self.char_count = len(self.text)
+        self.word_count = len(self.tokens)
+        self.hash = hash(self.normalized)
+        self._token_hashes: Optional[Tuple[int, ...]] = None
+        self.ngram_profile: Optional[Any] = None
+
+    @property
+    def token_hashes(self) -> Tuple[int, ...]:
+        """Хеши слов (считаются при первом обращении)."""
+        if self._token_hashes is None:
+            self._token_hashes = tuple(hash(token) for token in self.tokens)
+        return self._token_hashes
+
+    @property
+    def is_blank(self) -> bool:
+        """Проверяет, что текст пустой или из одних пробелов."""
+        return not self.normalized
+
+    def same_as(self, other: "NormalizedText") -> bool:
+        """Совпадают ли тексты после нормализации (сначала сравниваются хеши)."""
+        return self.hash == other.hash and self.normalized == other.normalized
+
+    def __repr__(self) -> str:
+        return f"NormalizedText({self.text!r})"
+
+
+def as_normalized(value: Union[str, NormalizedText, None]) -> NormalizedText:
+    """Возвращает value, если он уже NormalizedText, иначе разбирает строку."""
+    return value if isinstance(value, NormalizedText) else NormalizedText(value)
+
+
+def normalize_translation(translation: Dict[str, Any]) -> NormalizedText:
+    """Разбирает переведённый текст из результата translate_text (для ошибок - пустой текст)."""
+    if "error" in translation:
+        return NormalizedText("")
+    return NormalizedText(translation.get("translated_text", ""))
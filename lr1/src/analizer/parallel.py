@@ -0,0 +1,112 @@
+"""Параллельное сравнение переводов на нескольких ядрах через пул процессов."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from config import CONFIG
+from analizer.comparator import compare_translations
+from analizer.batch import compare_translations_batch
+
+# Сколько чанков приходится на один процесс: больше - ровнее загрузка,
+# меньше - меньше накладных расходов на pickle и передачу задач
+_CHUNKS_PER_WORKER = 4
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    """Возвращает число процессов: явное значение, CONFIG.compare_workers или число ядер."""
+    workers = workers or CONFIG.compare_workers or os.cpu_count() or 1
+    return max(1, workers)
+
+
+def _chunk_bounds(count: int, workers: int, chunk_size: Optional[int]) -> List[Tuple[int, int]]:
+    """Делит диапазон [0, count) на чанки (start, end) одинакового размера."""
+    if chunk_size is None:
+        chunk_size = -(-count // (workers * _CHUNKS_PER_WORKER))
+    chunk_size = max(1, chunk_size)
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def _compare_chunk(pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Сравнивает чанк пар в процессе-воркере."""
+    return [compare_translations(translation_a, translation_b) for translation_a, translation_b in pairs]
+
+
+def _compare_batch_chunk(args: Tuple[Any, ...]) -> Dict[str, np.ndarray]:
+    """Сравнивает колоночный чанк в процессе-воркере."""
+    columns, options = args
+    return compare_translations_batch(*columns, **options)
+
+
+def compare_translations_parallel(translations_a: Sequence[Dict[str, Any]],
+                                  translations_b: Sequence[Dict[str, Any]],
+                                  workers: Optional[int] = None,
+                                  chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Сравнивает списки пар переводов в нескольких процессах.
+
+    Что делаю:
+        Режу пары на чанки и отправляю их в ProcessPoolExecutor целиком,
+        чтобы pickle и передача задач окупались. executor.map сохраняет
+        порядок, поэтому результат детерминирован и совпадает с
+        последовательными вызовами compare_translations.
+
+    Вход:
+        translations_a: результаты первого API,
+        translations_b: результаты второго API,
+        workers: число процессов (по умолчанию CONFIG.compare_workers или число ядер),
+        chunk_size: пар в одном чанке (по умолчанию n / (workers * 4)).
+
+    Возвращаю:
+        Список словарей сравнения в порядке входа.
+    """
+    if len(translations_a) != len(translations_b):
+        raise ValueError("translations_a и translations_b должны быть одной длины")
+
+    pairs = list(zip(translations_a, translations_b))
+    workers = _resolve_workers(workers)
+    bounds = _chunk_bounds(len(pairs), workers, chunk_size)
+    if workers == 1 or len(bounds) <= 1:
+        return _compare_chunk(pairs)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as executor:
+        chunks = executor.map(_compare_chunk, (pairs[start:end] for start, end in bounds))
+        return [comparison for chunk in chunks for comparison in chunk]
+
+
+def compare_translations_batch_parallel(texts_a: Sequence[str], texts_b: Sequence[str],
+                                        confidence_a: Optional[Sequence[float]] = None,
+                                        confidence_b: Optional[Sequence[float]] = None,
+                                        error_a: Optional[Sequence[bool]] = None,
+                                        error_b: Optional[Sequence[bool]] = None,
+                                        workers: Optional[int] = None,
+                                        chunk_size: Optional[int] = None,
+                                        **options: Any) -> Dict[str, np.ndarray]:
+    """Колоночное сравнение compare_translations_batch, распределённое по процессам.
+
+    Вход:
+        texts_a, texts_b, confidence_a, confidence_b, error_a, error_b: колонки
+            как у compare_translations_batch,
+        workers: число процессов (по умолчанию CONFIG.compare_workers или число ядер),
+        chunk_size: пар в одном чанке (по умолчанию n / (workers * 4)),
+        options: backend, score_cutoff, with_similarity для compare_translations_batch.
+
+    Возвращаю:
+        Словарь колонок NumPy в порядке входа.
+    """
+    count = len(texts_a)
+    if len(texts_b) != count:
+        raise ValueError("texts_a и texts_b должны быть одной длины")
+
+    columns = [texts_a, texts_b, confidence_a, confidence_b, error_a, error_b]
+    workers = _resolve_workers(workers)
+    bounds = _chunk_bounds(count, workers, chunk_size)
+    if workers == 1 or len(bounds) <= 1:
+        return compare_translations_batch(*columns, **options)
+
+    def chunk_args(start: int, end: int) -> Tuple[List[Any], Dict[str, Any]]:
+        return [None if column is None else column[start:end] for column in columns], options
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as executor:
+        parts = list(executor.map(_compare_batch_chunk, (chunk_args(start, end) for start, end in bounds)))
+
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
@@ -0,0 +1,186 @@
+"""Профилирование этапов сравнения: время и выделения памяти по этапам.
+
+Компаратор оборачивает этапы (normalization, similarity, ngrams, alignment,
+scoring) в PROFILER.stage(name). Этапы бывают вложенными: alignment включает
+normalization и similarity своих сегментов. Поэтому total_ms этапа включает время
+вложенных, а share считается по собственному времени (self_ms) и не учитывает
+вложенное время дважды. Пока профилирование выключено, stage возвращает общий
+пустой контекст, и накладные расходы сводятся к одному вызову метода.
+"""
+
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+from config import CONFIG
+
+
+class _NullStage:
+    """Пустой контекст этапа для выключенного профилирования."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Замер одного прохода этапа."""
+
+    __slots__ = ("profiler", "name", "started", "blocks", "memory", "parent", "children")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> "_Stage":
+        if self.profiler.allocations:
+            self.blocks = sys.getallocatedblocks()
+            self.memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.parent = getattr(self.profiler._active, "stage", None)
+        self.children = 0
+        self.profiler._active.stage = self
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        elapsed = time.perf_counter_ns() - self.started
+        self.profiler._active.stage = self.parent
+        if self.parent is not None:
+            self.parent.children += elapsed
+        blocks = peak = 0
+        if self.profiler.allocations:
+            blocks = sys.getallocatedblocks() - self.blocks
+            peak = max(0, tracemalloc.get_traced_memory()[1] - self.memory)
+        self.profiler._record(self.name, elapsed, elapsed - self.children, blocks, peak)
+        return False
+
+
+class Profiler:
+    """Накопитель времени и выделений памяти по этапам.
+
+    Для каждого этапа считает число проходов, суммарное и максимальное время,
+    а в режиме allocations - прирост живых блоков памяти (sys.getallocatedblocks)
+    и пиковый прирост памяти (tracemalloc). Счётчики памяти общие для процесса,
+    поэтому при параллельном сравнении в потоках они приблизительны. Замеры
+    процессов-воркеров (analizer.parallel) сюда не попадают.
+    """
+
+    def __init__(self, enabled: bool = False, allocations: bool = False) -> None:
+        self.enabled = False
+        self.allocations = False
+        self._started_tracemalloc = False
+        self._stats: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        # Этап, выполняющийся в текущем потоке (для учёта вложенных этапов)
+        self._active = threading.local()
+        if enabled:
+            self.enable(allocations)
+
+    def enable(self, allocations: bool = False) -> None:
+        """Включает профилирование; allocations=True дополнительно считает память (медленнее)."""
+        if allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.allocations = allocations
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Выключает профилирование, сохраняя накопленные замеры."""
+        self.enabled = False
+        self.allocations = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def stage(self, name: str) -> Any:
+        """Контекст замера этапа name (пустой, если профилирование выключено)."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def _record(self, name: str, elapsed_ns: int, self_ns: int, blocks: int, peak_bytes: int) -> None:
+        """Добавляет один проход этапа в накопленные замеры (self_ns - время без вложенных этапов)."""
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = [0, 0, 0, 0, 0, 0]
+            stats[0] += 1
+            stats[1] += elapsed_ns
+            stats[2] = max(stats[2], elapsed_ns)
+            stats[3] += blocks
+            stats[4] = max(stats[4], peak_bytes)
+            stats[5] += self_ns
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Сводка по этапам.
+
+        Возвращаю:
+            Словарь этап -> {
+                'calls' - число проходов,
+                'total_ms' - суммарное время, включая вложенные этапы,
+                'self_ms' - суммарное время без вложенных этапов,
+                'mean_us' - среднее время прохода,
+                'max_us' - самый долгий проход,
+                'share' - доля self_ms в собственном времени всех этапов (0-1),
+                'alloc_blocks' - прирост живых блоков памяти за все проходы,
+                'peak_bytes' - наибольший пиковый прирост памяти за проход
+            }, отсортированный по убыванию total_ms.
+        """
+        with self._lock:
+            stats = {name: list(values) for name, values in self._stats.items()}
+        # Собственные времена этапов не пересекаются, поэтому их сумма - общее время этапов
+        total_ns = sum(values[5] for values in stats.values()) or 1
+
+        report: Dict[str, Dict[str, Any]] = {}
+        for name, (calls, elapsed, longest, blocks, peak, own) in sorted(stats.items(), key=lambda item: -item[1][1]):
+            report[name] = {"calls": calls, "total_ms": elapsed / 1e6, "self_ms": own / 1e6,
+                            "mean_us": elapsed / calls / 1e3, "max_us": longest / 1e3, "share": own / total_ns,
+                            "alloc_blocks": blocks, "peak_bytes": peak}
+        return report
+
+    def format_report(self) -> str:
+        """Сводка по этапам в виде текстовой таблицы."""
+        lines = [f"{'этап':<16}{'вызовов':>10}{'всего, мс':>12}{'сред., мкс':>12}{'макс., мкс':>12}"
+                 f"{'доля':>8}{'блоков':>10}{'пик, Б':>10}"]
+        for name, row in self.report().items():
+            lines.append(f"{name:<16}{row['calls']:>10}{row['total_ms']:>12.3f}{row['mean_us']:>12.2f}"
+                         f"{row['max_us']:>12.2f}{row['share']:>8.1%}{row['alloc_blocks']:>10}{row['peak_bytes']:>10}")
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        """Записывает сводку в JSON-файл path."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"allocations": self.allocations, "stages": self.report()}, f, ensure_ascii=False, indent=2)
+
+    def reset(self) -> None:
+        """Забывает накопленные замеры."""
+        with self._lock:
+            self._stats.clear()
+
+
+PROFILER = Profiler(CONFIG.profile_comparator, CONFIG.profile_allocations)
+
+
+@contextmanager
+def profiling(allocations: bool = False) -> Iterator[Profiler]:
+    """Включает PROFILER с чистыми замерами на время блока with и возвращает его."""
+    was_enabled, had_allocations = PROFILER.enabled, PROFILER.allocations
+    PROFILER.reset()
+    PROFILER.enable(allocations)
+    try:
+        yield PROFILER
+    finally:
+        PROFILER.disable()
+        if was_enabled:
+            PROFILER.enable(had_allocations)
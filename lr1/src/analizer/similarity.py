@@ -0,0 +1,303 @@
+"""Алгоритмы схожести строк для сравнения переводов."""
+
+import difflib
+from collections import Counter
+from typing import Callable, Dict, Sequence
+import numpy as np
+
+SimilarityFunc = Callable[[str, str, float], float]
+
+# Объём пачки lcs_length_batch: символы длинных строк и ячейки таблицы масок
+_BATCH_CHARS = 1 << 18
+_BATCH_MASK_CELLS = 1 << 22
+_ALL_BITS = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def real_quick_ratio(text_a: str, text_b: str) -> float:
+    """Верхняя оценка схожести только по длинам строк (O(1)).
+
+    Вход:
+        text_a: первый текст,
+        text_b: второй текст.
+
+    Возвращаю:
+        Число 0..1, не меньше indel_ratio(text_a, text_b).
+    """
+    total = len(text_a) + len(text_b)
+    if total == 0:
+        return 1.0
+    return 2.0 * min(len(text_a), len(text_b)) / total
+
+
+def quick_ratio(text_a: str, text_b: str) -> float:
+    """Верхняя оценка схожести по пересечению мультимножеств символов (O(n)).
+
+    Вход:
+        text_a: первый текст,
+        text_b: второй текст.
+
+    Возвращаю:
+        Число 0..1, не меньше indel_ratio(text_a, text_b).
+    """
+    total = len(text_a) + len(text_b)
+    if total == 0:
+        return 1.0
+    common = sum((Counter(text_a) & Counter(text_b)).values())
+    return 2.0 * common / total
+
+
+def lcs_length(text_a: str, text_b: str) -> int:
+    """Длина наибольшей общей подпоследовательности символов.
+
+    Что делаю:
+        Использую бит-параллельный алгоритм Хюррё: строка покороче кодируется
+        битовыми масками в целом числе Python, и на каждый символ длинной
+        строки выполняется несколько операций над этим числом. Сложность
+        O(n * m / w) вместо O(n * m) у динамического программирования.
+
+    Вход:
+        text_a: первый текст,
+        text_b: второй текст.
+
+    Возвращаю:
+        Длину LCS (int).
+    """
+    if len(text_a) < len(text_b):
+        text_a, text_b = text_b, text_a
+    if not text_b:
+        return 0
+
+    masks: Dict[str, int] = {}
+    get_mask = masks.get
+    for position, char in enumerate(text_b):
+        masks[char] = get_mask(char, 0) | (1 << position)
+
+    # Переносы при сложении уходят только в старшие биты, поэтому маскировать
+    # row на каждом шаге не нужно - достаточно отрезать старшие биты в конце
+    row = (1 << len(text_b)) - 1
+    for char in text_a:
+        matches = get_mask(char)
+        if matches is not None:
+            carry = row & matches
+            row = (row + carry) | (row - carry)
+
+    return len(text_b) - bin(row & ((1 << len(text_b)) - 1)).count("1")
+
+
+def lcs_length_batch(texts_a: Sequence[str], texts_b: Sequence[str]) -> np.ndarray:
+    """Длины LCS для массивов пар строк: алгоритм lcs_length, векторизованный по парам.
+
+    Что делаю:
+        Сортирую пары по длине длинной строки и режу на пачки. В пачке строка
+        покороче каждой пары кодируется масками в словах uint64, а шаг
+        алгоритма Хюррё выполняется в NumPy сразу для всех пар, так что цикл
+        Python идёт по позициям символов, а не по парам.
+
+    Вход:
+        texts_a: первые строки пар,
+        texts_b: вторые строки пар (той же длины).
+
+    Возвращаю:
+        Массив int64 длин LCS, совпадающих с lcs_length для каждой пары.
+    """
+    count = len(texts_a)
+    if len(texts_b) != count:
+        raise ValueError("texts_a и texts_b должны быть одной длины")
+
+    column_a = np.empty(count, dtype=object)
+    column_a[:] = list(texts_a)
+    column_b = np.empty(count, dtype=object)
+    column_b[:] = list(texts_b)
+    length_a = np.fromiter(map(len, column_a), dtype=np.int64, count=count)
+    length_b = np.fromiter(map(len, column_b), dtype=np.int64, count=count)
+    swap = length_a < length_b
+    longs, shorts = np.where(swap, column_b, column_a), np.where(swap, column_a, column_b)
+    long_len, short_len = np.maximum(length_a, length_b), np.minimum(length_a, length_b)
+
+    result = np.zeros(count, dtype=np.int64)
+    order = np.argsort(long_len, kind="stable")
+    order = order[short_len[order] > 0]
+    sorted_len = long_len[order]
+
+    start = 0
+    while start < len(order):
+        # Пачка растёт, пока число пар, умноженное на самую длинную строку, помещается в _BATCH_CHARS
+        window = sorted_len[start:start + _BATCH_CHARS]
+        fits = np.arange(1, len(window) + 1) * window <= _BATCH_CHARS
+        chunk = order[start:start + max(1, int(np.count_nonzero(fits)))]
+        result[chunk] = _lcs_chunk(longs[chunk], shorts[chunk], long_len[chunk], short_len[chunk])
+        start += len(chunk)
+    return result
+
+
+def _lcs_chunk(longs: np.ndarray, shorts: np.ndarray, long_len: np.ndarray, short_len: np.ndarray) -> np.ndarray:
+    """Шаг lcs_length_batch: LCS пачки пар с непустыми строками, shorts[i] не длиннее longs[i]."""
+    count = len(longs)
+    width_long, width_short = int(long_len.max()), int(short_len.max())
+    words = (width_short + 63) // 64
+    if count < 16 * words:
+        # Мало длинных пар: шаг по словам в NumPy дороже, чем lcs_length на целых числах Python
+        return np.fromiter(map(lcs_length, longs, shorts), dtype=np.int64, count=count)
+    codes_long = np.array(longs, dtype=f"<U{width_long}").view(np.uint32).reshape(count, width_long)
+    codes_short = np.array(shorts, dtype=f"<U{width_short}").view(np.uint32).reshape(count, width_short)
+    valid_short = np.arange(width_short) < short_len[:, None]
+
+    # Номера 1..K символов коротких строк; 0 - символ, которого нет ни в одной из них.
+    # У каждой пары свой блок из K + 2 строк таблицы масок: последняя собирает биты заполнения короткой строки
+    present = np.zeros(int(max(codes_long.max(), codes_short.max())) + 1, dtype=bool)
+    present[codes_short[valid_short]] = True
+    dense = np.where(present, np.cumsum(present), 0).astype(np.intp)
+    alphabet = int(dense.max()) + 2
+    if count > 1 and count * alphabet * words > _BATCH_MASK_CELLS:
+        half = count // 2
+        return np.concatenate([_lcs_chunk(longs[:half], shorts[:half], long_len[:half], short_len[:half]),
+                               _lcs_chunk(longs[half:], shorts[half:], long_len[half:], short_len[half:])])
+
+    base = np.arange(count, dtype=np.intp) * alphabet
+    if present[0]:
+        short_rows = np.where(valid_short.T, dense[codes_short.T], alphabet - 1)
+    else:
+        # Заполнение (код 0) уходит в последнюю строку блока без отдельной маски
+        short_dense = dense.copy()
+        short_dense[0] = alphabet - 1
+        short_rows = short_dense[codes_short.T]
+    short_rows += base
+
+    masks = np.zeros((words, count * alphabet), dtype=np.uint64)
+    for position, rows in enumerate(short_rows):
+        # В одном шаге у каждой пары одна строка таблицы, поэтому индексы не повторяются
+        word_masks = masks[position // 64]
+        word_masks[rows] = np.take(word_masks, rows) | np.uint64(1 << (position % 64))
+
+    lookup = dense[codes_long.T]
+    if present[0]:
+        # Символ с кодом 0 совпадает с заполнением длинных строк: заполнение ни с чем не совпадает
+        lookup[np.arange(width_long)[:, None] >= long_len] = 0
+    lookup += base
+
+    # Биты выше длины короткой строки на младшие не влияют (переносы идут только вверх),
+    # поэтому row начинается со всех единиц, а при подсчёте лишние биты отрезаются
+    row = [np.full(count, _ALL_BITS, dtype=np.uint64) for _ in range(words)]
+    if words == 1:
+        # Частый случай (короткая строка до 64 символов): маски всех позиций собираются одним take
+        current, carry, total = row[0], np.empty(count, dtype=np.uint64), np.empty(count, dtype=np.uint64)
+        for matches in np.take(masks[0], lookup):
+            np.bitwise_and(current, matches, out=carry)
+            np.add(current, carry, out=total)
+            np.subtract(current, carry, out=current)
+            np.bitwise_or(current, total, out=current)
+    else:
+        for position_rows in lookup:
+            incoming = np.zeros(count, dtype=bool)
+            for word, current in enumerate(row):
+                carry = current & np.take(masks[word], position_rows)
+                total = current + carry
+                # Перенос в следующее слово: переполнение сложения или добавленного переноса
+                overflow = total < current
+                total += incoming
+                overflow |= incoming & (total == 0)
+                row[word] = total | (current - carry)
+                incoming = overflow
+
+    bits = np.clip(short_len[:, None] - 64 * np.arange(words), 0, 64).astype(np.uint64)
+    full = bits == 64
+    tail = np.where(full, _ALL_BITS, np.left_shift(np.uint64(1), np.where(full, np.uint64(0), bits)) - np.uint64(1))
+    zeros = np.ascontiguousarray(~np.stack(row, axis=1) & tail)
+    return np.unpackbits(zeros.view(np.uint8), axis=1).sum(axis=1).astype(np.int64)
+
+
+def indel_distance(text_a: str, text_b: str) -> int:
+    """Расстояние Левенштейна без замен (только вставки и удаления)."""
+    return len(text_a) + len(text_b) - 2 * lcs_length(text_a, text_b)
+
+
+def indel_ratio(text_a: str, text_b: str, score_cutoff: float = 0.0) -> float:
+    """Нормализованная схожесть по Indel-расстоянию: 2 * LCS / (len_a + len_b).
+
+    Что делаю:
+        Сначала проверяю дешёвые верхние оценки; если они ниже score_cutoff,
+        сразу возвращаю 0, не считая LCS.
+
+    Вход:
+        text_a: первый текст,
+        text_b: второй текст,
+        score_cutoff: минимальная интересующая схожесть.
+
+    Возвращаю:
+        Схожесть 0..1, либо 0.0, если она меньше score_cutoff.
+    """
+    total = len(text_a) + len(text_b)
+    if total == 0:
+        return 1.0
+    if score_cutoff > 0 and (real_quick_ratio(text_a, text_b) < score_cutoff
+                             or quick_ratio(text_a, text_b) < score_cutoff):
+        return 0.0
+
+    ratio = 2.0 * lcs_length(text_a, text_b) / total
+    return ratio if ratio >= score_cutoff else 0.0
+
+
+def indel_ratio_batch(texts_a: Sequence[str], texts_b: Sequence[str], score_cutoff: float = 0.0) -> np.ndarray:
+    """indel_ratio для массивов пар строк (LCS считает lcs_length_batch).
+
+    Вход:
+        texts_a: первые строки пар,
+        texts_b: вторые строки пар,
+        score_cutoff: минимальная интересующая схожесть.
+
+    Возвращаю:
+        Массив float64 тех же значений, что indel_ratio для каждой пары.
+    """
+    count = len(texts_a)
+    length_a = np.fromiter(map(len, texts_a), dtype=np.int64, count=count)
+    length_b = np.fromiter(map(len, texts_b), dtype=np.int64, count=count)
+    total = length_a + length_b
+    ratio = np.ones(count, dtype=np.float64)
+
+    # Оценка по длинам (real_quick_ratio) отбрасывает пары до подсчёта LCS
+    candidates = np.flatnonzero((total > 0) & (2.0 * np.minimum(length_a, length_b) >= score_cutoff * total))
+    ratio[total > 0] = 0.0
+    lcs = lcs_length_batch([texts_a[index] for index in candidates], [texts_b[index] for index in candidates])
+    ratio[candidates] = 2.0 * lcs / total[candidates]
+    ratio[ratio < score_cutoff] = 0.0
+    return ratio
+
+
+def sequence_matcher_ratio(text_a: str, text_b: str, score_cutoff: float = 0.0) -> float:
+    """Эталонная схожесть difflib.SequenceMatcher.ratio() с теми же отсечками.
+
+    Вход:
+        text_a: первый текст,
+        text_b: второй текст,
+        score_cutoff: минимальная интересующая схожесть.
+
+    Возвращаю:
+        Схожесть 0..1, либо 0.0, если она меньше score_cutoff.
+    """
+    matcher = difflib.SequenceMatcher(None, text_a, text_b)
+    if score_cutoff > 0 and (matcher.real_quick_ratio() < score_cutoff or matcher.quick_ratio() < score_cutoff):
+        return 0.0
+
+    ratio = matcher.ratio()
+    return ratio if ratio >= score_cutoff else 0.0
+
+
+SIMILARITY_BACKENDS: Dict[str, SimilarityFunc] = {
+    "indel": indel_ratio,
+    "sequence_matcher": sequence_matcher_ratio,
+}
+
+
+def get_similarity_backend(name: str) -> SimilarityFunc:
+    """Возвращает функцию схожести по имени ('indel' или 'sequence_matcher').
+
+    Вход:
+        name: имя алгоритма.
+
+    Возвращаю:
+        Функцию (text_a, text_b, score_cutoff) -> float.
+    """
+    try:
+        return SIMILARITY_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Неизвестный алгоритм схожести: {name}") from None
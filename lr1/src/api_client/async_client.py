@@ -0,0 +1,135 @@
+"""Асинхронный HTTP-клиент для Translation API на asyncio и aiohttp."""
+
+import asyncio
+from typing import Any, Dict, Optional
+import aiohttp
+from config import CONFIG
+from api_client.deadline import Deadline, deadline_error
+from api_client.providers import TranslationProvider, resolve_provider
+from api_client.rapidapi_client import build_headers
+
+
+class AsyncTranslationClient:
+    """Асинхронный клиент с общим пулом соединений и лимитом параллельности на провайдера.
+
+    Один экземпляр рассчитан на одну петлю событий и сотни одновременных запросов.
+    Используется как асинхронный контекстный менеджер:
+
+        async with AsyncTranslationClient() as client:
+            result = await client.translate(api_url, text, "en", "ru")
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, timeout: Optional[float] = None) -> None:
+        self.max_concurrency = max_concurrency or CONFIG.async_max_concurrency
+        # Отдельно ограничены установка соединения и ожидание данных; timeout - общий предел запроса
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=CONFIG.connect_timeout,
+                                             sock_read=CONFIG.read_timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "AsyncTranslationClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Возвращает общую сессию, создавая её в текущей петле событий."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=0, limit_per_host=self.max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout,
+                                                  headers=build_headers())
+        return self._session
+
+    def _get_semaphore(self, api_type: str) -> asyncio.Semaphore:
+        """Возвращает семафор, ограничивающий число запросов к одному провайдеру."""
+        semaphore = self._semaphores.get(api_type)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[api_type] = semaphore
+        return semaphore
+
+    async def close(self) -> None:
+        """Закрывает сессию и все соединения."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def translate(self, api_url: str, text: str, source_lang: str, target_lang: str,
+                        deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Переводит текст, соблюдая лимит параллельности провайдера.
+
+        Что делаю:
+            Беру адаптер провайдера из реестра (как translate_text), жду
+            свободного слота в семафоре провайдера и вызываю translate_async
+            адаптера.
+            Отмена задачи (asyncio.CancelledError) не перехватывается.
+            Ожидание слота и запрос вместе ограничены сроком deadline.
+
+        Вход:
+            api_url: URL конечной точки перевода,
+            text: текст для перевода,
+            source_lang: исходный язык,
+            target_lang: целевой язык,
+            deadline: срок операции (None - без срока).
+
+        Возвращаю:
+            Словарь с результатом перевода или ошибкой (как у translate_text).
+        """
+        if not api_url:
+            return {"error": "empty_url", "message": "API URL не указан", "api": "Unknown", "status": "Invalid URL"}
+
+        provider = resolve_provider(api_url)
+        if provider is None:
+            return {"error": "unknown_api", "message": "Cannot determine API type from URL", "api": "Unknown", "status": "Unknown"}
+
+        if deadline is not None and deadline.expired():
+            return deadline_error(provider.name)
+
+        session = self._get_session()
+        try:
+            request = self._translate_limited(session, provider, text, source_lang, target_lang)
+            if deadline is None:
+                return await request
+            try:
+                return await asyncio.wait_for(request, deadline.remaining())
+            except asyncio.TimeoutError:
+                return deadline_error(provider.name)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return {"error": "request_failed", "message": str(e) or type(e).__name__, "api": provider.name}
+        except Exception as e:
+            return {"error": "unexpected_error", "message": str(e), "api": provider.name}
+
+    async def _translate_limited(self, session: aiohttp.ClientSession, provider: TranslationProvider, text: str,
+                                 source_lang: str, target_lang: str) -> Dict[str, Any]:
+        """Ждёт слот в семафоре провайдера и выполняет запрос через его адаптер."""
+        async with self._get_semaphore(provider.name):
+            return await provider.translate_async(session, text, source_lang, target_lang)
+
+
+async def translate_text_async(api_url: str, text: str, source_lang: str, target_lang: str,
+                               client: Optional[AsyncTranslationClient] = None,
+                               deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """Асинхронный аналог translate_text.
+
+    Что делаю:
+        Перевожу текст через переданный клиент. Без клиента создаю временный
+        на один запрос - для массовых переводов передавайте общий клиент.
+
+    Вход:
+        api_url: URL конечной точки перевода,
+        text: текст для перевода,
+        source_lang: исходный язык,
+        target_lang: целевой язык,
+        client: общий AsyncTranslationClient (необязательно),
+        deadline: срок операции (None - без срока).
+
+    Возвращаю:
+        Словарь с результатом перевода или ошибкой.
+    """
+    if client is not None:
+        return await client.translate(api_url, text, source_lang, target_lang, deadline)
+
+    async with AsyncTranslationClient() as own_client:
+        return await own_client.translate(api_url, text, source_lang, target_lang, deadline)
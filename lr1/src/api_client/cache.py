@@ -0,0 +1,141 @@
+"""Кэш результатов перевода в памяти процесса (LRU + TTL)."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+CacheKey = bytes
+
+
+def normalize_text(text: str) -> str:
+    """Нормализует текст для ключа кэша: обрезает края и схлопывает пробелы внутри строк.
+
+    Переводы строк сохраняются: длинный текст переводится по абзацам, и
+    перевод текста с абзацами отличается от перевода того же текста в одну строку.
+    """
+    return "\n".join(" ".join(line.split()) for line in (text or "").split("\n")).strip("\n")
+
+
+def make_cache_key(api_type: str, text: str, source_lang: str, target_lang: str) -> CacheKey:
+    """Строит компактный ключ кэша.
+
+    Что делаю:
+        Хэширую (провайдер, исходный язык, целевой язык, нормализованный текст)
+        в 16-байтовый BLAKE2b-дайджест. Один и тот же ключ используется
+        в памяти и на диске, поэтому длина текста не влияет на размер ключа.
+
+    Вход:
+        api_type: тип провайдера,
+        text: исходный текст,
+        source_lang: исходный язык,
+        target_lang: целевой язык.
+
+    Возвращаю:
+        Ключ кэша (bytes, 16 байт).
+    """
+    raw = "\x1f".join((api_type, source_lang.lower(), target_lang.lower(), normalize_text(text)))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
+
+
+class TranslationCache:
+    """Потокобезопасный LRU-кэш результатов перевода с ограничением по времени жизни.
+
+    Успешные результаты живут ttl секунд. Ошибки кэшируются только при
+    negative_ttl > 0 и только на negative_ttl секунд. При max_entries == 0
+    кэш выключен.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600, negative_ttl: float = 0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Возвращает копию закэшированного результата или None.
+
+        Вход:
+            key: ключ из make_cache_key.
+
+        Возвращаю:
+            Словарь результата перевода или None при промахе/истечении срока.
+        """
+        if self.max_entries <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, result = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(result)
+
+    def put(self, key: CacheKey, result: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Сохраняет результат перевода, вытесняя самые давние записи.
+
+        Вход:
+            key: ключ из make_cache_key,
+            result: словарь результата перевода,
+            ttl: время жизни записи; по умолчанию ttl или negative_ttl кэша.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        if self.max_entries <= 0:
+            return
+
+        if ttl is None:
+            ttl = self.negative_ttl if "error" in result else self.ttl
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Удаляет все записи и обнуляет счётчики."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает счётчики кэша.
+
+        Возвращаю:
+            Словарь: 'hits', 'misses', 'hit_rate', 'evictions', 'expirations',
+            'size', 'max_entries'.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
@@ -0,0 +1,58 @@
+"""Бюджет времени на запрос: общий срок, который сокращает таймауты и повторы."""
+
+import time
+from typing import Any, Callable, Dict, Optional
+from api_client.providers import Timeout
+
+
+class Deadline:
+    """Абсолютный срок окончания работы, передаваемый через все уровни клиента.
+
+    Создаётся один раз на операцию (перевод, сравнение, пачку) и передаётся в
+    translate_text, translate_many, повторы и гонку зеркал. Таймауты каждого
+    HTTP-запроса обрезаются по оставшемуся времени, а после истечения срока
+    новая работа не начинается.
+    """
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self.seconds = seconds
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        """Оставшееся время в секундах (не меньше 0)."""
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        """Проверяет, что срок истёк."""
+        return self._clock() >= self.expires_at
+
+    def clamp(self, seconds: float) -> float:
+        """Обрезает длительность по оставшемуся времени."""
+        return min(seconds, self.remaining())
+
+    def timeout(self, connect_timeout: float, read_timeout: float) -> Timeout:
+        """Таймауты (connect, read) для requests, обрезанные по оставшемуся времени."""
+        remaining = self.remaining()
+        return min(connect_timeout, remaining), min(read_timeout, remaining)
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f}s)"
+
+
+def deadline_after(seconds: float) -> Optional[Deadline]:
+    """Создаёт срок через seconds секунд; при seconds <= 0 срока нет (None)."""
+    return Deadline(seconds) if seconds > 0 else None
+
+
+def request_timeout(deadline: Optional[Deadline], connect_timeout: float, read_timeout: float) -> Timeout:
+    """Таймауты (connect, read) для одного запроса с учётом срока, если он задан."""
+    if deadline is None:
+        return connect_timeout, read_timeout
+    return deadline.timeout(connect_timeout, read_timeout)
+
+
+def deadline_error(api: str) -> Dict[str, Any]:
+    """Строит словарь ошибки для работы, брошенной после истечения срока."""
+    return {"error": "deadline_exceeded", "message": "Истёк срок выполнения запроса", "api": api,
+            "status": "Deadline exceeded"}
@@ -0,0 +1,157 @@
+"""Дисковый кэш результатов перевода на SQLite, общий для нескольких процессов."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from api_client.cache import CacheKey
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key BLOB PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS translations_accessed_at ON translations (accessed_at);
+"""
+
+
+class DiskTranslationCache:
+    """Кэш успешных переводов в файле SQLite.
+
+    Ключи - 16-байтовые дайджесты из make_cache_key, значения - компактный JSON.
+    База открывается в режиме WAL, поэтому её могут одновременно читать
+    и писать несколько процессов. Когда записей становится больше max_entries,
+    удаляются самые давно использованные.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000, ttl: float = 7 * 24 * 3600,
+                 clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._local = threading.local()
+        self._writes_since_trim = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Возвращает соединение текущего потока (sqlite3 не делит соединения между потоками)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Возвращает результат из базы или None.
+
+        Вход:
+            key: ключ из make_cache_key.
+
+        Возвращаю:
+            Словарь результата перевода или None при промахе/истечении срока.
+        """
+        now = self._clock()
+        conn = self._connection()
+        row = conn.execute("SELECT value, expires_at FROM translations WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= now:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        conn.execute("UPDATE translations SET accessed_at = ? WHERE key = ?", (now, key))
+        with self._lock:
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: CacheKey, result: Dict[str, Any]) -> None:
+        """Сохраняет успешный результат перевода; ошибки на диск не пишутся.
+
+        Вход:
+            key: ключ из make_cache_key,
+            result: словарь результата перевода.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        if "error" in result or self.max_entries <= 0:
+            return
+
+        now = self._clock()
+        value = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+        self._connection().execute(
+            "INSERT OR REPLACE INTO translations (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, value, now + self.ttl, now),
+        )
+
+        with self._lock:
+            self._writes_since_trim += 1
+            # Подсчёт строк - полный проход по индексу, поэтому подрезаем пачками
+            need_trim = self._writes_since_trim >= max(1, self.max_entries // 100)
+            if need_trim:
+                self._writes_since_trim = 0
+        if need_trim:
+            self.trim()
+
+    def trim(self) -> int:
+        """Удаляет истёкшие записи и самые давние записи сверх max_entries.
+
+        Возвращаю:
+            Количество удалённых записей (int).
+        """
+        conn = self._connection()
+        removed = conn.execute("DELETE FROM translations WHERE expires_at <= ?", (self._clock(),)).rowcount
+        overflow = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            removed += conn.execute(
+                "DELETE FROM translations WHERE key IN "
+                "(SELECT key FROM translations ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            ).rowcount
+        return removed
+
+    def warm_up(self, limit: int) -> List[Tuple[CacheKey, Dict[str, Any], float]]:
+        """Читает самые свежие записи одним запросом для прогрева кэша в памяти.
+
+        Вход:
+            limit: максимальное количество записей.
+
+        Возвращаю:
+            Список (ключ, результат, оставшееся время жизни в секундах).
+        """
+        if limit <= 0:
+            return []
+
+        now = self._clock()
+        rows = self._connection().execute(
+            "SELECT key, value, expires_at FROM translations WHERE expires_at > ? "
+            "ORDER BY accessed_at DESC LIMIT ?",
+            (now, limit),
+        ).fetchall()
+        return [(bytes(key), json.loads(value), expires_at - now) for key, value, expires_at in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает счётчики дискового кэша: 'hits', 'misses', 'size', 'max_entries', 'path'."""
+        size = self._connection().execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": size,
+                    "max_entries": self.max_entries, "path": self.path}
+
+    def close(self) -> None:
+        """Закрывает соединение текущего потока."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,281 @@
+"""Гонка зеркал одного провайдера с хедж-запросами для сокращения хвостовых задержек."""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+from api_client.deadline import Deadline, deadline_error
+
+# (url, text, source_lang, target_lang, deadline) -> результат перевода
+TranslateFunc = Callable[[str, str, str, str, Optional[Deadline]], Dict[str, Any]]
+
+# Ошибки, после которых имеет смысл сразу спросить другое зеркало:
+# сетевые сбои, разомкнутый выключатель, 5xx, блокировка (403) и превышение лимита (429).
+# Исчерпанная квота общая для всех зеркал провайдера, другое зеркало её не вернёт
+_RETRYABLE_ERRORS = ("request_failed", "circuit_open", "unexpected_error", "invalid_json")
+_RETRYABLE_STATUSES = (403, 408, 429)
+_PROVIDER_ERRORS = ("quota_exceeded",)
+
+# Обработчик начала запроса к зеркалу в текущем потоке (ставит MirrorGroup._call)
+_REQUEST_START = threading.local()
+
+
+def mark_request_started() -> None:
+    """Отмечает, что запрос к зеркалу действительно отправляется (ожидание лимитов позади).
+
+    Вызывается функцией перевода группы с signals_start=True; вне MirrorGroup ничего не делает.
+    """
+    callback = getattr(_REQUEST_START, "callback", None)
+    if callback is not None:
+        callback()
+
+
+def is_mirror_failure(result: Dict[str, Any]) -> bool:
+    """Проверяет, что ошибка вызвана зеркалом, а не запросом, и другое зеркало может ответить."""
+    if "error" not in result or result["error"] in _PROVIDER_ERRORS:
+        return False
+    if result["error"] in _RETRYABLE_ERRORS:
+        return True
+    status = result.get("status")
+    return isinstance(status, int) and (status >= 500 or status in _RETRYABLE_STATUSES)
+
+
+class LatencyTracker:
+    """Скользящая статистика задержек одного зеркала.
+
+    Хранит последние window успешных задержек для квантилей и EWMA всех
+    наблюдений для ранжирования. Неудачный запрос учитывается в EWMA со
+    штрафной задержкой, поэтому сбоящее зеркало опускается в рейтинге.
+    """
+
+    def __init__(self, window: int = 100, alpha: float = 0.2) -> None:
+        self.alpha = alpha
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.ewma: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        """Учитывает одно наблюдение (seconds - задержка или штраф при ошибке)."""
+        if ok:
+            self.successes += 1
+            self._samples.append(seconds)
+        else:
+            self.failures += 1
+        self.ewma = seconds if self.ewma is None else self.ewma + self.alpha * (seconds - self.ewma)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Квантиль q (0..1) успешных задержек окна или None, если наблюдений нет."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    @property
+    def sample_count(self) -> int:
+        """Число успешных задержек в окне."""
+        return len(self._samples)
+
+
+class MirrorGroup:
+    """Группа взаимозаменяемых зеркал одного провайдера.
+
+    translate() отправляет запрос лучшему зеркалу, а если ответа нет дольше
+    p95 его задержки - дублирует запрос следующему по рейтингу (хедж).
+    Побеждает первый успешный ответ; ошибки зеркал сразу передают запрос
+    следующему зеркалу. Рейтинг пересчитывается по наблюдаемым задержкам.
+    """
+
+    def __init__(self, urls: List[str], translate_func: TranslateFunc, quantile: float = 0.95,
+                 initial_delay: float = 1.0, min_delay: float = 0.05, max_hedges: int = 1,
+                 min_samples: int = 5, failure_penalty: float = 10.0, max_concurrency: int = 8,
+                 signals_start: bool = False, clock: Callable[[], float] = time.monotonic) -> None:
+        """Создаёт группу зеркал.
+
+        Вход:
+            urls: URL зеркал в порядке предпочтения до появления статистики,
+            translate_func: функция (url, text, source_lang, target_lang, deadline) -> результат,
+            quantile: квантиль задержки лучшего зеркала, после которого отправляется хедж,
+            initial_delay: задержка хеджа, пока наблюдений меньше min_samples,
+            min_delay: нижняя граница задержки хеджа,
+            max_hedges: сколько хедж-запросов можно отправить сверх первого,
+            min_samples: сколько наблюдений нужно, чтобы доверять квантилю,
+            failure_penalty: задержка, которой учитывается неудачный запрос,
+            max_concurrency: сколько вызовов translate() обслуживается одновременно
+                (пул потоков - по столько на каждое зеркало),
+            signals_start: translate_func сама вызывает mark_request_started(), когда
+                запрос отправлен (после ожидания слота ограничителя); тогда таймер
+                хеджа и задержка зеркала считаются с этого момента, а не с вызова,
+            clock: источник времени (для тестов).
+        """
+        if not urls:
+            raise ValueError("Группа зеркал не может быть пустой")
+        self.urls = list(dict.fromkeys(urls))
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_hedges = max_hedges
+        self.min_samples = min_samples
+        self.failure_penalty = failure_penalty
+        self._translate = translate_func
+        self._clock = clock
+        self._signals_start = signals_start
+        self._trackers: Dict[str, LatencyTracker] = {url: LatencyTracker() for url in self.urls}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=len(self.urls) * max(1, max_concurrency),
+                                            thread_name_prefix="mirror")
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+
+    def ranked_urls(self) -> List[str]:
+        """Зеркала от лучшего к худшему: по EWMA задержки, неопробованные - с initial_delay."""
+        with self._lock:
+            scores = {url: tracker.ewma for url, tracker in self._trackers.items()}
+        position = {url: index for index, url in enumerate(self.urls)}
+        return sorted(self.urls, key=lambda url: (self.initial_delay if scores[url] is None else scores[url],
+                                                  position[url]))
+
+    def hedge_delay(self, url: str) -> float:
+        """Сколько ждать ответа зеркала url, прежде чем отправить хедж."""
+        with self._lock:
+            tracker = self._trackers[url]
+            delay = tracker.quantile(self.quantile) if tracker.sample_count >= self.min_samples else None
+        return max(self.min_delay, self.initial_delay if delay is None else delay)
+
+    def _call(self, url: str, text: str, source_lang: str, target_lang: str,
+              deadline: Optional[Deadline], on_start: Callable[[float], None]) -> Dict[str, Any]:
+        """Выполняет запрос к зеркалу и записывает его задержку.
+
+        Задержка и on_start(момент) отсчитываются с начала запроса: при
+        signals_start - с вызова mark_request_started(), иначе с вызова translate_func.
+        """
+        started = [self._clock()]
+
+        def begin() -> None:
+            started[0] = self._clock()
+            on_start(started[0])
+
+        if self._signals_start:
+            _REQUEST_START.callback = begin
+        else:
+            on_start(started[0])
+        try:
+            result = self._translate(url, text, source_lang, target_lang, deadline)
+        except Exception as exc:
+            result = {"error": "unexpected_error", "message": str(exc), "api": url}
+        finally:
+            _REQUEST_START.callback = None
+        elapsed = self._clock() - started[0]
+        if result.get("error") == "deadline_exceeded":
+            # Обрыв по сроку ничего не говорит о скорости зеркала
+            return result
+
+        failed = is_mirror_failure(result)
+        with self._lock:
+            self._trackers[url].record(max(elapsed, self.failure_penalty) if failed else elapsed, not failed)
+        return result
+
+    def translate(self, text: str, source_lang: str, target_lang: str,
+                  deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Переводит текст самым быстрым доступным зеркалом.
+
+        Что делаю:
+            Отправляю запрос лучшему зеркалу. Если за hedge_delay ответа нет,
+            отправляю хедж следующему зеркалу (не больше max_hedges раз).
+            Время до хеджа отсчитываю с начала запроса, а не с постановки в
+            очередь пула или ожидания слота ограничителя (см. signals_start),
+            чтобы очередь не выдавалась за медленное зеркало.
+            Если зеркало вернуло сбой, сразу иду к следующему. Первый успешный
+            ответ возвращаю, а ещё не начатые запросы отменяю; уже отправленный
+            HTTP-запрос прервать нельзя, его ответ просто отбрасывается, но
+            задержка всё равно попадает в статистику. После срока deadline
+            ожидание прекращается.
+
+        Вход:
+            text: текст для перевода,
+            source_lang: исходный язык,
+            target_lang: целевой язык,
+            deadline: срок операции (None - без срока).
+
+        Возвращаю:
+            Словарь результата перевода; если все зеркала дали сбой - последнюю ошибку,
+            если истёк срок - ошибку deadline_exceeded.
+        """
+        order = self.ranked_urls()
+        pending: Set[Future] = set()
+        started: Dict[Future, int] = {}
+        # Момент, когда запрос к зеркалу с этим номером действительно начался
+        begun_at: Dict[int, float] = {}
+        hedges_left = self.max_hedges
+        last_error: Optional[Dict[str, Any]] = None
+
+        def run(index: int) -> Dict[str, Any]:
+            return self._call(order[index], text, source_lang, target_lang, deadline,
+                              lambda moment: begun_at.__setitem__(index, moment))
+
+        def launch() -> None:
+            index = len(started)
+            future = self._executor.submit(run, index)
+            started[future] = index
+            pending.add(future)
+
+        launch()
+        while pending:
+            can_hedge = hedges_left > 0 and len(started) < len(order)
+            timeout = None
+            begun = begun_at.get(len(started) - 1)
+            if can_hedge:
+                delay = self.hedge_delay(order[len(started) - 1])
+                timeout = delay if begun is None else max(0.0, begun + delay - self._clock())
+            if deadline is not None:
+                timeout = deadline.clamp(deadline.remaining() if timeout is None else timeout)
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done and deadline is not None and deadline.expired():
+                for other in pending:
+                    other.cancel()
+                return deadline_error(last_error.get("api", "Unknown") if last_error else "Unknown")
+            if not done:
+                if not can_hedge or begun is None:
+                    # Последний запрос ещё ждал потока или слота - таймер хеджа пойдёт с его начала
+                    continue
+                hedges_left -= 1
+                with self._lock:
+                    self.hedges_sent += 1
+                launch()
+                continue
+
+            for future in done:
+                pending.discard(future)
+                result = future.result()
+                if not is_mirror_failure(result):
+                    for other in pending:
+                        other.cancel()
+                    if started[future] > 0 and "error" not in result:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return result
+                last_error = result
+
+            if len(started) < len(order) and not pending:
+                launch()
+
+        return last_error or {"error": "request_failed", "message": "Все зеркала недоступны", "api": "Unknown"}
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает рейтинг зеркал и счётчики хеджей.
+
+        Возвращаю:
+            Словарь {'mirrors': {url: {'ewma', 'p95', 'successes', 'failures'}},
+                     'hedges_sent', 'hedge_wins'}.
+        """
+        with self._lock:
+            mirrors = {url: {"ewma": tracker.ewma, "p95": tracker.quantile(0.95),
+                             "successes": tracker.successes, "failures": tracker.failures}
+                       for url, tracker in self._trackers.items()}
+            return {"mirrors": mirrors, "hedges_sent": self.hedges_sent, "hedge_wins": self.hedge_wins}
+
+    def close(self) -> None:
+        """Останавливает пул потоков, не дожидаясь отброшенных запросов."""
+        self._executor.shutdown(wait=False)
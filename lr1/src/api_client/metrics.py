@@ -0,0 +1,324 @@
+"""Метрики клиента переводов: фазы задержки, коды ответов, байты, кэш и повторы.
+
+Метрики копятся в реестре METRICS и выгружаются в текстовом формате Prometheus.
+Фазы одного HTTP-запроса (соединение, TLS, первый байт) собираются через
+RequestTiming текущего потока: его заполняют соединения InstrumentedAdapter и
+хук ответа record_response.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Границы корзин гистограмм задержек в секундах
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Имя метрики -> (тип, описание)
+METRIC_HELP: Dict[str, Tuple[str, str]] = {
+    "phase_seconds": ("histogram", "Длительность фаз запроса к провайдеру (connect, tls, ttfb, request, call)"),
+    "requests_total": ("counter", "HTTP-запросы к провайдеру по коду ответа или типу ошибки"),
+    "bytes_total": ("counter", "Байты запросов и ответов (direction=sent|received)"),
+    "cache_hits_total": ("counter", "Попадания в кэш переводов (level=memory|disk)"),
+    "cache_misses_total": ("counter", "Промахи кэша переводов"),
+    "coalesced_total": ("counter", "Вызовы, получившие результат одинакового выполняющегося запроса"),
+    "retries_total": ("counter", "Повторы запросов после временных сбоев"),
+    "errors_total": ("counter", "Результаты перевода с ошибкой по типу ошибки"),
+    "rate_limit_requests_per_second": ("gauge", "Лимит частоты запросов к провайдеру (0 - без ограничения)"),
+    "rate_limit_tokens": ("gauge", "Свободные токены ведра провайдера"),
+    "rate_limit_concurrency_limit": ("gauge", "Текущий AIMD-лимит одновременных запросов к провайдеру"),
+    "rate_limit_in_flight": ("gauge", "Запросы к провайдеру в полёте"),
+    "rate_limit_quota_retry_after_seconds": ("gauge", "Сколько секунд осталось до конца паузы после исчерпания квоты"),
+    "rate_limit_requests_total": ("counter", "Запросы, прошедшие через ограничитель провайдера"),
+    "rate_limit_overloads_total": ("counter", "Ответы провайдера о превышении лимита или квоты"),
+    "rate_limit_quota_exhaustions_total": ("counter", "Ответы провайдера об исчерпании квоты"),
+    "rate_limit_wait_seconds_total": ("counter", "Суммарное ожидание токенов ведра провайдера"),
+}
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    """Приводит метки к отсортированному кортежу строк (ключ словаря метрик)."""
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    """Форматирует метки в синтаксисе Prometheus: {key="value",...}."""
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Форматирует число для Prometheus (целые - без дробной части)."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами, суммой и числом наблюдений."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Добавляет наблюдение (вызывать под блокировкой реестра)."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Накопленные счётчики корзин вида [(le, count), ..., ('+Inf', count)]."""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else _format_value(bound), total))
+        return result
+
+
+class MetricsRegistry:
+    """Потокобезопасный реестр счётчиков, значений (gauge) и гистограмм с метками."""
+
+    def __init__(self, prefix: str = "translation", buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.prefix = prefix
+        self.buckets = buckets
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """Увеличивает счётчик name с метками labels на value."""
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        """Устанавливает значение name с метками labels (для величин, которые снимаются с объектов)."""
+        key = (name, _labels(labels))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Добавляет наблюдение value в гистограмму name с метками labels."""
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Возвращает копию метрик.
+
+        Возвращаю:
+            Словарь {'counters': {name: {labels: value}}, 'gauges': {name: {labels: value}},
+                     'histograms': {name: {labels: {'count', 'sum', 'buckets'}}}},
+            где labels - кортеж пар (метка, значение).
+        """
+        with self._lock:
+            counters: Dict[str, Dict[Labels, float]] = {}
+            for (name, labels), value in self._counters.items():
+                counters.setdefault(name, {})[labels] = value
+            gauges: Dict[str, Dict[Labels, float]] = {}
+            for (name, labels), value in self._gauges.items():
+                gauges.setdefault(name, {})[labels] = value
+            histograms: Dict[str, Dict[Labels, Dict[str, Any]]] = {}
+            for (name, labels), histogram in self._histograms.items():
+                histograms.setdefault(name, {})[labels] = {
+                    "count": histogram.count, "sum": histogram.sum, "buckets": histogram.cumulative()}
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+    def render_prometheus(self) -> str:
+        """Выгружает метрики в текстовом формате Prometheus (exposition format 0.0.4)."""
+        snapshot = self.snapshot()
+        lines: List[str] = []
+        for name in sorted(set(snapshot["counters"]) | set(snapshot["gauges"]) | set(snapshot["histograms"])):
+            full_name = f"{self.prefix}_{name}"
+            default_kind = ("counter" if name in snapshot["counters"] else
+                            "gauge" if name in snapshot["gauges"] else "histogram")
+            kind, description = METRIC_HELP.get(name, (default_kind, ""))
+            lines.append(f"# HELP {full_name} {description or name}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            values = {**snapshot["counters"].get(name, {}), **snapshot["gauges"].get(name, {})}
+            for labels, value in sorted(values.items()):
+                lines.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+            for labels, histogram in sorted(snapshot["histograms"].get(name, {}).items()):
+                for bound, count in histogram["buckets"]:
+                    lines.append(f"{full_name}_bucket{_format_labels(labels + (('le', bound),))} {count}")
+                lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_value(histogram['sum'])}")
+                lines.append(f"{full_name}_count{_format_labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def reset(self) -> None:
+        """Обнуляет все метрики."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+METRICS = MetricsRegistry()
+
+
+class RequestTiming:
+    """Замеры одного вызова: фазы в секундах, код ответа, байты, уровень кэша, число попыток."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.status: Optional[int] = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.cache: Optional[str] = None
+        self.attempts = 0
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Прибавляет длительность к фазе (у повторов фазы суммируются)."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def merge(self, other: "RequestTiming") -> None:
+        """Добавляет замеры одной попытки к замерам всего вызова."""
+        for phase, seconds in other.phases.items():
+            self.add(phase, seconds)
+        self.status = other.status if other.status is not None else self.status
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        self.attempts += 1
+
+    def elapsed(self) -> float:
+        """Секунды с начала вызова."""
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Поле 'timing' результата: длительности в миллисекундах и счётчики."""
+        timing: Dict[str, Any] = {"total_ms": round(self.elapsed() * 1000, 3), "cache": self.cache or "miss",
+                                  "attempts": self.attempts}
+        for phase, seconds in self.phases.items():
+            timing[f"{phase}_ms"] = round(seconds * 1000, 3)
+        if self.status is not None:
+            timing["status"] = self.status
+        if self.bytes_sent or self.bytes_received:
+            timing["bytes_sent"] = self.bytes_sent
+            timing["bytes_received"] = self.bytes_received
+        return timing
+
+
+_STATE = threading.local()
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """Замеры вызова, выполняющегося в текущем потоке, или None."""
+    return getattr(_STATE, "timing", None)
+
+
+@contextmanager
+def track_timing() -> Iterator[RequestTiming]:
+    """Делает новый RequestTiming текущим для потока на время блока with."""
+    parent = current_timing()
+    timing = RequestTiming()
+    _STATE.timing = timing
+    # Соединение, начатое до этих замеров (например, неудачным запросом), не уменьшает их ttfb
+    _STATE.connecting = 0.0
+    try:
+        yield timing
+    finally:
+        _STATE.timing = parent
+
+
+def _note(phase: str, seconds: float) -> None:
+    """Записывает фазу в замеры текущего потока, если они ведутся."""
+    timing = current_timing()
+    if timing is not None:
+        timing.add(phase, seconds)
+
+
+def record_response(response: Any, *args: Any, **kwargs: Any) -> None:
+    """Хук ответа requests: код ответа, время до первого байта и размеры запроса и ответа.
+
+    response.elapsed включает установку соединения внутри запроса, поэтому
+    из ttfb вычитаю фазы connect и tls, записанные соединением за этот запрос.
+    """
+    connecting = getattr(_STATE, "connecting", 0.0)
+    _STATE.connecting = 0.0
+    timing = current_timing()
+    if timing is None:
+        return
+    timing.status = response.status_code
+    timing.add("ttfb", max(0.0, response.elapsed.total_seconds() - connecting))
+    request = response.request
+    body = request.body or b""
+    timing.bytes_sent += len(request.url or "") + len(body if isinstance(body, bytes) else str(body).encode("utf-8"))
+    timing.bytes_received += len(response.content or b"")
+
+
+def _note_connecting(phase: str, seconds: float) -> None:
+    """Записывает фазу соединения и запоминает её для вычета из ttfb текущего запроса."""
+    _STATE.connecting = getattr(_STATE, "connecting", 0.0) + seconds
+    _note(phase, seconds)
+
+
+class _TimedConnectionMixin:
+    """Замер установки соединения и TLS-рукопожатия вокруг connect() соединения urllib3.
+
+    _new_conn() urllib3 разрешает имя и устанавливает TCP-соединение - это
+    фаза connect; остаток connect() у HTTPS-соединения - TLS-рукопожатие (tls).
+    Соединение устанавливает штатный код urllib3, так что тайм-аут connect
+    действует один раз.
+    """
+
+    _tcp_done: Optional[float] = None
+
+    def _new_conn(self) -> Any:
+        sock = super()._new_conn()
+        self._tcp_done = time.perf_counter()
+        return sock
+
+    def connect(self) -> None:
+        self._tcp_done = None
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            finished = time.perf_counter()
+            tcp_done = self._tcp_done
+            if tcp_done is None or not isinstance(self, HTTPSConnection):
+                # TCP не установлен (ошибка) или TLS нет: всё время - фаза connect
+                _note_connecting("connect", finished - started)
+            else:
+                _note_connecting("connect", tcp_done - started)
+                _note_connecting("tls", finished - tcp_done)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    """HTTP-соединение с замером установки соединения."""
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    """HTTPS-соединение с замером установки TCP-соединения и TLS-рукопожатия."""
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """HTTPAdapter, соединения которого записывают фазы connect и tls в RequestTiming потока."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool,
+                                                   "https": _TimedHTTPSConnectionPool}
@@ -0,0 +1,207 @@
+"""Реестр провайдеров перевода и привязка URL к адаптерам."""
+
+import asyncio
+import functools
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+# Таймауты (connect, read) одного HTTP-запроса в секундах
+Timeout = Tuple[float, float]
+
+
+class TranslationProvider:
+    """Базовый адаптер провайдера перевода.
+
+    Подкласс задаёт имя, подсказки для распознавания URL, лимиты и настройки
+    соединения, реализует translate() и регистрируется через @register_provider.
+    Любую настройку можно переопределить для конкретного URL через settings.
+    HTTP-провайдер дополнительно описывает запрос в build_request() и разбирает
+    ответ в parse_response() - по ним работает асинхронный клиент; без них
+    translate_async() вызывает translate() в пуле потоков.
+
+    Атрибуты:
+        name: ключ в реестре и в ключах кэша,
+        display_name: имя для поля 'api' в результатах,
+        url_hints: подстроки URL, по которым провайдер распознаётся автоматически,
+        batch_limit: максимальный размер одного запроса в единицах batch_size(),
+        max_requests_per_second: лимит частоты запросов (0 - без ограничения),
+        burst: сколько запросов можно отправить подряд без ожидания (0 - по max_requests_per_second),
+        pool_size: размер пула соединений к хосту,
+        connect_timeout: таймаут установки соединения в секундах (0 - CONFIG.connect_timeout),
+        read_timeout: таймаут ожидания ответа в секундах (0 - CONFIG.read_timeout),
+        idempotent: повтор запроса безопасен (GET); иначе запрос не повторяется.
+    """
+
+    name: str = ""
+    display_name: str = ""
+    url_hints: Tuple[str, ...] = ()
+    batch_limit: int = 500
+    max_requests_per_second: float = 0
+    burst: float = 0
+    pool_size: int = 10
+    connect_timeout: float = 0
+    read_timeout: float = 0
+    idempotent: bool = True
+
+    def __init__(self, api_url: str, **settings: Any) -> None:
+        self.api_url = api_url
+        for key, value in settings.items():
+            if not hasattr(type(self), key) or key in ("name", "url_hints"):
+                raise ValueError(f"Неизвестная настройка провайдера {self.name}: {key}")
+            setattr(self, key, value)
+
+    @classmethod
+    def matches(cls, api_url: str) -> bool:
+        """Проверяет, похож ли URL на адрес этого провайдера."""
+        url = api_url.lower()
+        return any(hint in url for hint in cls.url_hints)
+
+    def batch_size(self, text: str) -> int:
+        """Размер текста в единицах batch_limit (по умолчанию байты UTF-8)."""
+        return len(text.encode("utf-8"))
+
+    def translate(self, text: str, source_lang: str, target_lang: str,
+                  timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        """Переводит текст; возвращает словарь результата или ошибки как translate_text.
+
+        timeout - таймауты (connect, read) этого запроса, уже обрезанные по сроку
+        операции; None - таймауты по умолчанию.
+        """
+        raise NotImplementedError
+
+    def build_request(self, text: str, source_lang: str, target_lang: str) -> Optional[Dict[str, Any]]:
+        """Описывает HTTP-запрос перевода для асинхронного клиента.
+
+        Возвращаю:
+            Словарь {'method', 'url', 'params'} (params необязателен), словарь
+            ошибки (с ключом 'error'), если запрос отправлять не нужно, или None,
+            если HTTP-описания нет.
+        """
+        return None
+
+    def parse_response(self, status: int, body: str, source_lang: str) -> Dict[str, Any]:
+        """Разбирает HTTP-ответ (код и тело) в словарь результата или ошибки; ValueError - некорректный JSON."""
+        raise NotImplementedError
+
+    async def translate_async(self, session: Any, text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+        """Асинхронный перевод.
+
+        Что делаю:
+            Отправляю запрос из build_request() через общую сессию aiohttp и
+            разбираю ответ parse_response(). Если HTTP-описания нет, вызываю
+            translate() в пуле потоков петли событий, поэтому любой
+            зарегистрированный провайдер работает и в асинхронном клиенте.
+
+        Вход:
+            session: сессия aiohttp.ClientSession,
+            text: текст,
+            source_lang: исходный язык,
+            target_lang: целевой язык.
+
+        Возвращаю:
+            Словарь с результатом перевода или ошибкой (как translate()).
+        """
+        request = self.build_request(text, source_lang, target_lang)
+        if request is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(self.translate, text, source_lang, target_lang))
+        if "error" in request:
+            return request
+
+        async with session.request(request.get("method", "GET"), request["url"], params=request.get("params")) as resp:
+            body = await resp.text()
+        try:
+            return self.parse_response(resp.status, body, source_lang)
+        except ValueError:
+            return {"error": "invalid_json", "message": "Некорректный JSON", "api": self.display_name or self.name}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.api_url!r})"
+
+
+_PROVIDER_CLASSES: Dict[str, Type[TranslationProvider]] = {}
+_ENDPOINTS: Dict[str, Optional[TranslationProvider]] = {}
+_ENDPOINTS_LOCK = threading.Lock()
+_SETTINGS: Dict[str, Dict[str, Any]] = {}
+
+
+def register_provider(cls: Type[TranslationProvider]) -> Type[TranslationProvider]:
+    """Регистрирует класс адаптера в реестре (используется как декоратор)."""
+    if not cls.name:
+        raise ValueError("У провайдера должно быть имя")
+    _PROVIDER_CLASSES[cls.name] = cls
+    return cls
+
+
+def available_providers() -> List[str]:
+    """Возвращает имена зарегистрированных провайдеров."""
+    return list(_PROVIDER_CLASSES)
+
+
+def set_provider_settings(settings: Any) -> None:
+    """Задаёт настройки по умолчанию для провайдеров.
+
+    Вход:
+        settings: словарь {имя провайдера: {настройка: значение}} или его JSON-строка.
+
+    Возвращаю:
+        Ничего (void).
+    """
+    if isinstance(settings, str):
+        settings = json.loads(settings) if settings.strip() else {}
+    _SETTINGS.clear()
+    _SETTINGS.update(settings)
+
+
+def configure_endpoint(api_url: str, provider_name: str = "", **settings: Any) -> Optional[TranslationProvider]:
+    """Привязывает URL к адаптеру провайдера.
+
+    Что делаю:
+        Беру провайдера по имени, а без имени - распознаю по url_hints.
+        Созданный адаптер запоминаю, и дальше translate_text получает его
+        поиском в словаре без разбора URL.
+
+    Вход:
+        api_url: URL конечной точки,
+        provider_name: имя провайдера (пусто - распознать по URL),
+        settings: переопределения настроек адаптера для этого URL.
+
+    Возвращаю:
+        Адаптер провайдера или None, если провайдер не определён.
+    """
+    if provider_name:
+        if provider_name not in _PROVIDER_CLASSES:
+            raise ValueError(f"Неизвестный провайдер: {provider_name}")
+        provider_class: Optional[Type[TranslationProvider]] = _PROVIDER_CLASSES[provider_name]
+    else:
+        provider_class = next((cls for cls in _PROVIDER_CLASSES.values() if cls.matches(api_url)), None)
+
+    provider = None
+    if provider_class is not None:
+        provider = provider_class(api_url, **{**_SETTINGS.get(provider_class.name, {}), **settings})
+
+    with _ENDPOINTS_LOCK:
+        _ENDPOINTS[api_url] = provider
+    return provider
+
+
+def resolve_provider(api_url: str) -> Optional[TranslationProvider]:
+    """Возвращает адаптер для URL, распознавая его только при первом обращении.
+
+    Вход:
+        api_url: URL конечной точки.
+
+    Возвращаю:
+        Адаптер провайдера или None для неизвестного API.
+    """
+    try:
+        return _ENDPOINTS[api_url]
+    except KeyError:
+        return configure_endpoint(api_url)
+
+
+def reset_endpoints() -> None:
+    """Забывает все привязки URL (для тестов и перенастройки)."""
+    with _ENDPOINTS_LOCK:
+        _ENDPOINTS.clear()
@@ -1,10 +1,233 @@
 """HTTP-клиент для Translation API (GET и POST)."""
 
+import json
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from typing import Any, Dict
-from urllib.parse import quote
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
 from config import CONFIG
+from api_client.cache import TranslationCache, make_cache_key
+from api_client.deadline import Deadline, deadline_after, deadline_error, request_timeout
+from api_client.disk_cache import DiskTranslationCache
+from api_client.hedging import MirrorGroup, mark_request_started
+from api_client.metrics import (
+    METRICS, InstrumentedAdapter, RequestTiming, current_timing, record_response, track_timing,
+)
+from api_client.rate_limit import ProviderLimiter
+from api_client.resilience import CircuitBreaker, RetryPolicy, is_retryable
+from api_client.segmentation import Span, join_segments, split_segments
+from api_client.singleflight import SingleFlight
+from api_client.providers import (
+    TranslationProvider, Timeout, register_provider, configure_endpoint, resolve_provider, set_provider_settings,
+)
+
+
+class SessionPool:
+    """Пул keep-alive сессий: по одной requests.Session на хост провайдера.
+
+    Каждая сессия держит собственный пул соединений размера pool_size,
+    поэтому повторные запросы к тому же хосту не делают TCP+TLS рукопожатие.
+    Соединения и ответы сессий записывают фазы запроса (connect, tls, первый
+    байт) в замеры текущего вызова.
+    """
+
+    def __init__(self, pool_size: int = 10) -> None:
+        self.pool_size = pool_size
+        self._sessions: Dict[str, requests.Session] = {}
+        self._pool_sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        """Возвращает ключ хоста вида 'https://example.com'."""
+        parts = urlsplit(url)
+        return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+    def get(self, url: str, pool_size: Optional[int] = None) -> requests.Session:
+        """Возвращает сессию для хоста из url, создавая её при первом обращении.
+
+        Вход:
+            url: любой URL провайдера,
+            pool_size: размер пула для новой сессии (по умолчанию self.pool_size).
+
+        Возвращаю:
+            Общую для хоста requests.Session.
+        """
+        key = self._host_key(url)
+        session = self._sessions.get(key)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                size = pool_size or self.pool_size
+                adapter = InstrumentedAdapter(pool_connections=1, pool_maxsize=size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.hooks["response"].append(record_response)
+                self._sessions[key] = session
+                self._pool_sizes[key] = size
+            return session
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Собирает статистику переиспользования соединений по хостам.
+
+        Возвращаю:
+            Словарь host -> {
+                'requests' - отправлено запросов,
+                'connections_created' - открыто новых соединений,
+                'reused' - запросов по уже открытому соединению,
+                'open_connections' - открытых соединений сейчас,
+                'pool_size' - размер пула
+            }.
+        """
+        with self._lock:
+            sessions = dict(self._sessions)
+            pool_sizes = dict(self._pool_sizes)
+
+        result: Dict[str, Dict[str, int]] = {}
+        for key, session in sessions.items():
+            adapter = session.get_adapter(key)
+            host_stats = {"requests": 0, "connections_created": 0, "reused": 0,
+                          "open_connections": 0, "pool_size": pool_sizes[key]}
+            pools = adapter.poolmanager.pools
+            for pool_key in pools.keys():
+                pool = pools.get(pool_key)
+                if pool is None:
+                    continue
+                host_stats["requests"] += pool.num_requests
+                host_stats["connections_created"] += pool.num_connections
+                if pool.pool is not None:
+                    idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+                    in_use = pool.pool.maxsize - pool.pool.qsize()
+                    host_stats["open_connections"] += idle + in_use
+            host_stats["reused"] = max(0, host_stats["requests"] - host_stats["connections_created"])
+            result[key] = host_stats
+        return result
+
+    def close(self) -> None:
+        """Закрывает все сессии и их соединения."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._pool_sizes.clear()
+        for session in sessions:
+            session.close()
+
+
+_SESSION_POOL = SessionPool(CONFIG.http_pool_size)
+
+
+def get_session(url: str) -> requests.Session:
+    """Возвращает общую keep-alive сессию для хоста из url."""
+    return _SESSION_POOL.get(url)
+
+
+def get_pool_stats() -> Dict[str, Dict[str, int]]:
+    """Возвращает статистику пулов соединений по хостам провайдеров."""
+    return _SESSION_POOL.stats()
+
+
+_CACHE = TranslationCache(CONFIG.cache_max_entries, CONFIG.cache_ttl, CONFIG.cache_negative_ttl)
+_DISK_CACHE: Optional[DiskTranslationCache] = None
+_DISK_CACHE_LOCK = threading.Lock()
+
+
+def _get_disk_cache() -> Optional[DiskTranslationCache]:
+    """Открывает дисковый кэш при первом обращении; None, если он не настроен."""
+    global _DISK_CACHE
+    if not CONFIG.disk_cache_path:
+        return None
+    if _DISK_CACHE is None:
+        with _DISK_CACHE_LOCK:
+            if _DISK_CACHE is None:
+                _DISK_CACHE = DiskTranslationCache(CONFIG.disk_cache_path, CONFIG.disk_cache_max_entries,
+                                                   CONFIG.disk_cache_ttl)
+    return _DISK_CACHE
+
+
+def warm_up_cache(limit: Optional[int] = None) -> int:
+    """Загружает самые свежие записи дискового кэша в кэш в памяти.
+
+    Вход:
+        limit: сколько записей загрузить (по умолчанию CONFIG.disk_cache_warmup).
+
+    Возвращаю:
+        Количество загруженных записей (int).
+    """
+    disk_cache = _get_disk_cache()
+    if disk_cache is None:
+        return 0
+
+    if limit is None:
+        limit = CONFIG.disk_cache_warmup
+    entries = disk_cache.warm_up(min(limit, _CACHE.max_entries))
+    # Самые свежие записи кладём последними, чтобы LRU вытеснял их позже всех
+    for key, result, ttl in reversed(entries):
+        _CACHE.put(key, result, ttl=min(ttl, _CACHE.ttl))
+    return len(entries)
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Возвращает счётчики кэша переводов (попадания, промахи, размер).
+
+    Если настроен дисковый кэш, его счётчики лежат под ключом 'disk'.
+    """
+    stats = _CACHE.stats()
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        stats["disk"] = disk_cache.stats()
+    return stats
+
+
+def get_metrics() -> Dict[str, Any]:
+    """Возвращает снимок метрик клиента (счётчики, значения ограничителей и гистограммы по провайдерам)."""
+    _export_rate_limits()
+    return METRICS.snapshot()
+
+
+def render_metrics() -> str:
+    """Возвращает метрики клиента в текстовом формате Prometheus."""
+    _export_rate_limits()
+    return METRICS.render_prometheus()
+
+
+# Поле get_rate_limit_stats() -> метрика реестра
+_RATE_LIMIT_METRICS = (
+    ("rate", "rate_limit_requests_per_second"),
+    ("tokens", "rate_limit_tokens"),
+    ("concurrency_limit", "rate_limit_concurrency_limit"),
+    ("in_flight", "rate_limit_in_flight"),
+    ("quota_retry_after", "rate_limit_quota_retry_after_seconds"),
+    ("requests", "rate_limit_requests_total"),
+    ("overloads", "rate_limit_overloads_total"),
+    ("quota_exhaustions", "rate_limit_quota_exhaustions_total"),
+    ("wait_seconds", "rate_limit_wait_seconds_total"),
+)
+
+
+def _export_rate_limits() -> None:
+    """Переносит текущие значения ограничителей провайдеров (get_rate_limit_stats) в реестр метрик."""
+    for provider_name, stats in get_rate_limit_stats().items():
+        for field, metric in _RATE_LIMIT_METRICS:
+            if stats[field] is not None:
+                METRICS.set(metric, stats[field], provider=provider_name)
+
+
+def reset_metrics() -> None:
+    """Обнуляет метрики клиента."""
+    METRICS.reset()
+
+
+def clear_cache() -> None:
+    """Очищает кэш переводов."""
+    _CACHE.clear()
 
 
 def build_headers() -> Dict[str, str]:
@@ -22,29 +245,97 @@ def _detect_api_type(api_url: str) -> str:
         api_url: строка с URL.
 
     Возвращаю:
-        'mymemory' для MyMemory,
-        'lingva' для Lingva Translate,
+        Имя провайдера из реестра ('mymemory', 'lingva', ...),
         'unknown' если не удалось определить.
     """
-    url = api_url.lower()
-    if "mymemory" in url:
-        return "mymemory"
-    if "lingva" in url:
-        return "lingva"
-    return "unknown"
+    provider = resolve_provider(api_url)
+    return provider.name if provider is not None else "unknown"
+
+
+_MIRROR_GROUPS: Dict[str, MirrorGroup] = {}
+
+
+def _translate_via(api_url: str, text: str, source_lang: str, target_lang: str,
+                   deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """Переводит текст конкретным URL в обход кэша и зеркал.
+
+    Повторов нет: сбой зеркала сразу передаёт запрос следующему зеркалу группы.
+    """
+    return _translate_uncached(resolve_provider(api_url), text, source_lang, target_lang, deadline, retries=0)
+
+
+def configure_mirrors(api_url: str, mirror_urls: List[str]) -> Optional[MirrorGroup]:
+    """Включает гонку зеркал для api_url.
+
+    Что делаю:
+        Привязываю каждое зеркало к тому же провайдеру, что и api_url, и
+        создаю MirrorGroup; после этого translate_text(api_url, ...) при
+        промахе кэша отправляет запрос самому быстрому зеркалу с хеджированием.
+
+    Вход:
+        api_url: основной URL (по нему вызывается translate_text),
+        mirror_urls: URL зеркал, включая или не включая api_url.
+
+    Возвращаю:
+        Группу зеркал или None, если провайдер api_url не определён
+        (или зеркал, кроме самого api_url, нет - тогда гонка выключается).
+    """
+    previous = _MIRROR_GROUPS.pop(api_url, None)
+    if previous is not None:
+        previous.close()
+
+    provider = resolve_provider(api_url)
+    urls = list(dict.fromkeys([api_url] + list(mirror_urls)))
+    if provider is None or len(urls) < 2:
+        return None
 
+    for url in urls[1:]:
+        configure_endpoint(url, provider.name)
+    group = MirrorGroup(urls, _translate_via, quantile=CONFIG.hedge_quantile,
+                        initial_delay=CONFIG.hedge_initial_delay, min_delay=CONFIG.hedge_min_delay,
+                        max_hedges=CONFIG.hedge_max_requests,
+                        failure_penalty=_provider_timeout(provider)[1],
+                        max_concurrency=CONFIG.batch_max_workers, signals_start=True)
+    _MIRROR_GROUPS[api_url] = group
+    return group
 
-def translate_text(api_url: str, text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+
+def get_mirror_stats() -> Dict[str, Dict[str, Any]]:
+    """Возвращает рейтинг зеркал и счётчики хеджей по основным URL."""
+    return {api_url: group.stats() for api_url, group in _MIRROR_GROUPS.items()}
+
+
+def reset_mirrors() -> None:
+    """Выключает гонку зеркал для всех URL (для тестов и перенастройки)."""
+    while _MIRROR_GROUPS:
+        _MIRROR_GROUPS.popitem()[1].close()
+
+
+def translate_text(api_url: str, text: str, source_lang: str, target_lang: str,
+                   deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """Переводит текст с помощью выбранного API.
 
     Что делаю:
-        Определяю тип API и вызываю соответствующую функцию перевода.
+        Беру адаптер провайдера, привязанный к URL, ищу результат в кэше
+        в памяти, затем в дисковом кэше (если настроен) и при промахе
+        вызываю перевод через адаптер (или гонку зеркал, если она настроена
+        через configure_mirrors). Успешный результат кэширую на обоих уровнях.
+        Одинаковые одновременные вызовы (тот же URL, текст и языки) при
+        CONFIG.single_flight объединяются в один запрос, и его результат
+        получают все ждущие.
+        Текст больше лимита запроса провайдера (batch_limit) делю на сегменты
+        по абзацам и предложениям, перевожу их параллельно и собираю по порядку
+        (см. _translate_segmented).
+        Таймауты запросов и повторы укладываются в срок deadline.
+        Если включён CONFIG.result_timing, добавляю к результату поле timing
+        с замерами вызова (см. RequestTiming.as_dict).
 
     Вход:
         api_url: URL конечной точки перевода,
         text: текст для перевода,
         source_lang: исходный язык,
-        target_lang: целевой язык.
+        target_lang: целевой язык,
+        deadline: срок операции (по умолчанию CONFIG.translate_deadline секунд от вызова).
 
     Возвращаю:
         Словарь с результатом перевода или ошибкой.
@@ -52,24 +343,578 @@ def translate_text(api_url: str, text: str, source_lang: str, target_lang: str)
     if not api_url:
         return {"error": "empty_url", "message": "API URL не указан", "api": "Unknown", "status": "Invalid URL"}
 
-    api_type = _detect_api_type(api_url)
-    headers = build_headers()
+    provider = resolve_provider(api_url)
+    if provider is None:
+        return {"error": "unknown_api", "message": "Cannot determine API type from URL", "api": "Unknown", "status": "Unknown"}
+
+    cache_key = make_cache_key(provider.name, text, source_lang, target_lang)
+    with track_timing() as timing:
+        cached = _cache_lookup(cache_key, provider.name)
+        if cached is not None:
+            return _finish_call(provider, cached, timing)
+
+        if deadline is None:
+            deadline = deadline_after(CONFIG.translate_deadline)
+        if CONFIG.single_flight:
+            result = _translate_shared(api_url, provider, cache_key, text, source_lang, target_lang, deadline)
+        else:
+            result = _translate_fresh(api_url, provider, cache_key, text, source_lang, target_lang, deadline)
+        return _finish_call(provider, result, timing)
+
+
+_IN_FLIGHT = SingleFlight()
+
+
+def get_single_flight_stats() -> Dict[str, int]:
+    """Возвращает счётчики объединения одинаковых запросов (см. SingleFlight.stats)."""
+    return _IN_FLIGHT.stats()
+
+
+def _translate_fresh(api_url: str, provider: TranslationProvider, cache_key: Optional[bytes], text: str,
+                     source_lang: str, target_lang: str, deadline: Optional[Deadline]) -> Dict[str, Any]:
+    """Переводит текст мимо кэша (через зеркала или по сегментам, если нужно) и кэширует результат.
+
+    Без cache_key (чанк translate_many) результат не кэшируется.
+    """
+    mirrors = _MIRROR_GROUPS.get(api_url)
+    spans = _oversized_spans(provider, text)
+    if spans:
+        result = _translate_segmented(api_url, text, spans, source_lang, target_lang, deadline)
+    elif mirrors is not None:
+        result = mirrors.translate(text, source_lang, target_lang, deadline)
+    else:
+        result = _translate_uncached(provider, text, source_lang, target_lang, deadline)
+    if cache_key is not None:
+        _cache_store(cache_key, result)
+    return result
+
+
+def _oversized_spans(provider: TranslationProvider, text: str) -> List[Span]:
+    """Сегменты текста больше batch_limit провайдера (пустой список, если текст помещается в один запрос)."""
+    if provider.batch_size(text) <= provider.batch_limit:
+        return []
+    spans = split_segments(text, provider.batch_limit, provider.batch_size)
+    return spans if len(spans) > 1 else []
+
+
+def _translate_segmented(api_url: str, text: str, spans: List[Span], source_lang: str, target_lang: str,
+                         deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """Переводит длинный текст по сегментам параллельно.
+
+    Что делаю:
+        Перевожу каждый сегмент через translate_text (со своим кэшем и
+        объединением одинаковых запросов) в пуле до CONFIG.batch_max_workers
+        потоков с общим сроком deadline, поэтому абзац из нескольких сегментов
+        переводится примерно за время одного запроса. Переводы склеиваю
+        в исходном порядке, сохраняя пробелы и переводы строк между сегментами.
+
+    Вход:
+        api_url: URL конечной точки перевода,
+        text: исходный текст,
+        spans: границы сегментов (split_segments),
+        source_lang: исходный язык,
+        target_lang: целевой язык,
+        deadline: срок операции (None - без срока).
+
+    Возвращаю:
+        Словарь результата с полем segments - списком {'start', 'end',
+        'translated_text'} (границы сегмента в исходном тексте и его перевод),
+        или ошибку первого неудачного сегмента с его номером в поле segment.
+    """
+    workers = max(1, min(CONFIG.batch_max_workers, len(spans)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        parts = list(executor.map(
+            lambda span: translate_text(api_url, text[span[0]:span[1]], source_lang, target_lang, deadline), spans))
+
+    for index, part in enumerate(parts):
+        if "error" in part:
+            error = {key: value for key, value in part.items() if key != "timing"}
+            error["segment"] = index
+            return error
+
+    translations = [part.get("translated_text", "") for part in parts]
+    return {
+        "translated_text": join_segments(text, spans, translations),
+        "source_language": parts[0].get("source_language", source_lang),
+        "confidence": min(part.get("confidence", 0) for part in parts),
+        "api": parts[0].get("api", "Unknown"),
+        "segments": [{"start": start, "end": end, "translated_text": translated}
+                     for (start, end), translated in zip(spans, translations)],
+    }
+
+
+def _translate_shared(api_url: str, provider: TranslationProvider, cache_key: Optional[bytes], text: str,
+                      source_lang: str, target_lang: str, deadline: Optional[Deadline]) -> Dict[str, Any]:
+    """Переводит текст, присоединяясь к такому же выполняющемуся запросу, если он есть.
+
+    Что делаю:
+        Первый вызов с ключом отправляет запрос и кэширует результат до того,
+        как ключ освободится, поэтому следующие вызовы найдут его в кэше.
+        Остальные ждут его не дольше своего срока deadline (после срока -
+        ошибка deadline_exceeded, а запрос продолжает выполняться для других)
+        и получают копию результата. Исключение запроса поднимается у всех.
+        Если чужой запрос оборвал его собственный, более короткий срок, а мой
+        ещё не истёк, пробую снова.
+
+    Вход:
+        api_url: URL конечной точки (зеркала у разных URL свои),
+        provider: адаптер провайдера,
+        cache_key: ключ кэша (провайдер, языки, нормализованный текст); None - не кэшировать
+            и объединять только запросы с точно таким же текстом,
+        text: текст,
+        source_lang: исходный язык,
+        target_lang: целевой язык,
+        deadline: срок операции (None - без срока).
+
+    Возвращаю:
+        Словарь с результатом перевода или ошибкой.
+    """
+    key = (api_url, cache_key) if cache_key is not None else (api_url, source_lang, target_lang, text)
+    while True:
+        try:
+            result, shared = _IN_FLIGHT.do(
+                key, lambda: _translate_fresh(api_url, provider, cache_key, text, source_lang, target_lang, deadline),
+                deadline.remaining() if deadline is not None else None)
+        except TimeoutError:
+            METRICS.inc("errors_total", provider=provider.name, error="deadline_exceeded")
+            return deadline_error(provider.name)
+        if not shared:
+            return result
+
+        METRICS.inc("coalesced_total", provider=provider.name)
+        timing = current_timing()
+        if timing is not None:
+            timing.cache = "shared"
+        if result.get("error") == "deadline_exceeded" and (deadline is None or not deadline.expired()):
+            continue
+        return dict(result)
+
+
+def _finish_call(provider: TranslationProvider, result: Dict[str, Any], timing: RequestTiming) -> Dict[str, Any]:
+    """Записывает длительность вызова translate_text и добавляет к результату поле timing.
+
+    В кэш поле timing не попадает: оно добавляется к копии после сохранения.
+    """
+    METRICS.observe("phase_seconds", timing.elapsed(), provider=provider.name, phase="call")
+    if not CONFIG.result_timing:
+        return result
+    return dict(result, timing=timing.as_dict())
+
+
+def _cache_lookup(cache_key: bytes, provider_name: str) -> Optional[Dict[str, Any]]:
+    """Ищет результат в кэше в памяти, затем в дисковом кэше, и учитывает попадание в метриках."""
+    level = "memory"
+    cached = _CACHE.get(cache_key)
+    if cached is None:
+        disk_cache = _get_disk_cache()
+        if disk_cache is not None:
+            cached = disk_cache.get(cache_key)
+            if cached is not None:
+                _CACHE.put(cache_key, cached)
+                level = "disk"
+
+    if cached is None:
+        METRICS.inc("cache_misses_total", provider=provider_name)
+        return None
+    METRICS.inc("cache_hits_total", provider=provider_name, level=level)
+    timing = current_timing()
+    if timing is not None:
+        timing.cache = level
+    return cached
+
+
+# Ошибки, которые говорят о состоянии клиента, а не о тексте, и не кэшируются никогда
+_UNCACHEABLE_ERRORS = ("deadline_exceeded", "circuit_open", "quota_exceeded")
+
+
+def _cache_store(cache_key: bytes, result: Dict[str, Any]) -> None:
+    """Сохраняет результат в кэш в памяти и в дисковый кэш."""
+    if result.get("error") in _UNCACHEABLE_ERRORS:
+        return
+    _CACHE.put(cache_key, result)
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        disk_cache.put(cache_key, result)
+
+
+_LIMITERS: Dict[str, ProviderLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_limiter(provider: TranslationProvider) -> ProviderLimiter:
+    """Возвращает общий ограничитель запросов провайдера, создавая его при первом обращении.
+
+    Ограничитель один на имя провайдера: квоты считаются на аккаунт/IP, а не на URL.
+    Частота берётся из max_requests_per_second и burst провайдера, пределы
+    конкурентности - из CONFIG.
+    """
+    limiter = _LIMITERS.get(provider.name)
+    if limiter is not None:
+        return limiter
+
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(provider.name)
+        if limiter is None:
+            limiter = ProviderLimiter(provider.max_requests_per_second, provider.burst,
+                                      initial_concurrency=CONFIG.rate_limit_initial_concurrency,
+                                      min_concurrency=CONFIG.rate_limit_min_concurrency,
+                                      max_concurrency=CONFIG.rate_limit_max_concurrency,
+                                      backoff=CONFIG.rate_limit_backoff,
+                                      quota_pause=CONFIG.rate_limit_quota_pause)
+            _LIMITERS[provider.name] = limiter
+        return limiter
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Возвращает текущие лимиты частоты и конкурентности по провайдерам."""
+    return {name: limiter.stats() for name, limiter in list(_LIMITERS.items())}
+
+
+def reset_rate_limits() -> None:
+    """Забывает накопленные лимиты (для тестов и перенастройки провайдеров)."""
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
+
+
+_RETRY_POLICY = RetryPolicy(CONFIG.retry_count, CONFIG.retry_base_delay, CONFIG.retry_max_delay)
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_breaker(provider: TranslationProvider) -> CircuitBreaker:
+    """Возвращает выключатель конечной точки провайдера, создавая его при первом обращении.
+
+    Выключатель свой у каждого URL: зеркала одного провайдера - разные
+    серверы, и отказ одного не должен отключать остальные.
+    """
+    breaker = _BREAKERS.get(provider.api_url)
+    if breaker is not None:
+        return breaker
+
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(provider.api_url)
+        if breaker is None:
+            breaker = CircuitBreaker(CONFIG.breaker_failure_threshold, CONFIG.breaker_recovery_timeout)
+            _BREAKERS[provider.api_url] = breaker
+        return breaker
+
+
+def get_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """Возвращает состояние выключателей по URL."""
+    return {api_url: breaker.stats() for api_url, breaker in list(_BREAKERS.items())}
+
+
+def reset_breakers() -> None:
+    """Замыкает все выключатели, забывая накопленные сбои (для тестов и перенастройки)."""
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
+
+
+def _provider_timeout(provider: TranslationProvider) -> Timeout:
+    """Таймауты (connect, read) провайдера с подстановкой значений из CONFIG."""
+    return (provider.connect_timeout or CONFIG.connect_timeout, provider.read_timeout or CONFIG.read_timeout)
+
+
+def _translate_uncached(provider: TranslationProvider, text: str, source_lang: str, target_lang: str,
+                        deadline: Optional[Deadline] = None, retries: Optional[int] = None) -> Dict[str, Any]:
+    """Выполняет запрос через адаптер провайдера в обход кэша.
+
+    Что делаю:
+        Если выключатель конечной точки разомкнут, сразу возвращаю ошибку
+        circuit_open, не тратя таймаут, а если квота провайдера исчерпана -
+        ошибку quota_exceeded до конца её паузы. Иначе отправляю запрос с соблюдением
+        лимитов провайдера и при временном сбое (сеть, 5xx, 408, 429) повторяю
+        идемпотентный запрос до CONFIG.retry_count раз с экспоненциальной
+        задержкой и джиттером. Каждый сбой учитывается выключателем.
+        Таймауты каждой попытки обрезаются по сроку deadline; повтор, который
+        не успевает до срока, не начинается, а после срока возвращается
+        ошибка deadline_exceeded.
+
+    Вход:
+        provider: адаптер провайдера,
+        text: текст,
+        source_lang: исходный язык,
+        target_lang: целевой язык,
+        deadline: срок операции (None - без срока),
+        retries: число повторов (по умолчанию CONFIG.retry_count; 0 для
+            неидемпотентных провайдеров в любом случае).
+
+    Возвращаю:
+        Словарь с результатом перевода или ошибкой.
+    """
+    breaker = get_breaker(provider)
+    if retries is None:
+        retries = _RETRY_POLICY.retries
+    if not provider.idempotent:
+        retries = 0
+    attempt = 0
+    result: Optional[Dict[str, Any]] = None
+
+    while True:
+        if deadline is not None and deadline.expired():
+            return result if result is not None else deadline_error(provider.name)
+        if not breaker.allow():
+            # Выключатель разомкнулся посреди повторов - отдаю настоящую ошибку
+            if result is not None:
+                return result
+            METRICS.inc("errors_total", provider=provider.name, error="circuit_open")
+            return {"error": "circuit_open", "message": f"{provider.display_name or provider.name} временно недоступен, "
+                    f"повтор через {breaker.retry_after():.0f} с", "api": provider.name, "status": "Circuit open"}
+        quota_wait = get_limiter(provider).quota_retry_after()
+        if quota_wait > 0:
+            breaker.release()
+            METRICS.inc("errors_total", provider=provider.name, error="quota_exceeded")
+            return {"error": "quota_exceeded", "message": f"Квота {provider.display_name or provider.name} исчерпана, "
+                    f"повтор через {quota_wait:.0f} с", "api": provider.name, "status": 429,
+                    "retry_after": round(quota_wait)}
 
+        result = _attempt(provider, text, source_lang, target_lang, deadline)
+        if result.get("error") == "deadline_exceeded" or (is_retryable(result) and deadline is not None
+                                                           and deadline.expired()):
+            # Попытку оборвал срок операции (или сокращённый по нему таймаут), а не сбой сервера
+            breaker.release()
+            return deadline_error(provider.name)
+        if not is_retryable(result):
+            breaker.record_success()
+            return result
+
+        breaker.record_failure()
+        delay = _RETRY_POLICY.delay(attempt)
+        if attempt >= retries or (deadline is not None and delay >= deadline.remaining()):
+            return result
+        METRICS.inc("retries_total", provider=provider.name)
+        time.sleep(delay)
+        attempt += 1
+
+
+def _attempt(provider: TranslationProvider, text: str, source_lang: str, target_lang: str,
+             deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """Одна попытка запроса через адаптер с соблюдением лимитов провайдера и срока.
+
+    Время ожидания лимитов в фазу request не входит: она замеряется внутри слота,
+    и с этого же момента гонка зеркал считает задержку зеркала (mark_request_started).
+    Слот и токен ждутся не дольше остатка срока: если они не освободятся до
+    срока, возвращаю deadline_exceeded, не занимая их.
+    """
+    if deadline is not None and deadline.expired():
+        return deadline_error(provider.name)
+    limiter = get_limiter(provider)
     try:
-        if api_type == "mymemory":
-            return _translate_mymemory(api_url, headers, text, source_lang, target_lang)
-        if api_type == "lingva":
-            return _translate_lingva(api_url, headers, text, source_lang, target_lang)
+        with limiter.slot(deadline.remaining() if deadline is not None else None):
+            if deadline is not None and deadline.expired():
+                return deadline_error(provider.name)
+            mark_request_started()
+            timeout = request_timeout(deadline, *_provider_timeout(provider))
+            with track_timing() as timing:
+                try:
+                    result = limiter.record(provider.translate(text, source_lang, target_lang, timeout=timeout))
 
-        return {"error": "unknown_api", "message": "Cannot determine API type from URL", "api": "Unknown", "status": "Unknown"}
+                except requests.exceptions.RequestException as e:
+                    result = {"error": "request_failed", "message": str(e), "api": provider.name}
+                except Exception as e:
+                    result = {"error": "unexpected_error", "message": str(e), "api": provider.name}
+                timing.add("request", timing.elapsed())
+    except TimeoutError:
+        return deadline_error(provider.name)
+
+    _record_attempt(provider, timing, result)
+    return result
+
+
+def _record_attempt(provider: TranslationProvider, timing: RequestTiming, result: Dict[str, Any]) -> None:
+    """Записывает замеры попытки в метрики провайдера и в замеры вызова, если они ведутся.
+
+    Метка status - HTTP-код ответа, а без ответа (сетевая ошибка, адаптер без HTTP) -
+    код ошибки результата или 'ok'.
+    """
+    for phase, seconds in timing.phases.items():
+        METRICS.observe("phase_seconds", seconds, provider=provider.name, phase=phase)
+    status = timing.status if timing.status is not None else result.get("error", "ok")
+    METRICS.inc("requests_total", provider=provider.name, status=status)
+    if timing.bytes_sent or timing.bytes_received:
+        METRICS.inc("bytes_total", timing.bytes_sent, provider=provider.name, direction="sent")
+        METRICS.inc("bytes_total", timing.bytes_received, provider=provider.name, direction="received")
+    if "error" in result:
+        METRICS.inc("errors_total", provider=provider.name, error=result["error"])
+
+    call_timing = current_timing()
+    if call_timing is not None:
+        call_timing.merge(timing)
+
+
+def translate_all(api_urls: List[str], text: str, source_lang: str, target_lang: str,
+                  deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+    """Переводит текст всеми API одновременно.
+
+    Что делаю:
+        Запускаю translate_text для каждого URL в отдельном потоке с общим
+        сроком, так что общее время равно времени самого медленного API,
+        но не больше срока.
+
+    Вход:
+        api_urls: список URL API,
+        text: текст для перевода,
+        source_lang: исходный язык,
+        target_lang: целевой язык,
+        deadline: общий срок (по умолчанию CONFIG.translate_deadline секунд от вызова).
+
+    Возвращаю:
+        Список словарей результатов в порядке api_urls.
+    """
+    if not api_urls:
+        return []
+
+    if deadline is None:
+        deadline = deadline_after(CONFIG.translate_deadline)
+    with ThreadPoolExecutor(max_workers=len(api_urls)) as executor:
+        return list(executor.map(
+            lambda api_url: translate_text(api_url, text, source_lang, target_lang, deadline), api_urls))
+
+
+_BATCH_SEPARATOR = "\n"
+
+
+def _pack_segments(provider: TranslationProvider, texts: List[str]) -> List[List[str]]:
+    """Жадно упаковывает сегменты в чанки, не превышающие batch_limit провайдера.
+
+    Сегменты с переводами строк и сегменты больше лимита идут отдельными чанками,
+    потому что разделитель в них нельзя отличить от разделителя сегментов.
+    """
+    limit = provider.batch_limit
+    separator_size = provider.batch_size(_BATCH_SEPARATOR)
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    current_size = 0
+
+    for text in texts:
+        size = provider.batch_size(text)
+        if _BATCH_SEPARATOR in text or size >= limit:
+            # Текущий чанк закрываю, чтобы чанки шли в порядке сегментов
+            if current:
+                chunks.append(current)
+                current, current_size = [], 0
+            chunks.append([text])
+            continue
+        if current and current_size + separator_size + size > limit:
+            chunks.append(current)
+            current, current_size = [], 0
+        current_size += size + (separator_size if current else 0)
+        current.append(text)
+
+    if current:
+        chunks.append(current)
+    return chunks
 
-    except requests.exceptions.RequestException as e:
-        return {"error": "request_failed", "message": str(e), "api": api_type}
-    except Exception as e:
-        return {"error": "unexpected_error", "message": str(e), "api": api_type}
 
+def _translate_request(api_url: str, provider: TranslationProvider, text: str, source_lang: str, target_lang: str,
+                       deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """Отправляет текст тем же путём, что и translate_text при промахе кэша, но без кэширования.
 
-def _translate_mymemory(api_url: str, headers: Dict[str, str], text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+    Запрос идёт через зеркала с хеджированием (если настроены), выключатель и
+    лимиты провайдера, а одинаковые одновременные запросы объединяются
+    (CONFIG.single_flight). Результат не кэшируется: ключ кэша нормализует
+    пробелы, и чанк "a\nb" совпал бы с текстом "a b".
+    """
+    if CONFIG.single_flight:
+        return _translate_shared(api_url, provider, None, text, source_lang, target_lang, deadline)
+    return _translate_fresh(api_url, provider, None, text, source_lang, target_lang, deadline)
+
+
+def _translate_chunk(api_url: str, provider: TranslationProvider, chunk: List[str], source_lang: str,
+                     target_lang: str, deadline: Optional[Deadline] = None) -> Optional[List[Dict[str, Any]]]:
+    """Переводит чанк одним запросом (_translate_request) и разрезает ответ обратно на сегменты.
+
+    Сегмент больше лимита провайдера переводится по частям (_translate_segmented).
+
+    Возвращаю:
+        Результаты сегментов чанка или None, если провайдер вернул другое
+        число строк, чем было сегментов, и их нужно перевести по одному.
+    """
+    result = _translate_request(api_url, provider, _BATCH_SEPARATOR.join(chunk), source_lang, target_lang, deadline)
+    if len(chunk) == 1 or "error" in result:
+        return [dict(result) for _ in chunk]
+
+    parts = result.get("translated_text", "").split(_BATCH_SEPARATOR)
+    if len(parts) != len(chunk):
+        return None
+    return [dict(result, translated_text=part.strip()) for part in parts]
+
+
+def translate_many(api_url: str, texts: List[str], source_lang: str, target_lang: str,
+                   max_workers: Optional[int] = None, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+    """Переводит список текстов минимальным числом запросов.
+
+    Что делаю:
+        Убираю дубликаты (по ключу кэша), беру найденное в кэше, остальные
+        сегменты упаковываю в чанки по batch_limit провайдера, перевожу чанки
+        параллельно тем же путём, что и translate_text (зеркала, выключатель,
+        объединение одинаковых запросов), и кэширую результаты каждого сегмента.
+        Сегменты чанков, где провайдер вернул другое число строк, перевожу по
+        одному в том же пуле. Чанки, до которых очередь дошла после срока
+        deadline, не отправляются, и их сегменты получают ошибку deadline_exceeded.
+
+    Вход:
+        api_url: URL конечной точки перевода,
+        texts: список текстов,
+        source_lang: исходный язык,
+        target_lang: целевой язык,
+        max_workers: число параллельных запросов (по умолчанию CONFIG.batch_max_workers),
+        deadline: срок всей пачки (по умолчанию CONFIG.batch_deadline секунд от вызова).
+
+    Возвращаю:
+        Список словарей результатов в порядке texts.
+    """
+    provider = resolve_provider(api_url) if api_url else None
+    if provider is None:
+        error = translate_text(api_url, "", source_lang, target_lang)
+        return [dict(error) for _ in texts]
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+    # ключ кэша -> (текст для отправки, индексы во входном списке)
+    pending: Dict[bytes, Tuple[str, List[int]]] = {}
+
+    for index, text in enumerate(texts):
+        cache_key = make_cache_key(provider.name, text, source_lang, target_lang)
+        if cache_key in pending:
+            pending[cache_key][1].append(index)
+            continue
+        if not (text or "").strip():
+            results[index] = translate_text(api_url, text, source_lang, target_lang)
+            continue
+        cached = _cache_lookup(cache_key, provider.name)
+        if cached is not None:
+            results[index] = cached
+            continue
+        pending[cache_key] = (text.strip(), [index])
+
+    if deadline is None:
+        deadline = deadline_after(CONFIG.batch_deadline)
+    keys = list(pending)
+    chunks = _pack_segments(provider, [pending[key][0] for key in keys])
+    # Потоки пула создаются по мере надобности; на сегменты хватает и для перевода по одному
+    workers = max(1, min(max_workers or CONFIG.batch_max_workers, len(keys)))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunk_results = list(executor.map(
+            lambda chunk: _translate_chunk(api_url, provider, chunk, source_lang, target_lang, deadline), chunks))
+        # Сегменты несовпавших чанков - отдельными запросами в том же пуле, а не внутри задачи чанка
+        fallback = [text for chunk, chunk_result in zip(chunks, chunk_results) if chunk_result is None
+                    for text in chunk]
+        singles = iter(list(executor.map(
+            lambda text: _translate_request(api_url, provider, text, source_lang, target_lang, deadline), fallback)))
+
+    segment_results = [result for chunk, chunk_result in zip(chunks, chunk_results)
+                       for result in (chunk_result if chunk_result is not None else [next(singles) for _ in chunk])]
+    for cache_key, result in zip(keys, segment_results):
+        _cache_store(cache_key, result)
+        for index in pending[cache_key][1]:
+            results[index] = dict(result)
+
+    return results
+
+
+def _translate_mymemory(api_url: str, headers: Dict[str, str], text: str, source_lang: str, target_lang: str,
+                        timeout: Optional[Timeout] = None) -> Dict[str, Any]:
     """Перевод через MyMemory API.
 
     Что делаю:
@@ -80,31 +925,77 @@ def _translate_mymemory(api_url: str, headers: Dict[str, str], text: str, source
         headers: заголовки,
         text: текст,
         source_lang: исходный язык,
-        target_lang: целевой язык.
+        target_lang: целевой язык,
+        timeout: таймауты (connect, read) в секундах (по умолчанию из CONFIG).
 
     Возвращаю:
         Словарь с переведённым текстом или ошибкой.
     """
-    params = {"q": text, "langpair": f"{source_lang}|{target_lang}"}
+    params = _mymemory_params(text, source_lang, target_lang)
 
     try:
-        resp = requests.get(api_url, headers=headers, params=params, timeout=10)
+        resp = get_session(api_url).get(api_url, headers=headers, params=params,
+                                        timeout=timeout or (CONFIG.connect_timeout, CONFIG.read_timeout))
         if resp.status_code == 200:
-            result = resp.json()
-            if result.get("responseStatus") == 200:
-                return {"translated_text": result.get("responseData", {}).get("translatedText", ""),
-                        "source_language": source_lang, "confidence": 100, "api": "MyMemory"}
-            else:
-                return {"error": "api_error", "message": f"MyMemory API error: {result.get('responseDetails','Unknown error')}",
-                        "status": result.get("responseStatus", 500), "body": result.get("responseDetails", "Unknown error"), "api": "MyMemory"}
+            return _mymemory_result(resp.json(), source_lang)
         else:
-            return {"error": "api_error", "message": f"HTTP error {resp.status_code}", "status": resp.status_code, "body": resp.text, "api": "MyMemory"}
+            return _mymemory_http_error(resp.status_code, resp.text)
 
     except requests.exceptions.RequestException as exc:
         return {"error": "request_failed", "message": str(exc), "api": "MyMemory"}
 
 
-def _translate_lingva(api_url: str, headers: Dict[str, str], text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+def _mymemory_params(text: str, source_lang: str, target_lang: str) -> Dict[str, str]:
+    """Параметры GET-запроса MyMemory."""
+    return {"q": text, "langpair": f"{source_lang}|{target_lang}"}
+
+
+# MyMemory сообщает об исчерпании дневной квоты текстом вида
+# "MYMEMORY WARNING: YOU USED ALL AVAILABLE FREE TRANSLATIONS FOR TODAY. NEXT AVAILABLE IN 10 HOURS 20 MINUTES 33 SECONDS"
+_MYMEMORY_QUOTA_MARKER = "MYMEMORY WARNING"
+_MYMEMORY_NEXT_AVAILABLE = re.compile(r"NEXT AVAILABLE IN\s+(?:(\d+)\s+HOURS?)?\s*(?:(\d+)\s+MINUTES?)?\s*"
+                                      r"(?:(\d+)\s+SECONDS?)?")
+
+
+def _mymemory_quota_error(details: Any) -> Optional[Dict[str, Any]]:
+    """Строит ошибку quota_exceeded, если текст ответа MyMemory - предупреждение о квоте, иначе None.
+
+    retry_after - секунды до восстановления квоты из текста предупреждения (если они там есть).
+    """
+    text = str(details or "")
+    if _MYMEMORY_QUOTA_MARKER not in text.upper():
+        return None
+    error = {"error": "quota_exceeded", "message": "MyMemory: дневная квота исчерпана", "status": 429,
+             "body": text, "api": "MyMemory"}
+    match = _MYMEMORY_NEXT_AVAILABLE.search(text.upper())
+    if match and any(match.groups()):
+        hours, minutes, seconds = (int(group or 0) for group in match.groups())
+        error["retry_after"] = hours * 3600 + minutes * 60 + seconds
+    return error
+
+
+def _mymemory_result(result: Dict[str, Any], source_lang: str) -> Dict[str, Any]:
+    """Разбирает JSON-ответ MyMemory с HTTP 200 в словарь результата."""
+    if result.get("responseStatus") == 200:
+        return {"translated_text": result.get("responseData", {}).get("translatedText", ""),
+                "source_language": source_lang, "confidence": 100, "api": "MyMemory"}
+    quota = _mymemory_quota_error(result.get("responseDetails"))
+    if quota is not None:
+        return quota
+    return {"error": "api_error", "message": f"MyMemory API error: {result.get('responseDetails','Unknown error')}",
+            "status": result.get("responseStatus", 500), "body": result.get("responseDetails", "Unknown error"), "api": "MyMemory"}
+
+
+def _mymemory_http_error(status_code: int, body: str) -> Dict[str, Any]:
+    """Строит словарь ошибки для ответа MyMemory с HTTP-кодом, отличным от 200."""
+    quota = _mymemory_quota_error(body) if status_code in (403, 429) else None
+    if quota is not None:
+        return quota
+    return {"error": "api_error", "message": f"HTTP error {status_code}", "status": status_code, "body": body, "api": "MyMemory"}
+
+
+def _translate_lingva(api_url: str, headers: Dict[str, str], text: str, source_lang: str, target_lang: str,
+                      timeout: Optional[Timeout] = None) -> Dict[str, Any]:
     """Перевод через Lingva Translate.
 
     Что делаю:
@@ -115,7 +1006,8 @@ def _translate_lingva(api_url: str, headers: Dict[str, str], text: str, source_l
         headers: заголовки,
         text: текст,
         source_lang: исходный язык,
-        target_lang: целевой язык.
+        target_lang: целевой язык,
+        timeout: таймауты (connect, read) в секундах (по умолчанию из CONFIG).
 
     Возвращаю:
         Словарь с переведённым текстом или ошибкой.
@@ -124,17 +1016,14 @@ def _translate_lingva(api_url: str, headers: Dict[str, str], text: str, source_l
     if not text:
         return {"error": "empty_text", "message": "Текст пустой", "api": "Lingva"}
 
-    encoded_text = quote(text)
-    url = f"{api_url}/{source_lang}/{target_lang}/{encoded_text}"
+    url = _lingva_url(api_url, text, source_lang, target_lang)
 
     try:
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = get_session(url).get(url, headers=headers, timeout=timeout or (CONFIG.connect_timeout, CONFIG.read_timeout))
         if resp.status_code == 200:
-            result = resp.json()
-            translated = result.get("translation", "")
-            return {"translated_text": translated, "source_language": source_lang, "confidence": 100, "api": "Lingva"}
+            return _lingva_result(resp.json(), source_lang)
         else:
-            return {"error": "api_error", "message": f"Lingva вернул код {resp.status_code}", "status": resp.status_code, "body": resp.text, "api": "Lingva"}
+            return _lingva_http_error(resp.status_code, resp.text)
 
     except requests.exceptions.RequestException as exc:
         return {"error": "request_failed", "message": str(exc), "api": "Lingva"}
@@ -142,6 +1031,96 @@ def _translate_lingva(api_url: str, headers: Dict[str, str], text: str, source_l
         return {"error": "invalid_json", "message": "Некорректный JSON", "api": "Lingva"}
 
 
+def _lingva_url(api_url: str, text: str, source_lang: str, target_lang: str) -> str:
+    """Строит URL Lingva вида {api_url}/{source}/{target}/{URL-кодированный текст}."""
+    return f"{api_url}/{source_lang}/{target_lang}/{quote(text)}"
+
+
+def _lingva_result(result: Dict[str, Any], source_lang: str) -> Dict[str, Any]:
+    """Разбирает JSON-ответ Lingva с HTTP 200 в словарь результата."""
+    return {"translated_text": result.get("translation", ""), "source_language": source_lang, "confidence": 100, "api": "Lingva"}
+
+
+def _lingva_http_error(status_code: int, body: str) -> Dict[str, Any]:
+    """Строит словарь ошибки для ответа Lingva с HTTP-кодом, отличным от 200."""
+    return {"error": "api_error", "message": f"Lingva вернул код {status_code}", "status": status_code, "body": body, "api": "Lingva"}
+
+
+class _HttpProvider(TranslationProvider):
+    """Адаптер поверх общего пула keep-alive сессий."""
+
+    def __init__(self, api_url: str, **settings: Any) -> None:
+        super().__init__(api_url, **settings)
+        # Сессия хоста создаётся сразу, чтобы пул получил размер этого провайдера
+        _SESSION_POOL.get(api_url, self.pool_size)
+
+
+@register_provider
+class MyMemoryProvider(_HttpProvider):
+    """MyMemory: GET с параметрами q и langpair, до 500 байт текста в запросе."""
+
+    name = "mymemory"
+    display_name = "MyMemory"
+    url_hints = ("mymemory",)
+    batch_limit = 500
+    # Бесплатный MyMemory без ключа: 5000 символов в сутки, частые запросы получают 429
+    max_requests_per_second = 2
+    burst = 5
+
+    def translate(self, text: str, source_lang: str, target_lang: str,
+                  timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        return _translate_mymemory(self.api_url, build_headers(), text, source_lang, target_lang,
+                                   timeout or _provider_timeout(self))
+
+    def build_request(self, text: str, source_lang: str, target_lang: str) -> Optional[Dict[str, Any]]:
+        return {"method": "GET", "url": self.api_url, "params": _mymemory_params(text, source_lang, target_lang)}
+
+    def parse_response(self, status: int, body: str, source_lang: str) -> Dict[str, Any]:
+        if status == 200:
+            return _mymemory_result(json.loads(body), source_lang)
+        return _mymemory_http_error(status, body)
+
+
+@register_provider
+class LingvaProvider(_HttpProvider):
+    """Lingva: текст передаётся в пути URL, лимит считается по длине закодированного текста."""
+
+    name = "lingva"
+    display_name = "Lingva"
+    url_hints = ("lingva",)
+    batch_limit = 1500
+    # Публичные инстансы Lingva проксируют Google Translate и отвечают 429 на всплески
+    max_requests_per_second = 5
+    burst = 10
+
+    def batch_size(self, text: str) -> int:
+        return len(quote(text))
+
+    def translate(self, text: str, source_lang: str, target_lang: str,
+                  timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        return _translate_lingva(self.api_url, build_headers(), text, source_lang, target_lang,
+                                 timeout or _provider_timeout(self))
+
+    def build_request(self, text: str, source_lang: str, target_lang: str) -> Optional[Dict[str, Any]]:
+        text = (text or "").strip()
+        if not text:
+            return {"error": "empty_text", "message": "Текст пустой", "api": "Lingva"}
+        return {"method": "GET", "url": _lingva_url(self.api_url, text, source_lang, target_lang)}
+
+    def parse_response(self, status: int, body: str, source_lang: str) -> Dict[str, Any]:
+        if status == 200:
+            return _lingva_result(json.loads(body), source_lang)
+        return _lingva_http_error(status, body)
+
+
+# Адаптеры для URL из конфигурации выбираются один раз при загрузке модуля
+set_provider_settings(CONFIG.provider_settings)
+for _url, _provider_name in CONFIG.api_endpoints:
+    configure_endpoint(_url, _provider_name)
+for _url, _mirror_urls in CONFIG.mirror_groups.items():
+    configure_mirrors(_url, _mirror_urls)
+
+
 # Быстрая отладка
 if __name__ == "__main__":
     print("Тест MyMemory...")
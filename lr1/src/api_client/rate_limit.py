@@ -0,0 +1,253 @@
+"""Ограничение частоты и адаптивная конкурентность запросов к провайдеру."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Признаки исчерпанной квоты в теле ответа (MyMemory отвечает текстом предупреждения)
+_QUOTA_MARKERS = ("QUOTA", "USED ALL AVAILABLE", "TOO MANY REQUESTS")
+# 503 сюда не входит: это отказ конкретного сервера (зеркала), им занимается его выключатель,
+# а пауза ведра задержала бы все зеркала провайдера
+_OVERLOAD_STATUSES = (429,)
+
+
+def is_quota_exhausted(result: Dict[str, Any]) -> bool:
+    """Проверяет, что провайдер сообщил об исчерпании квоты (ошибка quota_exceeded): повтор до паузы бесполезен."""
+    return result.get("error") == "quota_exceeded"
+
+
+def is_overload(result: Dict[str, Any]) -> bool:
+    """Проверяет, что провайдер отказал из-за лимита или квоты (429 или текст о квоте)."""
+    if "error" not in result:
+        return False
+    if is_quota_exhausted(result):
+        return True
+    try:
+        status = int(result.get("status") or 0)
+    except (TypeError, ValueError):
+        status = 0
+    if status in _OVERLOAD_STATUSES:
+        return True
+    text = f"{result.get('body', '')} {result.get('message', '')}".upper()
+    return any(marker in text for marker in _QUOTA_MARKERS)
+
+
+class TokenBucket:
+    """Потокобезопасное ведро токенов: не больше rate запросов в секунду, пачками до burst.
+
+    При rate <= 0 ограничения нет. pause() запрещает выдачу токенов на время,
+    например после ответа о превышении квоты.
+    """
+
+    def __init__(self, rate: float, burst: float = 0, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[float]:
+        """Ждёт свободный токен.
+
+        Что делаю:
+            Пополняю ведро по прошедшему времени и забираю токен, при нехватке -
+            в долг; ожидание равно времени, за которое долг погасится (или
+            оставшейся паузе), поэтому потоки встают в очередь без гонок.
+            Если ждать пришлось бы дольше timeout, токен не забираю.
+
+        Вход:
+            timeout: наибольшее допустимое ожидание в секундах (None - без ограничения).
+
+        Возвращаю:
+            Время ожидания в секундах (float) или None, если токен не выдан за timeout.
+        """
+        with self._lock:
+            now = self._clock()
+            delay = max(0.0, self._paused_until - now)
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                delay = max(delay, (1 - self._tokens) / self.rate)
+            if timeout is not None and delay > timeout:
+                return None
+            if self.rate > 0:
+                self._tokens -= 1
+            self.waited += delay
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+    def pause(self, seconds: float) -> None:
+        """Не выдаёт токены seconds секунд, начиная с текущего момента."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    @property
+    def available(self) -> float:
+        """Текущее число токенов (без учёта паузы)."""
+        if self.rate <= 0:
+            return float("inf")
+        with self._lock:
+            return min(self.burst, self._tokens + (self._clock() - self._updated) * self.rate)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Ограничение числа одновременных запросов по схеме AIMD.
+
+    Каждый успешный ответ увеличивает лимит на increase / limit (примерно +increase
+    за «окно» из limit запросов), ответ о перегрузке умножает лимит на decrease.
+    После уменьшения следующее возможно не раньше чем через cooldown секунд,
+    чтобы одна пачка отказов не обрушила лимит до минимума.
+    """
+
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = 16, increase: float = 1.0,
+                 decrease: float = 0.5, cooldown: float = 1.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.limit = float(min(maximum, max(minimum, initial)))
+        self.in_flight = 0
+        self.overloads = 0
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Ждёт, пока число запросов в полёте станет меньше текущего лимита.
+
+        Вход:
+            timeout: наибольшее ожидание в секундах (None - без ограничения).
+
+        Возвращаю:
+            True, если слот занят; False, если за timeout он не освободился.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, overloaded: Optional[bool]) -> None:
+        """Освобождает слот и корректирует лимит по исходу запроса.
+
+        Вход:
+            overloaded: True - провайдер ответил о превышении лимита или квоты,
+                False - запрос прошёл, None - исход неизвестен (лимит не меняется).
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if overloaded:
+                self.overloads += 1
+                now = self._clock()
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self._last_decrease = now
+            elif overloaded is not None:
+                self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+            self._condition.notify_all()
+
+
+class ProviderLimiter:
+    """Ведро токенов и AIMD-конкурентность одного провайдера.
+
+    Ответ о перегрузке уменьшает конкурентность и ставит ведро на паузу
+    backoff секунд, успешные ответы постепенно возвращают конкурентность.
+    Исчерпанная квота (quota_exceeded) закрывает провайдера на retry_after
+    из ответа или quota_pause секунд: до тех пор quota_retry_after() > 0.
+    Прочие ошибки (5xx, сетевые сбои) лимит не меняют.
+    """
+
+    def __init__(self, rate: float = 0, burst: float = 0, initial_concurrency: float = 4,
+                 min_concurrency: float = 1, max_concurrency: float = 16, backoff: float = 1.0,
+                 quota_pause: float = 3600.0, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        self.backoff = backoff
+        self.quota_pause = quota_pause
+        self.bucket = TokenBucket(rate, burst, clock, sleep)
+        self.concurrency = AdaptiveConcurrencyLimiter(initial_concurrency, min_concurrency, max_concurrency,
+                                                      clock=clock)
+        self._clock = clock
+        self.requests = 0
+        self.quota_exhaustions = 0
+        self._quota_until = float("-inf")
+        self._lock = threading.Lock()
+        # Признак перегрузки текущего запроса; у каждого потока свой
+        self._state = threading.local()
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None) -> Iterator["ProviderLimiter"]:
+        """Занимает слот конкурентности и токен на время одного запроса.
+
+        Результат запроса нужно передать в record() внутри блока with;
+        без record() (например, при исключении) исход считается неизвестным
+        и лимит конкурентности не меняется.
+        Если слот и токен нельзя получить за timeout секунд (например, до
+        срока операции), поднимаю TimeoutError, не забирая токен.
+        """
+        started = self._clock()
+        if not self.concurrency.acquire(timeout):
+            raise TimeoutError("Слот конкурентности не освободился за отведённое время")
+        self._state.overloaded = None
+        try:
+            remaining = None if timeout is None else max(0.0, timeout - (self._clock() - started))
+            if self.bucket.acquire(remaining) is None:
+                raise TimeoutError("Токен не освободится за отведённое время")
+            with self._lock:
+                self.requests += 1
+            yield self
+        finally:
+            self.concurrency.release(self._state.overloaded)
+
+    def record(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Запоминает исход запроса внутри slot(); при перегрузке ставит ведро на паузу.
+
+        Успешный ответ увеличивает лимит конкурентности, ответ о лимите или
+        квоте - уменьшает, остальные ошибки его не меняют.
+
+        Возвращаю:
+            Тот же result, чтобы вызов можно было вписать в return.
+        """
+        overloaded = is_overload(result)
+        self._state.overloaded = overloaded if overloaded or "error" not in result else None
+        if overloaded and self.backoff > 0:
+            self.bucket.pause(self.backoff)
+        if is_quota_exhausted(result):
+            pause = float(result.get("retry_after") or self.quota_pause)
+            with self._lock:
+                self.quota_exhaustions += 1
+                self._quota_until = max(self._quota_until, self._clock() + pause)
+        return result
+
+    def quota_retry_after(self) -> float:
+        """Сколько секунд осталось до конца паузы после исчерпания квоты (0 - квота доступна)."""
+        with self._lock:
+            return max(0.0, self._quota_until - self._clock())
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает текущие лимиты и счётчики.
+
+        Возвращаю:
+            Словарь {'rate', 'burst', 'tokens', 'concurrency_limit', 'in_flight',
+                     'requests', 'overloads', 'quota_exhaustions', 'quota_retry_after', 'wait_seconds'}.
+        """
+        tokens = self.bucket.available
+        return {
+            "rate": self.bucket.rate,
+            "burst": self.bucket.burst,
+            "tokens": None if tokens == float("inf") else round(tokens, 3),
+            "concurrency_limit": round(self.concurrency.limit, 3),
+            "in_flight": self.concurrency.in_flight,
+            "requests": self.requests,
+            "overloads": self.concurrency.overloads,
+            "quota_exhaustions": self.quota_exhaustions,
+            "quota_retry_after": round(self.quota_retry_after(), 3),
+            "wait_seconds": round(self.bucket.waited, 6),
+        }
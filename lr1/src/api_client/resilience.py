@@ -0,0 +1,140 @@
+"""Повторы с экспоненциальной задержкой и автоматический выключатель для провайдеров."""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Состояния выключателя
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_RETRYABLE_ERRORS = ("request_failed",)
+_RETRYABLE_STATUSES = (408, 429)
+# Исчерпанная квота приходит с кодом 429, но повтор до конца паузы квоты бесполезен
+_PERMANENT_ERRORS = ("quota_exceeded",)
+
+
+def is_retryable(result: Dict[str, Any]) -> bool:
+    """Проверяет, что ошибка временная и повтор того же запроса может помочь (сеть, 5xx, 408, 429)."""
+    if "error" not in result or result["error"] in _PERMANENT_ERRORS:
+        return False
+    if result["error"] in _RETRYABLE_ERRORS:
+        return True
+    try:
+        status = int(result.get("status") or 0)
+    except (TypeError, ValueError):
+        return False
+    return status >= 500 or status in _RETRYABLE_STATUSES
+
+
+class RetryPolicy:
+    """Политика повторов: экспоненциальная задержка с полным джиттером.
+
+    Перед повтором номер attempt (с 0) ждём случайное время от 0 до
+    min(max_delay, base_delay * multiplier ** attempt), чтобы клиенты,
+    упавшие одновременно, не повторяли запросы синхронно.
+    """
+
+    def __init__(self, retries: int = 2, base_delay: float = 0.2, max_delay: float = 2.0,
+                 multiplier: float = 2.0, rng: Optional[random.Random] = None) -> None:
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self._rng = rng or random.Random()
+
+    def delay(self, attempt: int) -> float:
+        """Задержка перед повтором номер attempt (0 - первый повтор)."""
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        return self._rng.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Автоматический выключатель одной конечной точки.
+
+    closed: запросы идут, подряд идущие сбои считаются; после failure_threshold
+    сбоев выключатель размыкается (open) и запросы сразу отклоняются.
+    Через recovery_timeout секунд он пропускает один пробный запрос (half_open):
+    успех замыкает его, сбой снова размыкает на recovery_timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        """Текущее состояние: 'closed', 'open' или 'half_open'."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        """Состояние с учётом истёкшего recovery_timeout (вызывать под блокировкой)."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Решает, можно ли отправить запрос; в half_open пропускает один пробный."""
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Отмечает ответ конечной точки и замыкает выключатель."""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Отмечает запрос, брошенный без ответа (истёк срок): освобождает пробу, не меняя состояния."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Отмечает сбой; размыкает выключатель после порога или неудачной пробы."""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+                self.trips += 1
+
+    def retry_after(self) -> float:
+        """Сколько секунд осталось до пробного запроса (0, если выключатель не разомкнут)."""
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0.0
+            return max(0.0, self.recovery_timeout - (self._clock() - self._opened_at))
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает состояние и счётчики выключателя.
+
+        Возвращаю:
+            Словарь {'state', 'consecutive_failures', 'trips', 'rejected'}.
+        """
+        with self._lock:
+            return {"state": self._current_state(), "consecutive_failures": self._failures,
+                    "trips": self.trips, "rejected": self.rejected}
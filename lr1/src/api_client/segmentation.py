@@ -0,0 +1,99 @@
+"""Разбиение длинного текста на сегменты по границам абзацев и предложений."""
+
+import re
+from typing import Callable, List, Tuple
+
+# Сегмент - границы [start, end) в исходном тексте, без пробелов по краям
+Span = Tuple[int, int]
+
+# Граница: перевод строки (жёсткая, через неё сегменты не склеиваются) или пробелы после конца предложения
+_BOUNDARY = re.compile(r"\s*\n\s*|(?<=[.!?…。！？])\s+")
+_WORD = re.compile(r"\S+")
+
+
+def _utf8_size(text: str) -> int:
+    """Размер текста в байтах UTF-8."""
+    return len(text.encode("utf-8"))
+
+
+def split_segments(text: str, limit: int, size: Callable[[str], int] = _utf8_size) -> List[Span]:
+    """Разбивает текст на сегменты не больше limit.
+
+    Что делаю:
+        Делю текст на предложения (по знакам конца предложения) и абзацы
+        (по переводам строк), затем жадно склеиваю соседние предложения одного
+        абзаца, пока сегмент помещается в limit. Предложение больше лимита
+        делю по словам, а слово больше лимита - по символам.
+
+    Вход:
+        text: исходный текст,
+        limit: максимальный размер сегмента в единицах size,
+        size: функция размера текста (например, TranslationProvider.batch_size).
+
+    Возвращаю:
+        Список границ сегментов (start, end) по порядку; пробелы между
+        сегментами в них не входят. Для пустого текста - пустой список.
+    """
+    sentences: List[Tuple[int, int, bool]] = []  # (start, end, после него перевод строки)
+    position, stop = len(text) - len(text.lstrip()), len(text.rstrip())
+    for boundary in _BOUNDARY.finditer(text, position, stop):
+        if boundary.start() > position:
+            sentences.append((position, boundary.start(), "\n" in boundary.group()))
+        position = boundary.end()
+    if position < stop:
+        sentences.append((position, stop, False))
+
+    spans: List[Span] = []
+    current: List[int] = []  # [start, end] склеиваемого сегмента
+    for start, end, hard_break in sentences:
+        if current and size(text[current[0]:end]) <= limit:
+            current[1] = end
+        else:
+            if current:
+                spans.append((current[0], current[1]))
+                current = []
+            if size(text[start:end]) <= limit:
+                current = [start, end]
+            else:
+                spans.extend(_split_sentence(text, start, end, limit, size))
+        if hard_break and current:
+            spans.append((current[0], current[1]))
+            current = []
+    if current:
+        spans.append((current[0], current[1]))
+    return spans
+
+
+def _split_sentence(text: str, start: int, end: int, limit: int, size: Callable[[str], int]) -> List[Span]:
+    """Делит предложение больше лимита по словам, а слишком длинные слова - по символам."""
+    spans: List[Span] = []
+    current: List[int] = []
+    for word in _WORD.finditer(text, start, end):
+        if current and size(text[current[0]:word.end()]) <= limit:
+            current[1] = word.end()
+            continue
+        if current:
+            spans.append((current[0], current[1]))
+            current = []
+        if size(word.group()) <= limit:
+            current = [word.start(), word.end()]
+            continue
+        piece_start = word.start()
+        for index in range(word.start() + 1, word.end()):
+            if size(text[piece_start:index + 1]) > limit:
+                spans.append((piece_start, index))
+                piece_start = index
+        current = [piece_start, word.end()]
+    if current:
+        spans.append((current[0], current[1]))
+    return spans
+
+
+def join_segments(text: str, spans: List[Span], translations: List[str]) -> str:
+    """Собирает переводы сегментов в исходном порядке, сохраняя пробелы и переводы строк между ними."""
+    parts: List[str] = []
+    for index, ((start, end), translated) in enumerate(zip(spans, translations)):
+        if index:
+            parts.append(text[spans[index - 1][1]:start])
+        parts.append(translated)
+    return "".join(parts)
@@ -0,0 +1,97 @@
+"""Объединение одинаковых одновременных запросов в один (single-flight)."""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """Выполняющийся вызов: его результат или исключение и событие завершения."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Группа вызовов, в которой одинаковые одновременные вызовы выполняются один раз.
+
+    Первый вызов с ключом (ведущий) выполняет функцию в своём потоке, остальные
+    вызовы с тем же ключом, пришедшие до её завершения, ждут и получают тот же
+    результат или то же исключение. После завершения ключ освобождается, и
+    следующий вызов выполняет функцию заново (результаты не запоминаются -
+    это задача кэша).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.leaders = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """Выполняет fn один раз на все одновременные вызовы с ключом key.
+
+        Что делаю:
+            Если вызов с таким ключом уже выполняется, жду его не дольше timeout
+            секунд и возвращаю его результат (или поднимаю его исключение).
+            Иначе выполняю fn сам и отдаю результат всем ждущим.
+
+        Вход:
+            key: ключ вызова (одинаковые ключи объединяются),
+            fn: функция без аргументов,
+            timeout: сколько ждать чужой вызов (None - без ограничения);
+                на собственный вызов не влияет.
+
+        Возвращаю:
+            Кортеж (результат, shared), где shared - получен ли результат
+            от чужого вызова. При истечении timeout поднимаю TimeoutError,
+            а чужой вызов продолжает выполняться.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            if not call.done.wait(timeout):
+                with self._lock:
+                    self.timeouts += 1
+                raise TimeoutError("Не дождался одинакового выполняющегося запроса")
+            with self._lock:
+                self.shared += 1
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счётчики группы.
+
+        Возвращаю:
+            Словарь {'in_flight', 'leaders', 'shared', 'timeouts'}.
+        """
+        with self._lock:
+            return {"in_flight": len(self._calls), "leaders": self.leaders, "shared": self.shared, "timeouts": self.timeouts}
+
+    def reset(self) -> None:
+        """Обнуляет счётчики (выполняющиеся вызовы не трогаю)."""
+        with self._lock:
+            self.leaders = self.shared = self.timeouts = 0
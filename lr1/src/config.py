@@ -2,6 +2,7 @@
 
 from dataclasses import dataclass
 import os
+from typing import Dict, List, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,6 +16,95 @@ class Config:
     """
     api1_url: str = os.getenv("LINGVA_URL", "")
     api2_url: str = os.getenv("MYMEMORY_URL", "")
+    # Явный тип провайдера для URL (пусто - определить по адресу)
+    api1_provider: str = os.getenv("LINGVA_PROVIDER", "")
+    api2_provider: str = os.getenv("MYMEMORY_PROVIDER", "")
+    # Зеркала основных API через запятую: запрос гоняется между ними с хеджированием
+    api1_mirrors: str = os.getenv("LINGVA_MIRRORS", "")
+    api2_mirrors: str = os.getenv("MYMEMORY_MIRRORS", "")
+    # Квантиль задержки лучшего зеркала, после которого отправляется хедж-запрос
+    hedge_quantile: float = float(os.getenv("HEDGE_QUANTILE", "0.95"))
+    hedge_initial_delay: float = float(os.getenv("HEDGE_INITIAL_DELAY", "1.0"))
+    hedge_min_delay: float = float(os.getenv("HEDGE_MIN_DELAY", "0.05"))
+    hedge_max_requests: int = int(os.getenv("HEDGE_MAX_REQUESTS", "1"))
+    # AIMD-конкурентность запросов к одному провайдеру, пауза после ответа о лимите
+    # и пауза после исчерпания квоты, если провайдер не сообщил время до её восстановления
+    rate_limit_initial_concurrency: int = int(os.getenv("RATE_LIMIT_INITIAL_CONCURRENCY", "4"))
+    rate_limit_min_concurrency: int = int(os.getenv("RATE_LIMIT_MIN_CONCURRENCY", "1"))
+    rate_limit_max_concurrency: int = int(os.getenv("RATE_LIMIT_MAX_CONCURRENCY", "16"))
+    rate_limit_backoff: float = float(os.getenv("RATE_LIMIT_BACKOFF", "1.0"))
+    rate_limit_quota_pause: float = float(os.getenv("RATE_LIMIT_QUOTA_PAUSE", "3600"))
+    # Таймауты одного HTTP-запроса: установка соединения и ожидание ответа
+    connect_timeout: float = float(os.getenv("CONNECT_TIMEOUT", "3.05"))
+    read_timeout: float = float(os.getenv("READ_TIMEOUT", "10"))
+    # Срок одного перевода/сравнения и одной пачки translate_many (0 - без срока)
+    translate_deadline: float = float(os.getenv("TRANSLATE_DEADLINE", "0"))
+    batch_deadline: float = float(os.getenv("BATCH_DEADLINE", "0"))
+    # Повторы идемпотентных запросов при временных сбоях (сеть, 5xx, 408, 429)
+    retry_count: int = int(os.getenv("RETRY_COUNT", "2"))
+    retry_base_delay: float = float(os.getenv("RETRY_BASE_DELAY", "0.2"))
+    retry_max_delay: float = float(os.getenv("RETRY_MAX_DELAY", "2.0"))
+    # Автоматический выключатель: сколько сбоев подряд размыкает его и через сколько секунд проба
+    breaker_failure_threshold: int = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+    breaker_recovery_timeout: float = float(os.getenv("BREAKER_RECOVERY_TIMEOUT", "30"))
+    # Объединять ли одинаковые одновременные вызовы translate_text в один запрос
+    single_flight: bool = os.getenv("SINGLE_FLIGHT", "1") == "1"
+    # Добавлять ли в результат translate_text поле timing с замерами вызова
+    result_timing: bool = os.getenv("RESULT_TIMING", "1") == "1"
+    # Дополнительные API через запятую; элемент - URL или провайдер=URL
+    extra_api_urls: str = os.getenv("EXTRA_API_URLS", "")
+    # JSON вида {"lingva": {"read_timeout": 5, "pool_size": 20}}
+    provider_settings: str = os.getenv("PROVIDER_SETTINGS", "")
+    http_pool_size: int = int(os.getenv("HTTP_POOL_SIZE", "10"))
+    async_max_concurrency: int = int(os.getenv("ASYNC_MAX_CONCURRENCY", "100"))
+    cache_max_entries: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    cache_ttl: float = float(os.getenv("CACHE_TTL", "3600"))
+    cache_negative_ttl: float = float(os.getenv("CACHE_NEGATIVE_TTL", "0"))
+    disk_cache_path: str = os.getenv("DISK_CACHE_PATH", "")
+    disk_cache_max_entries: int = int(os.getenv("DISK_CACHE_MAX_ENTRIES", "100000"))
+    disk_cache_ttl: float = float(os.getenv("DISK_CACHE_TTL", str(7 * 24 * 3600)))
+    disk_cache_warmup: int = int(os.getenv("DISK_CACHE_WARMUP", "1000"))
+    batch_max_workers: int = int(os.getenv("BATCH_MAX_WORKERS", "8"))
+    similarity_backend: str = os.getenv("SIMILARITY_BACKEND", "indel")
+    compare_workers: int = int(os.getenv("COMPARE_WORKERS", "0"))
+    # Считать ли chrF и BLEU в compare_translations (заметно дороже схожести, поэтому выключено)
+    ngram_metrics: bool = os.getenv("NGRAM_METRICS", "0") == "1"
+    # Сравнение по выровненным предложениям и число запоминаемых пар сегментов
+    aligned_comparison: bool = os.getenv("ALIGNED_COMPARISON", "0") == "1"
+    alignment_cache_size: int = int(os.getenv("ALIGNMENT_CACHE_SIZE", "4096"))
+    # Профилирование этапов сравнения (analizer.profiling); с памятью - заметно медленнее
+    profile_comparator: bool = os.getenv("PROFILE_COMPARATOR", "0") == "1"
+    profile_allocations: bool = os.getenv("PROFILE_ALLOCATIONS", "0") == "1"
+
+    @property
+    def api_endpoints(self) -> List[Tuple[str, str]]:
+        """Все настроенные API в порядке опроса: список (URL, имя провайдера или '')."""
+        endpoints = [(self.api1_url, self.api1_provider), (self.api2_url, self.api2_provider)]
+        for item in self.extra_api_urls.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            provider, separator, url = item.partition("=")
+            if separator and "://" not in provider:
+                endpoints.append((url.strip(), provider.strip()))
+            else:
+                endpoints.append((item, ""))
+        return [(url, provider) for url, provider in endpoints if url]
+
+    @property
+    def mirror_groups(self) -> Dict[str, List[str]]:
+        """Зеркала основных API: URL -> [URL, зеркало, ...]; API без зеркал не попадают."""
+        groups = {}
+        for url, mirrors in ((self.api1_url, self.api1_mirrors), (self.api2_url, self.api2_mirrors)):
+            extra = [mirror.strip() for mirror in mirrors.split(",") if mirror.strip()]
+            if url and extra:
+                groups[url] = [url] + [mirror for mirror in extra if mirror != url]
+        return groups
+
+    @property
+    def api_urls(self) -> List[str]:
+        """URL всех настроенных API в порядке опроса."""
+        return [url for url, _ in self.api_endpoints]
 
 
 CONFIG = Config()
\ No newline at end of file
@@ -3,15 +3,18 @@
 import sys
 import os
 import json
+import html
 from typing import Any
+from urllib.parse import urlsplit
 from PySide6 import QtWidgets, QtCore
 
 # Добавляем путь к src в PYTHONPATH
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from api_client.rapidapi_client import translate_text
 from config import CONFIG
-from analizer.comparator import compare_translations, get_translation_quality_score
+from analizer.comparator import compare_translations, compare_translations_multi, get_translation_quality_score
+from api_client.providers import resolve_provider
+from gui.workers import TranslationFanOut
 
 
 class MainWindow(QtWidgets.QMainWindow):
@@ -87,38 +90,26 @@ class MainWindow(QtWidgets.QMainWindow):
         self.status_label.setStyleSheet("color: green; font-weight: bold; padding: 5px;")
         layout.addWidget(self.status_label)
 
-        # Результаты переводов
+        # Результаты переводов: по панели на каждый настроенный API
+        self.api_urls = CONFIG.api_urls
+        self._result_views = []
         results_layout = QtWidgets.QHBoxLayout()
         
-        # API 1 (LibreTranslate)
-        api1_group = QtWidgets.QGroupBox("LibreTranslate API")
-        api1_layout = QtWidgets.QVBoxLayout(api1_group)
-        self.text_api1 = QtWidgets.QPlainTextEdit()
-        self.text_api1.setReadOnly(True)
-        self.text_api1.setMaximumHeight(200)
-        api1_layout.addWidget(self.text_api1)
-        
-        # Качество API 1
-        self.quality_api1 = QtWidgets.QLabel("Ожидание перевода...")
-        self.quality_api1.setStyleSheet("font-size: 12px; color: #7f8c8d;")
-        api1_layout.addWidget(self.quality_api1)
-        
-        results_layout.addWidget(api1_group)
-        
-        # API 2 (MyMemory)
-        api2_group = QtWidgets.QGroupBox("MyMemory API")
-        api2_layout = QtWidgets.QVBoxLayout(api2_group)
-        self.text_api2 = QtWidgets.QPlainTextEdit()
-        self.text_api2.setReadOnly(True)
-        self.text_api2.setMaximumHeight(200)
-        api2_layout.addWidget(self.text_api2)
-        
-        # Качество API 2
-        self.quality_api2 = QtWidgets.QLabel("Ожидание перевода...")
-        self.quality_api2.setStyleSheet("font-size: 12px; color: #7f8c8d;")
-        api2_layout.addWidget(self.quality_api2)
-        
-        results_layout.addWidget(api2_group)
+        for api_url in self.api_urls:
+            api_group = QtWidgets.QGroupBox(self._api_title(api_url))
+            api_layout = QtWidgets.QVBoxLayout(api_group)
+            text_view = QtWidgets.QPlainTextEdit()
+            text_view.setReadOnly(True)
+            text_view.setMaximumHeight(200)
+            api_layout.addWidget(text_view)
+            
+            # Качество API
+            quality_view = QtWidgets.QLabel("Ожидание перевода...")
+            quality_view.setStyleSheet("font-size: 12px; color: #7f8c8d;")
+            api_layout.addWidget(quality_view)
+            
+            results_layout.addWidget(api_group)
+            self._result_views.append((text_view, quality_view))
         
         layout.addLayout(results_layout)
 
@@ -137,11 +128,16 @@ class MainWindow(QtWidgets.QMainWindow):
         comparison_layout.addWidget(self.comparison_text)
         layout.addWidget(comparison_group)
 
+        # Запросы к API выполняются в фоне, результаты приходят сигналами
+        self.fan_out = TranslationFanOut(self)
+        self.fan_out.result_ready.connect(self.on_translation_ready)
+        self.fan_out.all_finished.connect(self.on_all_translations_ready)
+
     def on_translate(self) -> None:
         """Обработчик нажатия кнопки перевода.
         
         Что делаю:
-            Получаю переводы с двух API и сравниваю их.
+            Получаю переводы со всех настроенных API и сравниваю их.
         
         Вход:
             Нет параметров.
@@ -162,39 +158,62 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_translate.setEnabled(False)
         
         # Очищаем предыдущие результаты
-        self.text_api1.clear()
-        self.text_api2.clear()
-        self.quality_api1.setText("Переводим...")
-        self.quality_api2.setText("Переводим...")
+        for text_view, quality_view in self._result_views:
+            text_view.clear()
+            quality_view.setText("Переводим...")
         self.comparison_text.setText("Выполняется перевод...")
 
+        self.fan_out.start(self.api_urls, text, source_lang, target_lang)
+
+    def on_translation_ready(self, index: int, translation: dict) -> None:
+        """Отображает перевод одного API, как только он получен.
+
+        Что делаю:
+            Заполняю панель API с номером index и её оценку качества.
+
+        Вход:
+            index: номер API в порядке опроса,
+            translation: результат перевода (словарь).
+
+        Возвращаю:
+            Ничего (void).
+        """
+        text_view, quality_view = self._result_views[index]
+        text_view.setPlainText(self._format_translation(translation))
+        quality_view.setText(self._format_quality(get_translation_quality_score(translation)))
+
+        if self.fan_out.is_running():
+            self.comparison_text.setText("Ожидаем ответ остальных API...")
+
+    def on_all_translations_ready(self, translations: list) -> None:
+        """Сравнивает переводы, когда ответили все API.
+
+        Что делаю:
+            Сравниваю переводы, обновляю статус и разблокирую кнопку.
+
+        Вход:
+            translations: результаты переводов в порядке опроса API (список).
+
+        Возвращаю:
+            Ничего (void).
+        """
         try:
-            # Получаем переводы из API
-            translation_a = translate_text(CONFIG.api1_url, text, source_lang, target_lang)
-            translation_b = translate_text(CONFIG.api2_url, text, source_lang, target_lang)
+            if len(translations) == 2:
+                comparison = compare_translations(*translations)
+                self.comparison_text.setText(self._format_comparison(comparison))
+                success = comparison.get("both_successful", False)
+            else:
+                comparison = compare_translations_multi(translations)
+                self.comparison_text.setText(self._format_multi_comparison(comparison))
+                success = comparison["successful_count"] == len(translations) and len(translations) > 1
 
-            # Отображаем результаты
-            self.text_api1.setPlainText(self._format_translation(translation_a))
-            self.text_api2.setPlainText(self._format_translation(translation_b))
-            
-            # Оценка качества
-            quality_a = get_translation_quality_score(translation_a)
-            quality_b = get_translation_quality_score(translation_b)
-            
-            self.quality_api1.setText(self._format_quality(quality_a))
-            self.quality_api2.setText(self._format_quality(quality_b))
-            
-            # Сравнение переводов
-            comparison = compare_translations(translation_a, translation_b)
-            self.comparison_text.setText(self._format_comparison(comparison))
-            
-            if comparison.get("both_successful", False):
+            if success:
                 self.status_label.setText("Перевод завершен успешно")
                 self.status_label.setStyleSheet("color: green; font-weight: bold; padding: 5px;")
             else:
                 self.status_label.setText("Ошибка при переводе")
                 self.status_label.setStyleSheet("color: red; font-weight: bold; padding: 5px;")
-                
+
         except Exception as e:
             self.comparison_text.setText(f"Произошла ошибка: {str(e)}")
             self.status_label.setText("Произошла ошибка")
@@ -202,6 +221,12 @@ class MainWindow(QtWidgets.QMainWindow):
         finally:
             self.btn_translate.setEnabled(True)
 
+    def _api_title(self, api_url: str) -> str:
+        """Возвращает заголовок панели API: имя провайдера или адрес."""
+        provider = resolve_provider(api_url)
+        if provider is not None:
+            return f"{provider.display_name} API ({urlsplit(api_url).netloc})"
+        return api_url
 
     def _format_translation(self, translation: dict) -> str:
         """Форматирует результат перевода для отображения.
@@ -287,12 +312,47 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             similarity_text = "🔴 Различаются"
         
+        # chrF и BLEU есть в результате, только если они включены (NGRAM_METRICS=1)
+        ngrams = (f"<p><b>chrF / BLEU:</b> {comparison['chrf']:.1%} / {comparison['bleu']:.1%}</p>"
+                  if "chrf" in comparison else "")
+
         return f"""
         <h3>📈 Анализ переводов</h3>
         <p><b>Схожесть:</b> {similarity_text} ({similarity:.1%})</p>
+        {ngrams}
         <p><b>Разница в длине:</b> {length_diff} символов</p>
         <p><b>Разница в словах:</b> {word_count_diff} слов</p>
         <p><b>Разница в уверенности:</b> {confidence_diff}%</p>
-        <p><b>API 1:</b> {comparison.get('api_a_name', 'Unknown')}</p>
-        <p><b>API 2:</b> {comparison.get('api_b_name', 'Unknown')}</p>
+        <p><b>API 1:</b> {html.escape(str(comparison.get('api_a_name', 'Unknown')))}</p>
+        <p><b>API 2:</b> {html.escape(str(comparison.get('api_b_name', 'Unknown')))}</p>
+        """
+
+    def _format_multi_comparison(self, comparison: dict) -> str:
+        """Форматирует сравнение переводов нескольких API.
+        
+        Что делаю:
+            Показываю консенсусный перевод и матрицу попарной схожести.
+        
+        Вход:
+            comparison: результат compare_translations_multi (словарь).
+        
+        Возвращаю:
+            Отформатированную строку (строка).
+        """
+        if comparison.get("error_message"):
+            return f"❌ {html.escape(comparison['error_message'])}"
+        
+        # Текст перевода и имена API приходят от провайдера: экранирую их перед вставкой в HTML
+        names = [f"{index + 1}. {html.escape(str(name))}" for index, name in enumerate(comparison["api_names"])]
+        header = "".join(f"<th>{name}</th>" for name in names)
+        rows = ""
+        for name, row, ok in zip(names, comparison["similarity_matrix"], comparison["successful"]):
+            cells = "".join(f"<td>{value:.0%}</td>" if ok else "<td>—</td>" for value in row)
+            rows += f"<tr><th>{name}</th>{cells}</tr>"
+        
+        return f"""
+        <h3>📈 Анализ переводов</h3>
+        <p><b>Консенсус:</b> {names[comparison['consensus_index']]} — {html.escape(comparison['consensus_text'])}</p>
+        <p><b>Успешных API:</b> {comparison['successful_count']} из {len(names)}</p>
+        <table cellpadding="4"><tr><th></th>{header}</tr>{rows}</table>
         """
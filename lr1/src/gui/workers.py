@@ -0,0 +1,126 @@
+"""Фоновое выполнение запросов к API переводов вне GUI-потока."""
+
+import sys
+import os
+from typing import Any, Dict, List, Optional
+from PySide6 import QtCore
+
+# Добавляем путь к src в PYTHONPATH
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CONFIG
+from api_client.deadline import Deadline, deadline_after
+from api_client.rapidapi_client import translate_text
+
+
+class TranslationSignals(QtCore.QObject):
+    """Сигналы одной фоновой задачи перевода.
+
+    QRunnable не является QObject, поэтому сигналы вынесены в отдельный объект.
+    """
+    finished = QtCore.Signal(int, int, object)
+
+
+class TranslationTask(QtCore.QRunnable):
+    """Задача перевода через один API, выполняемая в пуле потоков."""
+
+    def __init__(self, generation: int, index: int, api_url: str, text: str,
+                 source_lang: str, target_lang: str, deadline: Optional[Deadline] = None) -> None:
+        super().__init__()
+        self.generation = generation
+        self.index = index
+        self.api_url = api_url
+        self.text = text
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.deadline = deadline
+        self.signals = TranslationSignals()
+
+    def run(self) -> None:
+        """Выполняет перевод и отправляет результат сигналом.
+
+        Что делаю:
+            Вызываю translate_text в рабочем потоке, любые исключения превращаю
+            в словарь с ошибкой, чтобы GUI всегда получил ответ.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        try:
+            result = translate_text(self.api_url, self.text, self.source_lang, self.target_lang, self.deadline)
+        except Exception as e:
+            result = {"error": "unexpected_error", "message": str(e), "api": "Unknown"}
+        self.signals.finished.emit(self.generation, self.index, result)
+
+
+class TranslationFanOut(QtCore.QObject):
+    """Параллельно опрашивает все настроенные API и отдаёт результаты по мере готовности.
+
+    Сигналы:
+        result_ready(index, result) - пришёл ответ от API с номером index,
+        all_finished(results) - ответили все API, results в порядке api_urls.
+    """
+    result_ready = QtCore.Signal(int, object)
+    all_finished = QtCore.Signal(object)
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None,
+                 pool: Optional[QtCore.QThreadPool] = None) -> None:
+        super().__init__(parent)
+        self._pool = pool or QtCore.QThreadPool(self)
+        self._generation = 0
+        self._results: List[Optional[Dict[str, Any]]] = []
+        self._pending = 0
+
+    def is_running(self) -> bool:
+        """Возвращает True, пока не пришли ответы от всех API текущего запуска."""
+        return self._pending > 0
+
+    def start(self, api_urls: List[str], text: str, source_lang: str, target_lang: str) -> None:
+        """Запускает перевод во всех API одновременно.
+
+        Что делаю:
+            Создаю по задаче на каждый URL и отправляю их в пул потоков.
+            Все задачи получают общий срок CONFIG.translate_deadline, так что
+            сравнение целиком укладывается в него. Ответы предыдущего запуска,
+            если они ещё придут, игнорируются.
+
+        Вход:
+            api_urls: список URL API,
+            text: текст для перевода,
+            source_lang: исходный язык,
+            target_lang: целевой язык.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        self._generation += 1
+        self._results = [None] * len(api_urls)
+        self._pending = len(api_urls)
+        self._pool.setMaxThreadCount(max(self._pool.maxThreadCount(), len(api_urls)))
+
+        if not api_urls:
+            self.all_finished.emit([])
+            return
+
+        deadline = deadline_after(CONFIG.translate_deadline)
+        for index, api_url in enumerate(api_urls):
+            task = TranslationTask(self._generation, index, api_url, text, source_lang, target_lang, deadline)
+            # Слот живёт в GUI-потоке, поэтому сигнал доставляется через очередь событий
+            task.signals.finished.connect(self._on_task_finished, QtCore.Qt.QueuedConnection)
+            self._pool.start(task)
+
+    @QtCore.Slot(int, int, object)
+    def _on_task_finished(self, generation: int, index: int, result: Dict[str, Any]) -> None:
+        """Принимает результат одной задачи в GUI-потоке."""
+        if generation != self._generation or self._results[index] is not None:
+            return
+
+        self._results[index] = result
+        self._pending -= 1
+        self.result_ready.emit(index, result)
+
+        if self._pending == 0:
+            self.all_finished.emit(list(self._results))
@@ -0,0 +1,271 @@
+"""Потоковое сравнение переводов для больших корпусов без GUI."""
+
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from api_client.deadline import deadline_after
+from api_client.rapidapi_client import translate_many
+from analizer.comparator import compare_translations, get_translation_quality_score
+from analizer.normalized import normalize_translation
+
+Segment = Tuple[int, str]
+
+CSV_FIELDS = [
+    "index", "text", "api_a", "api_b", "translation_a", "translation_b", "error_a", "error_b",
+    "both_successful", "similarity", "chrf", "bleu", "length_diff", "word_count_diff", "confidence_diff",
+    "quality_a", "quality_b",
+]
+
+
+def detect_format(path: str) -> str:
+    """Определяет формат файла по расширению: 'jsonl', 'tsv', 'csv' или 'txt'."""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    if extension in ("tsv", "csv"):
+        return extension
+    return "txt"
+
+
+def read_segments(path: str, fmt: Optional[str] = None, text_field: str = "text",
+                  column: int = 0, offset: int = 0) -> Iterator[Segment]:
+    """Лениво читает сегменты корпуса.
+
+    Что делаю:
+        Читаю файл построчно (csv - по записям через csv.reader, поля в кавычках
+        могут занимать несколько строк) и отдаю (номер записи, текст). Номер
+        записи - номер строки данных во входном файле (для csv - номер записи),
+        он же используется для продолжения с места остановки. Пустые тексты пропускаю.
+
+    Вход:
+        path: путь к корпусу,
+        fmt: 'txt' (строка - сегмент), 'jsonl' (поле text_field), 'tsv' или 'csv' (колонка column),
+        text_field: поле с текстом для jsonl,
+        column: номер колонки для tsv и csv,
+        offset: сколько первых записей пропустить.
+
+    Возвращаю:
+        Итератор пар (номер записи, текст).
+        ValueError, если строка jsonl - не JSON-объект.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in ("txt", "jsonl", "tsv", "csv"):
+        raise ValueError(f"Неподдерживаемый формат корпуса: {fmt}")
+
+    with open(path, encoding="utf-8", newline="") as handle:
+        records = csv.reader(handle) if fmt == "csv" else handle
+        for index, record in enumerate(records):
+            if index < offset:
+                continue
+            if fmt == "csv":
+                text = record[column] if column < len(record) else ""
+            else:
+                line = record.rstrip("\r\n")
+                if fmt == "jsonl":
+                    text = _jsonl_text(line, index, text_field)
+                elif fmt == "tsv":
+                    fields = line.split("\t")
+                    text = fields[column] if column < len(fields) else ""
+                else:
+                    text = line
+            if text.strip():
+                yield index, text
+
+
+def _jsonl_text(line: str, index: int, text_field: str) -> str:
+    """Достаёт текст из строки jsonl; строка, которая не JSON-объект, - ValueError с её номером."""
+    if not line.strip():
+        return ""
+    obj = json.loads(line)
+    if not isinstance(obj, dict):
+        raise ValueError(f"Строка {index} корпуса jsonl не JSON-объект: {type(obj).__name__}")
+    return obj.get(text_field, "")
+
+
+def compare_segment(index: int, text: str, translation_a: Dict[str, Any],
+                    translation_b: Dict[str, Any]) -> Dict[str, Any]:
+    """Строит плоскую запись результата для одного сегмента.
+
+    Вход:
+        index: номер записи во входном файле,
+        text: исходный текст,
+        translation_a: результат первого API,
+        translation_b: результат второго API.
+
+    Возвращаю:
+        Словарь с полями CSV_FIELDS.
+    """
+    # Каждый перевод разбирается один раз для сравнения и обеих оценок качества
+    normalized_a = normalize_translation(translation_a)
+    normalized_b = normalize_translation(translation_b)
+    comparison = compare_translations(translation_a, translation_b, normalized_a, normalized_b)
+    return {
+        "index": index,
+        "text": text,
+        "api_a": comparison["api_a_name"],
+        "api_b": comparison["api_b_name"],
+        "translation_a": translation_a.get("translated_text", ""),
+        "translation_b": translation_b.get("translated_text", ""),
+        "error_a": translation_a.get("error", ""),
+        "error_b": translation_b.get("error", ""),
+        "both_successful": comparison["both_successful"],
+        "similarity": round(comparison["similarity"], 6),
+        "chrf": round(comparison["chrf"], 6) if "chrf" in comparison else None,
+        "bleu": round(comparison["bleu"], 6) if "bleu" in comparison else None,
+        "length_diff": comparison["length_diff"],
+        "word_count_diff": comparison["word_count_diff"],
+        "confidence_diff": comparison["confidence_diff"],
+        "quality_a": round(get_translation_quality_score(translation_a, normalized_a)["overall_score"], 6),
+        "quality_b": round(get_translation_quality_score(translation_b, normalized_b)["overall_score"], 6),
+    }
+
+
+def process_batch(segments: List[Segment], api_a_url: str, api_b_url: str,
+                  source_lang: str, target_lang: str, deadline_seconds: float = 0) -> List[Dict[str, Any]]:
+    """Переводит пачку сегментов обоими API параллельно и сравнивает результаты.
+
+    Вход:
+        segments: список пар (номер записи, текст),
+        api_a_url: URL первого API,
+        api_b_url: URL второго API,
+        source_lang: исходный язык,
+        target_lang: целевой язык,
+        deadline_seconds: общий срок перевода пачки обоими API
+            (0 - CONFIG.batch_deadline); не успевшие сегменты получают ошибку deadline_exceeded.
+
+    Возвращаю:
+        Список записей результата в порядке segments.
+    """
+    texts = [text for _, text in segments]
+    deadline = deadline_after(deadline_seconds) if deadline_seconds > 0 else None
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future_a = executor.submit(translate_many, api_a_url, texts, source_lang, target_lang, deadline=deadline)
+        future_b = executor.submit(translate_many, api_b_url, texts, source_lang, target_lang, deadline=deadline)
+        translations_a, translations_b = future_a.result(), future_b.result()
+
+    return [compare_segment(index, text, translation_a, translation_b)
+            for (index, text), translation_a, translation_b in zip(segments, translations_a, translations_b)]
+
+
+class ResultWriter:
+    """Пишет записи результата в JSONL или CSV сразу по мере готовности."""
+
+    def __init__(self, handle: TextIO, fmt: str, write_header: bool) -> None:
+        self.handle = handle
+        self.fmt = fmt
+        self._csv = csv.DictWriter(handle, fieldnames=CSV_FIELDS) if fmt == "csv" else None
+        if self._csv is not None and write_header:
+            self._csv.writeheader()
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        """Записывает пачку и сбрасывает буфер на диск."""
+        for record in records:
+            if self._csv is not None:
+                self._csv.writerow(record)
+            else:
+                self.handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.handle.flush()
+
+
+def resume_offset(output_path: str, fmt: str) -> int:
+    """Определяет, с какой записи продолжать по уже записанному результату.
+
+    Что делаю:
+        Обрезаю недописанную последнюю строку (если процесс упал посреди записи)
+        и возвращаю номер записи, следующей за последней сохранённой.
+
+    Вход:
+        output_path: путь к файлу результата,
+        fmt: 'jsonl' или 'csv'.
+
+    Возвращаю:
+        Смещение во входном корпусе (int), 0 если результата ещё нет.
+    """
+    if not os.path.exists(output_path):
+        return 0
+
+    with open(output_path, "rb+") as handle:
+        data_end = handle.seek(0, os.SEEK_END)
+        position = data_end
+        while position > 0:
+            step = min(4096, position)
+            handle.seek(position - step)
+            block = handle.read(step)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                position = position - step + newline + 1
+                break
+            position -= step
+        if position != data_end:
+            handle.truncate(position)
+
+    with open(output_path, encoding="utf-8", newline="") as handle:
+        if fmt == "csv":
+            # Поля CSV могут занимать несколько строк, поэтому читаю через csv.reader
+            last_index = None
+            for row in csv.reader(handle):
+                if row and row[0].isdigit():
+                    last_index = int(row[0])
+        else:
+            last_line = ""
+            for line in handle:
+                if line.strip():
+                    last_line = line
+            last_index = json.loads(last_line)["index"] if last_line else None
+
+    return 0 if last_index is None else int(last_index) + 1
+
+
+def run_pipeline(input_path: str, output_path: str, api_a_url: str, api_b_url: str,
+                 source_lang: str, target_lang: str, input_format: Optional[str] = None,
+                 output_format: Optional[str] = None, text_field: str = "text", column: int = 0,
+                 offset: int = 0, resume: bool = False, batch_size: int = 100,
+                 batch_deadline: float = 0) -> int:
+    """Прогоняет корпус через оба API и сравнение, записывая результат по пачкам.
+
+    Что делаю:
+        Читаю корпус лениво, беру по batch_size сегментов, перевожу их
+        через translate_many обоими API, сравниваю и дописываю результат.
+        В памяти одновременно находится только одна пачка.
+
+    Вход:
+        input_path: путь к корпусу,
+        output_path: путь к файлу результата (.jsonl или .csv),
+        api_a_url: URL первого API,
+        api_b_url: URL второго API,
+        source_lang: исходный язык,
+        target_lang: целевой язык,
+        input_format: формат корпуса (по умолчанию по расширению),
+        output_format: 'jsonl' или 'csv' (по умолчанию по расширению),
+        text_field: поле с текстом для jsonl,
+        column: колонка с текстом для tsv и csv,
+        offset: номер записи, с которой начать,
+        resume: продолжить с записи после последней в output_path,
+        batch_size: размер пачки,
+        batch_deadline: срок перевода одной пачки в секундах (0 - CONFIG.batch_deadline).
+
+    Возвращаю:
+        Количество обработанных сегментов (int).
+    """
+    output_format = output_format or ("csv" if detect_format(output_path) == "csv" else "jsonl")
+    if resume:
+        offset = max(offset, resume_offset(output_path, output_format))
+
+    append = resume and os.path.exists(output_path) and os.path.getsize(output_path) > 0
+    segments = read_segments(input_path, input_format, text_field, column, offset)
+    processed = 0
+
+    with open(output_path, "a" if append else "w", encoding="utf-8", newline="") as handle:
+        writer = ResultWriter(handle, output_format, write_header=not append)
+        while True:
+            batch = list(islice(segments, batch_size))
+            if not batch:
+                break
+            writer.write(process_batch(batch, api_a_url, api_b_url, source_lang, target_lang, batch_deadline))
+            processed += len(batch)
+
+    return processed
@@ -9,13 +9,15 @@ from PySide6.QtWidgets import QApplication
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from gui.main_window import MainWindow
+from api_client.rapidapi_client import warm_up_cache
 
 
 def main() -> None:
     """Запускает GUI приложение.
     
     Что делаю:
-        Создаю QApplication и MainWindow, запускаю главный цикл.
+        Прогреваю кэш переводов с диска (если он настроен),
+        создаю QApplication и MainWindow, запускаю главный цикл.
     
     Вход:
         Нет параметров.
@@ -23,6 +25,7 @@ def main() -> None:
     Возвращаю:
         Ничего (void).
     """
+    warm_up_cache()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
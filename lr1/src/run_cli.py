@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Консольный запуск сравнения переводов для корпуса (без GUI)."""
+
+import argparse
+import sys
+import os
+from typing import List, Optional
+
+# Добавляем путь к src в PYTHONPATH
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import CONFIG
+from pipeline.corpus import run_pipeline
+from api_client.rapidapi_client import render_metrics
+from analizer.profiling import PROFILER
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description="Сравнение переводов двух API для корпуса текстов")
+    parser.add_argument("input", help="корпус: .txt (строка - сегмент), .jsonl, .tsv или .csv")
+    parser.add_argument("-o", "--output", required=True, help="файл результата: .jsonl или .csv")
+    parser.add_argument("-s", "--source", default="en", help="исходный язык (по умолчанию en)")
+    parser.add_argument("-t", "--target", default="ru", help="целевой язык (по умолчанию ru)")
+    parser.add_argument("--api-a", default=CONFIG.api1_url, help="URL первого API (по умолчанию LINGVA_URL)")
+    parser.add_argument("--api-b", default=CONFIG.api2_url, help="URL второго API (по умолчанию MYMEMORY_URL)")
+    parser.add_argument("--input-format", choices=["txt", "jsonl", "tsv", "csv"], help="формат корпуса")
+    parser.add_argument("--output-format", choices=["jsonl", "csv"], help="формат результата")
+    parser.add_argument("--text-field", default="text", help="поле с текстом в jsonl")
+    parser.add_argument("--column", type=int, default=0, help="колонка с текстом в tsv и csv")
+    parser.add_argument("--offset", type=int, default=0, help="номер записи, с которой начать")
+    parser.add_argument("--resume", action="store_true", help="продолжить после последней записи в файле результата")
+    parser.add_argument("--batch-size", type=int, default=100, help="сегментов в одной пачке")
+    parser.add_argument("--batch-deadline", type=float, default=CONFIG.batch_deadline,
+                        help="срок перевода одной пачки в секундах (0 - без срока)")
+    parser.add_argument("--metrics-file", help="куда записать метрики запросов в формате Prometheus")
+    parser.add_argument("--profile", help="профилировать этапы сравнения и записать сводку в этот JSON-файл")
+    parser.add_argument("--profile-allocations", action="store_true",
+                        help="при --profile считать ещё и выделения памяти (медленнее)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Запускает потоковое сравнение корпуса.
+
+    Что делаю:
+        Разбираю аргументы, прогоняю корпус через run_pipeline и печатаю итог.
+        Если задан --metrics-file, записываю в него метрики запросов к API,
+        если задан --profile - сводку профилирования этапов сравнения.
+
+    Вход:
+        argv: аргументы командной строки (по умолчанию sys.argv).
+
+    Возвращаю:
+        Ничего (void).
+    """
+    args = parse_args(argv)
+    if args.profile:
+        PROFILER.enable(args.profile_allocations)
+    processed = run_pipeline(
+        args.input, args.output, args.api_a, args.api_b, args.source, args.target,
+        input_format=args.input_format, output_format=args.output_format,
+        text_field=args.text_field, column=args.column, offset=args.offset,
+        resume=args.resume, batch_size=args.batch_size, batch_deadline=args.batch_deadline,
+    )
+    print(f"Обработано сегментов: {processed}", file=sys.stderr)
+    if args.metrics_file:
+        with open(args.metrics_file, "w", encoding="utf-8") as f:
+            f.write(render_metrics())
+    if args.profile:
+        PROFILER.dump(args.profile)
+        print(PROFILER.format_report(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Общие настройки pytest."""
+
+import os
+import sys
+from typing import Iterator, List
+import pytest
+
+# Модули внутри src импортируют друг друга как пакеты верхнего уровня (config, api_client, ...).
+# Тесты импортируют их так же, чтобы каждый модуль (и его общее состояние) загружался один раз.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from api_client.providers import reset_endpoints  # noqa: E402
+from api_client.rapidapi_client import (  # noqa: E402
+    clear_cache, reset_breakers, reset_metrics, reset_mirrors, reset_rate_limits, _IN_FLIGHT,
+)
+
+
+class FakeClock:
+    """Ручные часы: now задаётся тестом, sleep() сдвигает время без реального ожидания."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _reset_client_state() -> None:
+    """Сбрасывает общее состояние клиента: кэш, привязки URL, зеркала, лимиты, выключатели, метрики."""
+    clear_cache()
+    reset_endpoints()
+    reset_mirrors()
+    reset_rate_limits()
+    reset_breakers()
+    reset_metrics()
+    _IN_FLIGHT.reset()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state() -> Iterator[None]:
+    """Сбрасывает общее состояние клиента до и после каждого теста, чтобы тесты не влияли друг на друга."""
+    _reset_client_state()
+    yield
+    _reset_client_state()
@@ -0,0 +1,121 @@
+"""Тесты для выравнивания переводов по предложениям."""
+
+from analizer.alignment import SegmentComparator, align_sentences, split_sentences
+from analizer.comparator import compare_translations
+
+TEXT = ("The weather was cold. We stayed at home all day and read some old books together. "
+        "Then it snowed.\nIn the evening friends came over.")
+
+
+class TestAlignSentences:
+    """Тесты для split_sentences и align_sentences."""
+
+    def test_split_sentences(self) -> None:
+        """Тест разбиения на предложения по знакам и переводам строк.
+
+        Что делаю:
+            Разбиваю текст из двух абзацев.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        assert split_sentences(TEXT) == ["The weather was cold.",
+                                         "We stayed at home all day and read some old books together.",
+                                         "Then it snowed.", "In the evening friends came over."]
+        assert split_sentences("  ") == []
+
+    def test_merged_sentence_is_aligned_two_to_one(self) -> None:
+        """Тест: два предложения одного перевода сопоставляются с одним предложением другого.
+
+        Что делаю:
+            Выравниваю перевод, где второе и третье предложения слиты в одно.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        sentences_a = split_sentences(TEXT)
+        sentences_b = ["Было холодно.",
+                       "Мы весь день сидели дома и вместе читали старые книги, а потом пошёл снег.",
+                       "Вечером пришли друзья."]
+
+        beads = align_sentences(sentences_a, sentences_b)
+
+        assert beads == [((0, 1), (0, 1)), ((1, 3), (1, 2)), ((3, 4), (2, 3))]
+
+    def test_extremes(self) -> None:
+        """Тест выравнивания пустых и очень разных по числу предложений текстов.
+
+        Что делаю:
+            Выравниваю пустые списки, пустой с непустым и 3 предложения с 40.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        assert align_sentences([], []) == []
+        assert align_sentences([], ["a."] * 30) == [((0, 0), (index, index + 1)) for index in range(30)]
+        beads = align_sentences(["a"] * 3, ["b"] * 40)
+        assert sum(end - start for (start, end), _ in beads) == 3
+        assert sum(end - start for _, (start, end) in beads) == 40
+
+
+class TestSegmentComparator:
+    """Тесты для посегментного сравнения."""
+
+    def test_scores_and_incremental_recompute(self) -> None:
+        """Тест: оценки по сегментам и пересчёт только изменённых сегментов.
+
+        Что делаю:
+            Сравниваю текст с копией, где изменено одно предложение, затем
+            правлю это предложение ещё раз.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        comparator = SegmentComparator()
+        edited = TEXT.replace("Then it snowed.", "Then it rained.")
+
+        first = comparator.compare(TEXT, edited)
+        second = comparator.compare(TEXT, edited.replace("rained", "poured"))
+
+        assert [segment["similarity"] == 1.0 for segment in first["segments"]] == [True, True, False, True]
+        assert first["min_similarity"] == first["segments"][2]["similarity"]
+        assert first["min_similarity"] < first["similarity"] < 1.0
+        assert first["unaligned"] == 0
+        assert first["recomputed"] == 4
+        assert second["recomputed"] == 1
+        assert comparator.stats() == {"entries": 5, "hits": 3, "misses": 5}
+
+    def test_compare_translations_aligned_mode(self) -> None:
+        """Тест: compare_translations в режиме aligned берёт схожесть из выравнивания.
+
+        Что делаю:
+            Сравниваю два перевода с aligned=True и без него.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        translation_a = {"translated_text": TEXT, "confidence": 90, "api": "Lingva"}
+        translation_b = {"translated_text": TEXT.replace("cold", "warm"), "confidence": 80, "api": "MyMemory"}
+
+        aligned = compare_translations(translation_a, translation_b, aligned=True)
+        plain = compare_translations(translation_a, translation_b, aligned=False)
+
+        assert aligned["similarity"] == aligned["alignment"]["similarity"]
+        assert len(aligned["alignment"]["segments"]) == 4
+        assert "alignment" not in plain
+        assert 0.9 < plain["similarity"] < 1.0
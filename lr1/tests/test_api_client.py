@@ -1,8 +1,23 @@
 """Тесты для API клиента переводов."""
 
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator
 import pytest
+import requests
 from unittest.mock import patch, Mock
-from src.api_client.rapidapi_client import translate_text, build_headers
+from urllib.parse import unquote
+from api_client.rapidapi_client import (
+    translate_text, translate_many, translate_all, build_headers, SessionPool, get_cache_stats, _RETRY_POLICY,
+)
+
+
+@pytest.fixture(autouse=True)
+def _no_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Отключает повторы, чтобы ответы заглушек возвращались как есть."""
+    monkeypatch.setattr(_RETRY_POLICY, "retries", 0)
 
 
 class TestTranslationAPIClient:
@@ -20,23 +35,22 @@ class TestTranslationAPIClient:
         Возвращаю:
             Ничего (void).
         """
-        host = "test-host.com"
-        headers = build_headers(host)
+        headers = build_headers()
         
         assert "Accept" in headers
         assert "Content-Type" in headers
         assert headers["Accept"] == "application/json"
         assert headers["Content-Type"] == "application/json"
 
-    @patch('src.api_client.rapidapi_client.requests.post')
-    def test_translate_libretranslate_success(self, mock_post: Mock) -> None:
-        """Тест успешного перевода через LibreTranslate.
+    @patch('api_client.rapidapi_client.get_session')
+    def test_translate_lingva_success(self, mock_get_session: Mock) -> None:
+        """Тест успешного перевода через Lingva.
         
         Что делаю:
-            Мокаю успешный ответ LibreTranslate API.
+            Мокаю успешный ответ Lingva API.
         
         Вход:
-            mock_post: мок для requests.post.
+            mock_get_session: мок для get_session.
         
         Возвращаю:
             Ничего (void).
@@ -44,37 +58,28 @@ class TestTranslationAPIClient:
         # Настройка мока
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "translatedText": "Привет, как дела?",
-            "detectedLanguage": {"language": "en", "confidence": 95}
-        }
-        mock_post.return_value = mock_response
+        mock_response.json.return_value = {"translation": "Привет, как дела?"}
+        mock_get_session.return_value.get.return_value = mock_response
         
         # Вызов функции
-        result = translate_text(
-            "https://libretranslate.com/translate",
-            "libretranslate.com",
-            "Hello, how are you?",
-            "en",
-            "ru"
-        )
+        result = translate_text("https://lingva.ml/api/v1", "Hello, how are you?", "en", "ru")
         
         # Проверки
         assert result["translated_text"] == "Привет, как дела?"
         assert result["source_language"] == "en"
-        assert result["confidence"] == 95
-        assert result["api"] == "LibreTranslate"
-        mock_post.assert_called_once()
+        assert result["confidence"] == 100
+        assert result["api"] == "Lingva"
+        mock_get_session.return_value.get.assert_called_once()
 
-    @patch('src.api_client.rapidapi_client.requests.get')
-    def test_translate_mymemory_success(self, mock_get: Mock) -> None:
+    @patch('api_client.rapidapi_client.get_session')
+    def test_translate_mymemory_success(self, mock_get_session: Mock) -> None:
         """Тест успешного перевода через MyMemory.
         
         Что делаю:
             Мокаю успешный ответ MyMemory API.
         
         Вход:
-            mock_get: мок для requests.get.
+            mock_get_session: мок для get_session.
         
         Возвращаю:
             Ничего (void).
@@ -86,33 +91,27 @@ class TestTranslationAPIClient:
             "responseStatus": 200,
             "responseData": {"translatedText": "Привет, как дела?"}
         }
-        mock_get.return_value = mock_response
+        mock_get_session.return_value.get.return_value = mock_response
         
         # Вызов функции
-        result = translate_text(
-            "https://api.mymemory.translated.net/get",
-            "api.mymemory.translated.net",
-            "Hello, how are you?",
-            "en",
-            "ru"
-        )
+        result = translate_text("https://api.mymemory.translated.net/get", "Hello, how are you?", "en", "ru")
         
         # Проверки
         assert result["translated_text"] == "Привет, как дела?"
         assert result["source_language"] == "en"
         assert result["confidence"] == 100
         assert result["api"] == "MyMemory"
-        mock_get.assert_called_once()
+        mock_get_session.return_value.get.assert_called_once()
 
-    @patch('src.api_client.rapidapi_client.requests.post')
-    def test_translate_libretranslate_error(self, mock_post: Mock) -> None:
-        """Тест обработки ошибки LibreTranslate API.
+    @patch('api_client.rapidapi_client.get_session')
+    def test_translate_lingva_error(self, mock_get_session: Mock) -> None:
+        """Тест обработки ошибки Lingva API.
         
         Что делаю:
-            Мокаю ответ с ошибкой от LibreTranslate API.
+            Мокаю ответ с ошибкой от Lingva API.
         
         Вход:
-            mock_post: мок для requests.post.
+            mock_get_session: мок для get_session.
         
         Возвращаю:
             Ничего (void).
@@ -121,32 +120,26 @@ class TestTranslationAPIClient:
         mock_response = Mock()
         mock_response.status_code = 400
         mock_response.text = "Bad Request"
-        mock_post.return_value = mock_response
+        mock_get_session.return_value.get.return_value = mock_response
         
         # Вызов функции
-        result = translate_text(
-            "https://libretranslate.com/translate",
-            "libretranslate.com",
-            "Hello",
-            "en",
-            "ru"
-        )
+        result = translate_text("https://lingva.ml/api/v1", "Hello", "en", "ru")
         
         # Проверки
         assert "error" in result
         assert result["status"] == 400
         assert result["body"] == "Bad Request"
-        assert result["api"] == "LibreTranslate"
+        assert result["api"] == "Lingva"
 
-    @patch('src.api_client.rapidapi_client.requests.get')
-    def test_translate_mymemory_error(self, mock_get: Mock) -> None:
+    @patch('api_client.rapidapi_client.get_session')
+    def test_translate_mymemory_error(self, mock_get_session: Mock) -> None:
         """Тест обработки ошибки MyMemory API.
         
         Что делаю:
             Мокаю ответ с ошибкой от MyMemory API.
         
         Вход:
-            mock_get: мок для requests.get.
+            mock_get_session: мок для get_session.
         
         Возвращаю:
             Ничего (void).
@@ -158,16 +151,10 @@ class TestTranslationAPIClient:
             "responseStatus": 500,
             "responseDetails": "Internal Server Error"
         }
-        mock_get.return_value = mock_response
+        mock_get_session.return_value.get.return_value = mock_response
         
         # Вызов функции
-        result = translate_text(
-            "https://api.mymemory.translated.net/get",
-            "api.mymemory.translated.net",
-            "Hello",
-            "en",
-            "ru"
-        )
+        result = translate_text("https://api.mymemory.translated.net/get", "Hello", "en", "ru")
         
         # Проверки
         assert "error" in result
@@ -187,14 +174,374 @@ class TestTranslationAPIClient:
         Возвращаю:
             Ничего (void).
         """
-        result = translate_text(
-            "https://unknown-api.com/translate",
-            "unknown-api.com",
-            "Hello",
-            "en",
-            "ru"
-        )
+        result = translate_text("https://unknown-api.com/translate", "Hello", "en", "ru")
         
         assert "error" in result
         assert result["error"] == "unknown_api"
-        assert "Unknown API type" in result["message"]
+        assert "Cannot determine API type" in result["message"]
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Локальный HTTP/1.1 сервер с keep-alive, отвечающий как MyMemory."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps({"responseStatus": 200, "responseData": {"translatedText": "ok"}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def keep_alive_server() -> Iterator[str]:
+    """Поднимает локальный сервер и возвращает его базовый URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestSessionPool:
+    """Тесты для пула keep-alive сессий."""
+
+    def test_same_host_shares_session(self) -> None:
+        """Тест: один хост - одна сессия, разные хосты - разные сессии.
+
+        Что делаю:
+            Запрашиваю сессии для URL одного и разных хостов.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        pool = SessionPool(pool_size=4)
+
+        first = pool.get("https://lingva.ml/api/v1/en/ru/hello")
+        second = pool.get("https://LINGVA.ml/api/v1/en/ru/world")
+        other = pool.get("https://api.mymemory.translated.net/get")
+
+        assert first is second
+        assert first is not other
+        pool.close()
+
+    def test_connections_are_reused(self, keep_alive_server: str) -> None:
+        """Тест переиспользования соединения между запросами.
+
+        Что делаю:
+            Отправляю несколько запросов к локальному серверу и проверяю статистику пула.
+
+        Вход:
+            keep_alive_server: URL локального сервера.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        pool = SessionPool(pool_size=2)
+        for _ in range(3):
+            pool.get(keep_alive_server).get(f"{keep_alive_server}/get", timeout=5).content
+
+        stats = pool.stats()[keep_alive_server]
+
+        assert stats["requests"] == 3
+        assert stats["connections_created"] == 1
+        assert stats["reused"] == 2
+        assert stats["open_connections"] == 1
+        assert stats["pool_size"] == 2
+        pool.close()
+
+    @patch('api_client.rapidapi_client.get_session')
+    def test_mymemory_uses_shared_session(self, mock_get_session: Mock) -> None:
+        """Тест: MyMemory ходит в сеть через общую сессию.
+
+        Что делаю:
+            Мокаю get_session и проверяю, что запрос ушёл через неё.
+
+        Вход:
+            mock_get_session: мок для get_session.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"responseStatus": 200, "responseData": {"translatedText": "Привет"}}
+        mock_get_session.return_value.get.return_value = mock_response
+
+        result = translate_text("https://api.mymemory.translated.net/get", "Hello", "en", "ru")
+
+        assert result["translated_text"] == "Привет"
+        mock_get_session.assert_called_once_with("https://api.mymemory.translated.net/get")
+
+
+class TestTranslationCaching:
+    """Тесты кэширования в translate_text."""
+
+    @patch('api_client.rapidapi_client.get_session')
+    def test_repeat_lookup_served_from_cache(self, mock_get_session: Mock) -> None:
+        """Тест: повторный перевод того же текста не ходит в сеть.
+
+        Что делаю:
+            Дважды перевожу одинаковый текст и считаю HTTP-запросы.
+
+        Вход:
+            mock_get_session: мок для get_session.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"translation": "Привет"}
+        mock_get_session.return_value.get.return_value = mock_response
+
+        first = translate_text("https://lingva.ml/api/v1", "Hello", "en", "ru")
+        second = translate_text("https://lingva.ml/api/v1", " Hello ", "en", "ru")
+
+        assert second.pop("timing")["cache"] == "memory"
+        assert first.pop("timing")["cache"] == "miss"
+        assert first == second
+        assert mock_get_session.return_value.get.call_count == 1
+        assert get_cache_stats()["hits"] == 1
+
+    @patch('api_client.rapidapi_client.get_session')
+    def test_request_failed_not_cached(self, mock_get_session: Mock) -> None:
+        """Тест: ошибки сети не кэшируются.
+
+        Что делаю:
+            Дважды получаю ошибку соединения и проверяю, что запросов было два.
+
+        Вход:
+            mock_get_session: мок для get_session.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        mock_get_session.return_value.get.side_effect = requests.exceptions.ConnectionError("down")
+
+        first = translate_text("https://lingva.ml/api/v1", "Hello", "en", "ru")
+        translate_text("https://lingva.ml/api/v1", "Hello", "en", "ru")
+
+        assert first["error"] == "request_failed"
+        assert mock_get_session.return_value.get.call_count == 2
+
+
+def _fake_lingva_get(url: str, **kwargs: Any) -> Mock:
+    """Имитирует Lingva: переводит текст из пути URL в верхний регистр."""
+    text = unquote(url.rsplit("/", 1)[1])
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {"translation": text.upper()}
+    return response
+
+
+class TestTranslateMany:
+    """Тесты для пакетного перевода translate_many."""
+
+    @patch('api_client.rapidapi_client.get_session')
+    def test_order_and_deduplication(self, mock_get_session: Mock) -> None:
+        """Тест порядка результатов и удаления дубликатов.
+
+        Что делаю:
+            Перевожу список с повторами и проверяю, что короткие сегменты ушли одним запросом.
+
+        Вход:
+            mock_get_session: мок для get_session.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        mock_get_session.return_value.get.side_effect = _fake_lingva_get
+        texts = ["one", "two", "one", " two ", "three"]
+
+        results = translate_many("https://lingva.ml/api/v1", texts, "en", "ru")
+
+        assert [result["translated_text"] for result in results] == ["ONE", "TWO", "ONE", "TWO", "THREE"]
+        assert all(result["api"] == "Lingva" for result in results)
+        assert mock_get_session.return_value.get.call_count == 1
+
+    @patch('api_client.rapidapi_client.get_session')
+    def test_chunks_respect_provider_limit(self, mock_get_session: Mock) -> None:
+        """Тест разбиения на чанки по лимиту MyMemory.
+
+        Что делаю:
+            Перевожу 30 сегментов по 40 байт и проверяю размер каждого запроса.
+
+        Вход:
+            mock_get_session: мок для get_session.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        def fake_get(url: str, params: Dict[str, str], **kwargs: Any) -> Mock:
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {"responseStatus": 200,
+                                          "responseData": {"translatedText": params["q"].upper()}}
+            return response
+
+        mock_get_session.return_value.get.side_effect = fake_get
+        texts = [f"segment number {index:02d} " + "x" * 20 for index in range(30)]
+
+        results = translate_many("https://api.mymemory.translated.net/get", texts, "en", "ru")
+
+        assert [result["translated_text"] for result in results] == [text.upper() for text in texts]
+        calls = mock_get_session.return_value.get.call_args_list
+        assert 1 < len(calls) < len(texts)
+        assert all(len(call.kwargs["params"]["q"].encode()) <= 500 for call in calls)
+
+    @patch('api_client.rapidapi_client.get_session')
+    def test_line_count_mismatch_falls_back(self, mock_get_session: Mock) -> None:
+        """Тест перевода по одному, если провайдер склеил строки.
+
+        Что делаю:
+            Возвращаю на пакетный запрос одну строку вместо двух.
+
+        Вход:
+            mock_get_session: мок для get_session.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        def fake_get(url: str, **kwargs: Any) -> Mock:
+            response = _fake_lingva_get(url)
+            response.json.return_value["translation"] = response.json.return_value["translation"].replace("\n", " ")
+            return response
+
+        mock_get_session.return_value.get.side_effect = fake_get
+
+        results = translate_many("https://lingva.ml/api/v1", ["one", "two"], "en", "ru")
+
+        assert [result["translated_text"] for result in results] == ["ONE", "TWO"]
+        assert mock_get_session.return_value.get.call_count == 3
+
+    @patch('api_client.rapidapi_client.get_session')
+    def test_line_count_fallback_is_parallel(self, mock_get_session: Mock) -> None:
+        """Тест: после несовпадения строк сегменты переводятся по одному параллельно.
+
+        Что делаю:
+            Склеиваю строки пакетного ответа, а каждый одиночный запрос держу 0.2 с;
+            четыре сегмента по очереди заняли бы 0.8 с.
+
+        Вход:
+            mock_get_session: мок для get_session.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        def fake_get(url: str, **kwargs: Any) -> Mock:
+            response = _fake_lingva_get(url)
+            translation = response.json.return_value["translation"]
+            if "\n" in translation:
+                response.json.return_value["translation"] = translation.replace("\n", " ")
+            else:
+                time.sleep(0.2)
+            return response
+
+        mock_get_session.return_value.get.side_effect = fake_get
+
+        started = time.monotonic()
+        results = translate_many("https://lingva.ml/api/v1", ["one", "two", "three", "four"], "en", "ru")
+        elapsed = time.monotonic() - started
+
+        assert [result["translated_text"] for result in results] == ["ONE", "TWO", "THREE", "FOUR"]
+        assert mock_get_session.return_value.get.call_count == 5
+        assert elapsed < 0.6
+
+    @patch('api_client.rapidapi_client.get_session')
+    def test_identical_batches_share_request(self, mock_get_session: Mock) -> None:
+        """Тест: одинаковые одновременные пачки объединяются в один запрос чанка.
+
+        Что делаю:
+            Запускаю translate_many с одними и теми же текстами из двух потоков,
+            пока пакетный запрос длится 0.2 с.
+
+        Вход:
+            mock_get_session: мок для get_session.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        def fake_get(url: str, **kwargs: Any) -> Mock:
+            time.sleep(0.2)
+            return _fake_lingva_get(url)
+
+        mock_get_session.return_value.get.side_effect = fake_get
+        results: Dict[int, Any] = {}
+
+        def run(index: int) -> None:
+            results[index] = translate_many("https://lingva.ml/api/v1", ["one", "two"], "en", "ru")
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [result["translated_text"] for result in results[0]] == ["ONE", "TWO"]
+        assert [result["translated_text"] for result in results[1]] == ["ONE", "TWO"]
+        assert mock_get_session.return_value.get.call_count == 1
+
+    @patch('api_client.rapidapi_client.get_session')
+    def test_chunk_error_is_reported_per_segment(self, mock_get_session: Mock) -> None:
+        """Тест: ошибка пакетного запроса возвращается каждому сегменту чанка.
+
+        Что делаю:
+            Имитирую ошибку соединения.
+
+        Вход:
+            mock_get_session: мок для get_session.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        mock_get_session.return_value.get.side_effect = requests.exceptions.ConnectionError("down")
+
+        results = translate_many("https://lingva.ml/api/v1", ["one", "two"], "en", "ru")
+
+        assert [result["error"] for result in results] == ["request_failed", "request_failed"]
+
+
+class TestTranslateAll:
+    """Тесты для одновременного перевода несколькими API."""
+
+    @patch('api_client.rapidapi_client.get_session')
+    def test_results_in_url_order(self, mock_get_session: Mock) -> None:
+        """Тест порядка результатов translate_all.
+
+        Что делаю:
+            Перевожу текст тремя API и проверяю порядок результатов.
+
+        Вход:
+            mock_get_session: мок для get_session.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        def fake_get(url: str, **kwargs: Any) -> Mock:
+            response = Mock()
+            response.status_code = 200
+            if "params" in kwargs:
+                response.json.return_value = {"responseStatus": 200, "responseData": {"translatedText": "mm"}}
+            else:
+                response.json.return_value = {"translation": url.split("/")[2]}
+            return response
+
+        mock_get_session.return_value.get.side_effect = fake_get
+        urls = ["https://lingva.ml/api/v1", "https://api.mymemory.translated.net/get", "https://example.com/translate"]
+
+        results = translate_all(urls, "Hello", "en", "ru")
+
+        assert results[0]["translated_text"] == "lingva.ml"
+        assert results[1]["translated_text"] == "mm"
+        assert results[2]["error"] == "unknown_api"
+        assert translate_all([], "Hello", "en", "ru") == []
@@ -0,0 +1,236 @@
+"""Тесты для асинхронного клиента API переводов."""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional
+import pytest
+from aiohttp import web
+from api_client.async_client import AsyncTranslationClient, translate_text_async
+from api_client.providers import TranslationProvider, register_provider, _PROVIDER_CLASSES
+
+
+async def _start_server(handler: Callable[[web.Request], Awaitable[web.Response]]) -> web.AppRunner:
+    """Поднимает локальный aiohttp сервер с одним обработчиком на все пути."""
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner
+
+
+def _base_url(runner: web.AppRunner) -> str:
+    """Возвращает базовый URL запущенного сервера."""
+    host, port = runner.addresses[0][:2]
+    return f"http://{host}:{port}"
+
+
+class EchoProvider(TranslationProvider):
+    """Тестовый провайдер без HTTP-описания: переводит в верхний регистр синхронно."""
+
+    name = "echo"
+    display_name = "Echo"
+    url_hints = ("echo.local",)
+
+    def translate(self, text: str, source_lang: str, target_lang: str, timeout: Any = None) -> Dict[str, Any]:
+        return {"translated_text": text.upper(), "source_language": source_lang, "confidence": 100, "api": "Echo"}
+
+
+class ShoutProvider(TranslationProvider):
+    """Тестовый HTTP-провайдер: GET {url}?text=...&to=..., ответ {"result": ...}."""
+
+    name = "shout"
+    display_name = "Shout"
+    url_hints = ("/shout",)
+
+    def build_request(self, text: str, source_lang: str, target_lang: str) -> Optional[Dict[str, Any]]:
+        return {"method": "GET", "url": self.api_url, "params": {"text": text, "to": target_lang}}
+
+    def parse_response(self, status: int, body: str, source_lang: str) -> Dict[str, Any]:
+        if status != 200:
+            return {"error": "api_error", "status": status, "api": "Shout"}
+        return {"translated_text": json.loads(body)["result"], "source_language": source_lang, "confidence": 100,
+                "api": "Shout"}
+
+
+class TestAsyncTranslationClient:
+    """Тесты для translate_text_async и AsyncTranslationClient."""
+
+    def test_mymemory_success(self) -> None:
+        """Тест успешного асинхронного перевода через MyMemory.
+
+        Что делаю:
+            Поднимаю локальный сервер в формате MyMemory и перевожу текст.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        async def handler(request: web.Request) -> web.Response:
+            assert request.query["langpair"] == "en|ru"
+            return web.json_response({"responseStatus": 200, "responseData": {"translatedText": "Привет"}})
+
+        async def scenario() -> Dict[str, Any]:
+            runner = await _start_server(handler)
+            try:
+                return await translate_text_async(f"{_base_url(runner)}/mymemory/get", "Hello", "en", "ru")
+            finally:
+                await runner.cleanup()
+
+        result = asyncio.run(scenario())
+
+        assert result == {"translated_text": "Привет", "source_language": "en", "confidence": 100, "api": "MyMemory"}
+
+    def test_lingva_http_error(self) -> None:
+        """Тест обработки HTTP-ошибки Lingva.
+
+        Что делаю:
+            Сервер отвечает 403, проверяю словарь ошибки.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        async def handler(request: web.Request) -> web.Response:
+            return web.Response(status=403, text="Forbidden")
+
+        async def scenario() -> Dict[str, Any]:
+            runner = await _start_server(handler)
+            try:
+                return await translate_text_async(f"{_base_url(runner)}/lingva/api/v1", "Hello", "en", "ru")
+            finally:
+                await runner.cleanup()
+
+        result = asyncio.run(scenario())
+
+        assert result["error"] == "api_error"
+        assert result["status"] == 403
+        assert result["body"] == "Forbidden"
+        assert result["api"] == "Lingva"
+
+    def test_concurrency_is_bounded_per_provider(self) -> None:
+        """Тест ограничения параллельности на провайдера.
+
+        Что делаю:
+            Запускаю 20 запросов при лимите 3 и считаю максимум одновременных.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        state = {"active": 0, "peak": 0}
+
+        async def handler(request: web.Request) -> web.Response:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.02)
+            state["active"] -= 1
+            return web.json_response({"translation": "Привет"})
+
+        async def scenario() -> list:
+            runner = await _start_server(handler)
+            try:
+                async with AsyncTranslationClient(max_concurrency=3) as client:
+                    url = f"{_base_url(runner)}/lingva/api/v1"
+                    return await asyncio.gather(*(client.translate(url, "Hello", "en", "ru") for _ in range(20)))
+            finally:
+                await runner.cleanup()
+
+        results = asyncio.run(scenario())
+
+        assert all(result["translated_text"] == "Привет" for result in results)
+        assert state["peak"] == 3
+
+    def test_cancellation_propagates(self) -> None:
+        """Тест отмены запроса.
+
+        Что делаю:
+            Отменяю задачу во время медленного ответа сервера.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        async def handler(request: web.Request) -> web.Response:
+            await asyncio.sleep(0.5)
+            return web.json_response({"translation": "Привет"})
+
+        async def scenario() -> None:
+            runner = await _start_server(handler)
+            try:
+                async with AsyncTranslationClient() as client:
+                    task = asyncio.create_task(client.translate(f"{_base_url(runner)}/lingva/api/v1", "Hello", "en", "ru"))
+                    await asyncio.sleep(0.05)
+                    task.cancel()
+                    await task
+            finally:
+                await runner.cleanup()
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(scenario())
+
+    def test_unknown_api(self) -> None:
+        """Тест обработки неизвестного API.
+
+        Что делаю:
+            Передаю URL, по которому нельзя определить тип API.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        result = asyncio.run(translate_text_async("https://unknown-api.com/translate", "Hello", "en", "ru"))
+
+        assert result["error"] == "unknown_api"
+
+    def test_registered_providers(self) -> None:
+        """Тест: провайдеры из реестра работают в асинхронном клиенте.
+
+        Что делаю:
+            Регистрирую HTTP-провайдер с build_request/parse_response (локальный
+            сервер) и провайдер только с синхронным translate() и перевожу обоими.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        async def handler(request: web.Request) -> web.Response:
+            if request.query["text"] == "bad json":
+                return web.Response(text="not json")
+            return web.json_response({"result": f"{request.query['text']}!{request.query['to']}"})
+
+        async def scenario() -> list:
+            runner = await _start_server(handler)
+            try:
+                async with AsyncTranslationClient() as client:
+                    url = f"{_base_url(runner)}/shout"
+                    return [await client.translate(url, "hello", "en", "ru"),
+                            await client.translate(url, "bad json", "en", "ru"),
+                            await client.translate("http://echo.local/translate", "hello", "en", "ru")]
+            finally:
+                await runner.cleanup()
+
+        register_provider(ShoutProvider)
+        register_provider(EchoProvider)
+        try:
+            shout, invalid, echo = asyncio.run(scenario())
+        finally:
+            _PROVIDER_CLASSES.pop("shout")
+            _PROVIDER_CLASSES.pop("echo")
+
+        assert shout == {"translated_text": "hello!ru", "source_language": "en", "confidence": 100, "api": "Shout"}
+        assert invalid["error"] == "invalid_json"
+        assert echo["translated_text"] == "HELLO"
@@ -0,0 +1,134 @@
+"""Тесты для пакетного сравнения переводов."""
+
+import numpy as np
+import pytest
+from analizer.batch import compare_translations_batch, to_columns, ERROR_NONE, ERROR_ONE, ERROR_BOTH
+from analizer.comparator import compare_translations, ngram_metrics
+
+
+def _pairs() -> list:
+    """Набор пар переводов, включая ошибки, пустые и одинаковые тексты."""
+    ok = lambda text, confidence, api: {"translated_text": text, "confidence": confidence, "api": api}
+    failed = lambda api: {"error": "api_error", "api": api}
+    return [
+        (ok("Привет, как дела?", 95, "Lingva"), ok("Привет, как ты?", 90, "MyMemory")),
+        (ok("Hello world", 100, "Lingva"), ok("hello world ", 100, "MyMemory")),
+        (ok("", 100, "Lingva"), ok("Текст", 80, "MyMemory")),
+        (failed("Lingva"), ok("Текст", 80, "MyMemory")),
+        (failed("Lingva"), failed("MyMemory")),
+        (ok("Привет, как дела?", 95, "Lingva"), ok("Привет, как ты?", 90, "MyMemory")),
+    ]
+
+
+class TestCompareTranslationsBatch:
+    """Тесты для compare_translations_batch."""
+
+    def test_matches_scalar_comparison(self) -> None:
+        """Тест совпадения с compare_translations по каждой паре.
+
+        Что делаю:
+            Сравниваю колонки пакетного результата с поэлементными вызовами.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        pairs = _pairs()
+        columns_a = to_columns([a for a, _ in pairs])
+        columns_b = to_columns([b for _, b in pairs])
+
+        result = compare_translations_batch(
+            columns_a["text"], columns_b["text"], columns_a["confidence"], columns_b["confidence"],
+            columns_a["error"], columns_b["error"],
+        )
+
+        for index, (translation_a, translation_b) in enumerate(pairs):
+            expected = compare_translations(translation_a, translation_b)
+            assert result["similarity"][index] == pytest.approx(expected["similarity"])
+            assert result["length_diff"][index] == expected["length_diff"]
+            assert result["word_count_diff"][index] == expected["word_count_diff"]
+            assert result["confidence_diff"][index] == expected["confidence_diff"]
+            assert bool(result["both_successful"][index]) is expected["both_successful"]
+
+        assert list(result["error_class"]) == [ERROR_NONE, ERROR_NONE, ERROR_NONE, ERROR_ONE, ERROR_BOTH, ERROR_NONE]
+
+    def test_accepts_numpy_arrays_and_defaults(self) -> None:
+        """Тест колонок NumPy и значений по умолчанию.
+
+        Что делаю:
+            Передаю массивы NumPy без уверенности и флагов ошибок.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        texts_a = np.array(["one two", "same"], dtype=object)
+        texts_b = np.array(["one", "same"], dtype=object)
+
+        result = compare_translations_batch(texts_a, texts_b)
+
+        assert result["similarity"].dtype == np.float64
+        assert list(result["word_count_diff"]) == [1, 0]
+        assert result["similarity"][1] == 1.0
+        assert result["both_successful"].all()
+
+    def test_score_cutoff_and_without_similarity(self) -> None:
+        """Тест порога схожести и отключения её расчёта.
+
+        Что делаю:
+            Считаю колонки с высоким порогом и с with_similarity=False.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        texts_a = ["kitten", "a"]
+        texts_b = ["sitting", "a" * 40]
+
+        assert list(compare_translations_batch(texts_a, texts_b, score_cutoff=0.9)["similarity"]) == [0.0, 0.0]
+        assert not compare_translations_batch(texts_a, texts_b, with_similarity=False)["similarity"].any()
+
+    def test_length_mismatch(self) -> None:
+        """Тест колонок разной длины.
+
+        Что делаю:
+            Передаю колонки разной длины.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        with pytest.raises(ValueError):
+            compare_translations_batch(["a"], ["a", "b"])
+
+    def test_ngram_columns(self) -> None:
+        """Тест колонок chrF и BLEU: совпадают с попарным сравнением, 0 для ошибок.
+
+        Что делаю:
+            Считаю пакет с with_ngrams=True, где у второй пары ошибка.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        texts_a = ["the cat sat", "broken", "good morning"]
+        texts_b = ["the cat sat down", "whatever", "good evening"]
+
+        columns = compare_translations_batch(texts_a, texts_b, error_b=[False, True, False], with_ngrams=True)
+
+        assert columns["chrf"][1] == 0.0 and columns["bleu"][1] == 0.0
+        for index in (0, 2):
+            expected = ngram_metrics(texts_a[index], texts_b[index])
+            assert columns["chrf"][index] == pytest.approx(expected["chrf"])
+            assert columns["bleu"][index] == pytest.approx(expected["bleu"])
+        assert "chrf" not in compare_translations_batch(texts_a, texts_b)
@@ -0,0 +1,160 @@
+"""Тесты для заменителя API и сверки бенчмарков с эталоном."""
+
+import pytest
+import requests
+from benchmarks.stub_server import StubTranslationServer
+from benchmarks.run_benchmarks import (
+    MACHINE_FIELDS, RUN_FIELDS, _percentile, bench_batch, bench_similarity, bench_translate_text,
+    compare_to_baseline, meta_mismatches,
+)
+from api_client.rapidapi_client import translate_many, translate_text
+
+
+@pytest.fixture(autouse=True)
+def _no_proxy(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Не даёт запросам к 127.0.0.1 идти через прокси."""
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+
+
+class TestStubServer:
+    """Тесты для локального заменителя MyMemory и Lingva."""
+
+    def test_both_formats_through_client(self) -> None:
+        """Тест: клиент распознаёт оба URL заменителя и разбирает ответы.
+
+        Что делаю:
+            Перевожу текст и пачку строк через MyMemory- и Lingva-URL.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        with StubTranslationServer() as server:
+            mymemory = translate_text(server.mymemory_url, "Hello world", "en", "ru")
+            lingva = translate_text(server.lingva_url, "Hello / world", "en", "de")
+            batch = translate_many(server.lingva_url, ["one", "two", "three"], "en", "ru")
+
+        assert mymemory["translated_text"] == "[ru] Hello world"
+        assert mymemory["api"] == "MyMemory"
+        assert lingva["translated_text"] == "[de] Hello / world"
+        assert lingva["api"] == "Lingva"
+        assert [result["translated_text"] for result in batch] == ["[ru] one", "[ru] two", "[ru] three"]
+
+    def test_error_rate_is_reproducible(self) -> None:
+        """Тест: доля ошибок соблюдается, а при одинаковом seed совпадает последовательность.
+
+        Что делаю:
+            Дважды отправляю 200 запросов напрямую при error_rate=0.25.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        runs = []
+        for _ in range(2):
+            with StubTranslationServer(error_rate=0.25, error_status=500, seed=7) as server:
+                with requests.Session() as session:
+                    statuses = [session.get(server.mymemory_url, params={"q": "x", "langpair": "en|ru"}).status_code
+                                for _ in range(200)]
+            runs.append(statuses)
+
+        assert runs[0] == runs[1]
+        assert set(runs[0]) == {200, 500}
+        assert 30 < runs[0].count(500) < 70
+
+
+class TestBenchmarks:
+    """Тесты для бенчмарков и сверки с эталоном."""
+
+    def test_percentile(self) -> None:
+        """Тест перцентиля по ближайшему рангу.
+
+        Что делаю:
+            Считаю перцентили списка 1..100.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        values = list(range(100, 0, -1))
+        assert _percentile(values, 50) == 50
+        assert _percentile(values, 95) == 95
+        assert _percentile(values, 100) == 100
+        assert _percentile([3.0], 99) == 3.0
+
+    def test_small_runs(self) -> None:
+        """Тест: бенчмарки клиента, схожести и пакетного сравнения выдают метрики всех видов.
+
+        Что делаю:
+            Прогоняю 20 запросов к заменителю, схожесть на двух длинах и 100 пар пакетом.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        with StubTranslationServer(latency=0.001) as server:
+            client = bench_translate_text(server.mymemory_url, requests=20, concurrency=4)
+        similarity = bench_similarity(lengths=(16, 64), budget=200, repeats=1)
+        batch = bench_batch(pairs=100, repeats=1)
+
+        assert client["success_rate"] == 1.0
+        assert client["throughput_per_sec"] > 0
+        assert client["p50_ms"] <= client["p95_ms"] <= client["p99_ms"]
+        assert set(similarity) == {"indel.len_16_us", "indel.len_64_us",
+                                   "sequence_matcher.len_16_us", "sequence_matcher.len_64_us"}
+        assert batch["pairs"] == 100 and batch["pairs_per_sec"] > 0
+
+    def test_regressions_respect_direction_and_tolerance(self) -> None:
+        """Тест: регрессией считается ухудшение сверх допуска в нужную сторону.
+
+        Что делаю:
+            Сравниваю результат с эталоном: пропускная способность упала на 50%,
+            задержка выросла на 10%, время схожести уменьшилось, счётчики изменились.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        baseline = {"results": {"client": {"throughput_per_sec": 100.0, "p95_ms": 10.0, "requests": 200},
+                                "similarity": {"indel.len_16_us": 8.0}}}
+        current = {"results": {"client": {"throughput_per_sec": 50.0, "p95_ms": 11.0, "requests": 100},
+                               "similarity": {"indel.len_16_us": 4.0, "indel.len_64_us": 30.0}}}
+
+        regressions = compare_to_baseline(current, baseline, tolerance=0.3)
+
+        assert [(item["benchmark"], item["metric"]) for item in regressions] == [("client", "throughput_per_sec")]
+        assert regressions[0]["change"] == pytest.approx(0.5)
+        assert len(compare_to_baseline(current, baseline, tolerance=0.05)) == 2
+
+    def test_meta_mismatches(self) -> None:
+        """Тест: расхождения окружения и параметров прогона с эталоном находятся по полям meta.
+
+        Что делаю:
+            Сравниваю meta прогона с эталоном, снятым на машине с другим числом ядер
+            и с другим зерном, и с эталоном без поля cpu_count.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        current = {"meta": {"python": "3.11.7", "machine": "x86_64", "cpu_count": 8, "quick": False, "seed": 0}}
+        baseline = {"meta": {"python": "3.11.7", "machine": "x86_64", "cpu_count": 2, "quick": False, "seed": 1}}
+
+        assert meta_mismatches(current, baseline, MACHINE_FIELDS) == ["cpu_count: 2 -> 8"]
+        assert meta_mismatches(current, baseline, RUN_FIELDS) == ["seed: 1 -> 0"]
+        assert meta_mismatches(current, {"meta": {"python": "3.11.7", "machine": "x86_64"}},
+                               MACHINE_FIELDS) == ["cpu_count: None -> 8"]
+        assert meta_mismatches(current, current, MACHINE_FIELDS + RUN_FIELDS) == []
@@ -0,0 +1,144 @@
+"""Тесты для кэша результатов перевода."""
+
+import pytest
+from conftest import FakeClock
+from api_client.cache import TranslationCache, make_cache_key
+
+
+class TestTranslationCache:
+    """Тесты для TranslationCache."""
+
+    def test_key_normalizes_text(self) -> None:
+        """Тест нормализации текста в ключе.
+
+        Что делаю:
+            Сравниваю ключи для текстов, отличающихся только пробелами,
+            и для текстов, отличающихся переводами строк.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        assert make_cache_key("lingva", "  Hello   world ", "EN", "ru") == make_cache_key("lingva", "Hello world", "en", "ru")
+        assert make_cache_key("lingva", "Hello", "en", "ru") != make_cache_key("mymemory", "Hello", "en", "ru")
+        assert make_cache_key("lingva", " a \r\n\n  b ", "en", "ru") == make_cache_key("lingva", "a\n\nb", "en", "ru")
+        assert make_cache_key("lingva", "a\n\nb", "en", "ru") != make_cache_key("lingva", "a b", "en", "ru")
+        assert make_cache_key("lingva", "a\nb", "en", "ru") != make_cache_key("lingva", "a\n\nb", "en", "ru")
+
+    def test_hit_and_miss_counters(self) -> None:
+        """Тест счётчиков попаданий и промахов.
+
+        Что делаю:
+            Делаю промах, сохраняю результат и делаю попадание.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        cache = TranslationCache(max_entries=10, ttl=60)
+        key = make_cache_key("lingva", "Hello", "en", "ru")
+
+        assert cache.get(key) is None
+        cache.put(key, {"translated_text": "Привет", "api": "Lingva"})
+        assert cache.get(key) == {"translated_text": "Привет", "api": "Lingva"}
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["size"] == 1
+
+    def test_lru_eviction(self) -> None:
+        """Тест вытеснения давно не использованных записей.
+
+        Что делаю:
+            Переполняю кэш на две записи и проверяю, что недавно прочитанная осталась.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        cache = TranslationCache(max_entries=2, ttl=60)
+        key_a, key_b, key_c = (make_cache_key("lingva", text, "en", "ru") for text in ("a", "b", "c"))
+
+        cache.put(key_a, {"translated_text": "a"})
+        cache.put(key_b, {"translated_text": "b"})
+        cache.get(key_a)
+        cache.put(key_c, {"translated_text": "c"})
+
+        assert cache.get(key_b) is None
+        assert cache.get(key_a) is not None
+        assert cache.get(key_c) is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiration(self) -> None:
+        """Тест истечения срока жизни записи.
+
+        Что делаю:
+            Сдвигаю часы за TTL и проверяю промах.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        cache = TranslationCache(max_entries=10, ttl=10, clock=clock)
+        key = make_cache_key("lingva", "Hello", "en", "ru")
+        cache.put(key, {"translated_text": "Привет"})
+
+        clock.now = 9.9
+        assert cache.get(key) is not None
+        clock.now = 10.0
+        assert cache.get(key) is None
+        assert cache.stats()["expirations"] == 1
+
+    @pytest.mark.parametrize("negative_ttl, cached", [(0, False), (5, True)])
+    def test_errors_cached_only_negatively(self, negative_ttl: float, cached: bool) -> None:
+        """Тест кэширования ошибок.
+
+        Что делаю:
+            Сохраняю ошибку request_failed с выключенным и включённым negative_ttl.
+
+        Вход:
+            negative_ttl: время жизни ошибок,
+            cached: ожидается ли ошибка в кэше.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        cache = TranslationCache(max_entries=10, ttl=3600, negative_ttl=negative_ttl, clock=clock)
+        key = make_cache_key("mymemory", "Hello", "en", "ru")
+        cache.put(key, {"error": "request_failed", "message": "timeout", "api": "MyMemory"})
+
+        assert (cache.get(key) is not None) is cached
+        clock.now = 6
+        assert cache.get(key) is None
+
+    def test_returned_result_is_a_copy(self) -> None:
+        """Тест изоляции закэшированного результата от изменений вызывающим кодом.
+
+        Что делаю:
+            Изменяю полученный словарь и читаю запись повторно.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        cache = TranslationCache(max_entries=10, ttl=60)
+        key = make_cache_key("lingva", "Hello", "en", "ru")
+        cache.put(key, {"translated_text": "Привет"})
+
+        cache.get(key)["translated_text"] = "испорчено"
+
+        assert cache.get(key)["translated_text"] == "Привет"
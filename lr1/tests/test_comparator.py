@@ -1,7 +1,13 @@
 """Тесты для модуля сравнения переводов."""
 
+from dataclasses import replace
 import pytest
+from unittest.mock import patch
+from config import CONFIG
 from src.analizer.comparator import compare_translations, get_translation_quality_score
+import analizer.comparator as comparator
+from analizer.comparator import compare_translations_multi, ngram_metrics, ngram_metrics_batch
+from analizer.normalized import NormalizedText
 
 
 class TestTranslationComparator:
@@ -207,3 +213,176 @@ class TestTranslationComparator:
         assert result["has_error"] is False
         assert result["overall_score"] == 0  # Пустой текст должен давать 0
         assert result["word_count"] == 0
+
+
+class TestMultiComparison:
+    """Тесты для сравнения переводов нескольких API."""
+
+    def test_similarity_matrix_and_consensus(self) -> None:
+        """Тест матрицы схожести и консенсуса для трёх API.
+
+        Что делаю:
+            Сравниваю два одинаковых перевода и один отличающийся.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        translations = [
+            {"translated_text": "Привет, как дела?", "confidence": 100, "api": "Lingva"},
+            {"translated_text": "Здравствуйте", "confidence": 100, "api": "MyMemory"},
+            {"translated_text": "привет, как дела? ", "confidence": 100, "api": "Mirror"},
+        ]
+
+        result = compare_translations_multi(translations)
+        matrix = result["similarity_matrix"]
+
+        assert result["successful_count"] == 3
+        assert [matrix[i][i] for i in range(3)] == [1.0, 1.0, 1.0]
+        assert matrix[0][2] == matrix[2][0] == 1.0
+        assert matrix[0][1] == matrix[1][0] < 0.5
+        assert result["consensus_index"] in (0, 2)
+        assert result["mean_similarity"][1] < result["mean_similarity"][0]
+        assert "error_message" not in result
+
+    def test_errors_are_excluded(self) -> None:
+        """Тест исключения ошибок из матрицы и консенсуса.
+
+        Что делаю:
+            Сравниваю один успешный перевод и две ошибки.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        translations = [
+            {"error": "api_error", "api": "Lingva"},
+            {"translated_text": "Привет", "confidence": 100, "api": "MyMemory"},
+            {"error": "request_failed", "api": "Mirror"},
+        ]
+
+        result = compare_translations_multi(translations)
+
+        assert result["successful"] == [False, True, False]
+        assert result["similarity_matrix"][0] == [0.0, 0.0, 0.0]
+        assert result["consensus_api"] == "MyMemory"
+        assert result["error_message"] == "Меньше двух API вернули перевод"
+
+    def test_each_text_normalized_once(self) -> None:
+        """Тест: текст разбирается один раз на перевод, а не на пару.
+
+        Что делаю:
+            Считаю созданные NormalizedText при сравнении пяти переводов.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        translations = [{"translated_text": f"текст {index}", "api": str(index)} for index in range(5)]
+
+        with patch("analizer.normalized.NormalizedText", side_effect=NormalizedText) as mock_normalized:
+            compare_translations_multi(translations)
+
+        assert mock_normalized.call_count == 5
+
+
+class TestNgramMetrics:
+    """Тесты для chrF и BLEU."""
+
+    def test_known_values(self) -> None:
+        """Тест значений chrF и BLEU, посчитанных вручную.
+
+        Что делаю:
+            Сравниваю «abc» и «abd» (chrF = 7/18) и «a b c d» и «a b c e»
+            (BLEU = (3/4 * 3/4 * 2/3 * 1/2) ** (1/4)).
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        assert ngram_metrics("abc", "abd")["chrf"] == pytest.approx(7 / 18)
+        assert ngram_metrics("a b c d", "a b c e")["bleu"] == pytest.approx((3 / 4 * 3 / 4 * 2 / 3 * 1 / 2) ** 0.25)
+        assert ngram_metrics("Same Text", "  same text") == {"chrf": 1.0, "bleu": 1.0}
+        assert ngram_metrics("", "text") == {"chrf": 0.0, "bleu": 0.0}
+
+    def test_symmetric_and_in_comparison(self) -> None:
+        """Тест: метрики симметричны и попадают в результат compare_translations, только если включены.
+
+        Что делаю:
+            Сравниваю переводы разной длины в обе стороны с NGRAM_METRICS=1
+            и без него.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        short = {"translated_text": "the cat sat", "confidence": 90, "api": "Lingva"}
+        long = {"translated_text": "the cat sat on the mat today", "confidence": 80, "api": "MyMemory"}
+
+        with patch("analizer.comparator.CONFIG", replace(CONFIG, ngram_metrics=True)):
+            forward = comparator.compare_translations(short, long)
+            backward = comparator.compare_translations(long, short)
+
+        assert "chrf" not in comparator.compare_translations(short, long)
+        assert forward["chrf"] == pytest.approx(backward["chrf"])
+        assert forward["bleu"] == pytest.approx(backward["bleu"])
+        assert 0 < forward["bleu"] < forward["chrf"] < 1
+
+    def test_profile_built_once_per_text(self) -> None:
+        """Тест: профиль n-грамм сохраняется в NormalizedText и не строится заново.
+
+        Что делаю:
+            Сравниваю один разобранный перевод с двумя другими и считаю построения профиля.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        shared = NormalizedText("the cat sat on the mat")
+
+        with patch("analizer.comparator.NgramProfile", wraps=comparator.NgramProfile) as mock_profile:
+            first = ngram_metrics(shared, "the cat sat")
+            second = ngram_metrics(shared, "a dog sat on the mat")
+
+        assert mock_profile.call_count == 3
+        assert first == ngram_metrics("the cat sat on the mat", "the cat sat")
+        assert 0 < second["chrf"] < 1
+
+    def test_batch_matches_pairs(self) -> None:
+        """Тест: пакетный режим совпадает с попарным и считает повторы один раз.
+
+        Что делаю:
+            Считаю метрики для пар с повторами и пустым текстом.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        texts_a = ["Hello world", "good morning", "Hello world", "", "x y z"]
+        texts_b = ["hello there world", "good evening", "hello there world", "text", "x y z"]
+
+        batch = ngram_metrics_batch(texts_a, texts_b)
+
+        for index, (text_a, text_b) in enumerate(zip(texts_a, texts_b)):
+            expected = ngram_metrics(text_a, text_b)
+            assert batch["chrf"][index] == pytest.approx(expected["chrf"])
+            assert batch["bleu"][index] == pytest.approx(expected["bleu"])
+        with patch("analizer.comparator.chrf_score", return_value=0.5) as mock_chrf:
+            ngram_metrics_batch(texts_a, texts_b)
+        assert mock_chrf.call_count == 4
+        with pytest.raises(ValueError):
+            ngram_metrics_batch(["a"], [])
@@ -0,0 +1,289 @@
+"""Тесты для раздельных таймаутов и срока выполнения запросов."""
+
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Dict, List
+import pytest
+import requests
+from unittest.mock import patch, Mock
+from conftest import FakeClock
+from config import CONFIG
+from api_client.deadline import Deadline, deadline_after, request_timeout
+from api_client.hedging import MirrorGroup
+from api_client.providers import configure_endpoint
+from api_client.rapidapi_client import (
+    translate_text, translate_many, get_breaker_stats, get_cache_stats, get_rate_limit_stats, _RETRY_POLICY,
+)
+
+MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+OK = {"translated_text": "Привет", "source_language": "en", "confidence": 100, "api": "MyMemory"}
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Отключает паузу ведра токенов после ответа о перегрузке."""
+    monkeypatch.setattr("api_client.rapidapi_client.CONFIG", replace(CONFIG, rate_limit_backoff=0))
+
+
+class TestDeadline:
+    """Тесты для объекта срока."""
+
+    def test_remaining_and_timeout_shrink(self) -> None:
+        """Тест: таймауты запроса обрезаются по оставшемуся времени.
+
+        Что делаю:
+            Создаю срок на 5 секунд и сдвигаю часы.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        deadline = Deadline(5, clock=clock)
+
+        assert deadline.timeout(3, 10) == (3, 5)
+        clock.now = 4.0
+        assert deadline.remaining() == 1.0
+        assert deadline.timeout(3, 10) == (1.0, 1.0)
+        assert not deadline.expired()
+        clock.now = 6.0
+        assert deadline.expired()
+        assert deadline.remaining() == 0.0
+
+    def test_no_deadline(self) -> None:
+        """Тест: без срока используются таймауты как есть.
+
+        Что делаю:
+            Проверяю deadline_after(0) и request_timeout без срока.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        assert deadline_after(0) is None
+        assert request_timeout(None, 3.05, 10) == (3.05, 10)
+
+
+class TestClientDeadline:
+    """Тесты для срока в translate_text и translate_many."""
+
+    @patch('api_client.rapidapi_client.get_session')
+    def test_split_timeouts_from_config(self, mock_get_session: Mock) -> None:
+        """Тест: в requests передаются раздельные таймауты соединения и чтения.
+
+        Что делаю:
+            Перевожу текст без срока и смотрю аргумент timeout.
+
+        Вход:
+            mock_get_session: мок для get_session.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {"responseStatus": 200, "responseData": {"translatedText": "Привет"}}
+        mock_get_session.return_value.get.return_value = response
+
+        translate_text(MYMEMORY_URL, "Hello", "en", "ru")
+
+        assert mock_get_session.return_value.get.call_args.kwargs["timeout"] == (CONFIG.connect_timeout,
+                                                                                 CONFIG.read_timeout)
+
+    @patch('api_client.rapidapi_client.get_session')
+    def test_deadline_shrinks_request_timeout(self, mock_get_session: Mock) -> None:
+        """Тест: оставшийся срок сокращает таймаут запроса.
+
+        Что делаю:
+            Перевожу текст со сроком 0.5 секунды.
+
+        Вход:
+            mock_get_session: мок для get_session.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {"responseStatus": 200, "responseData": {"translatedText": "Привет"}}
+        mock_get_session.return_value.get.return_value = response
+
+        translate_text(MYMEMORY_URL, "Hello", "en", "ru", Deadline(0.5))
+
+        connect_timeout, read_timeout = mock_get_session.return_value.get.call_args.kwargs["timeout"]
+        assert 0 < connect_timeout <= 0.5
+        assert 0 < read_timeout <= 0.5
+
+    def test_expired_deadline_skips_request(self) -> None:
+        """Тест: после срока запрос не отправляется, и ошибка не кэшируется.
+
+        Что делаю:
+            Перевожу текст с уже истёкшим сроком.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        with patch("api_client.rapidapi_client._translate_mymemory") as mock_translate:
+            result = translate_text(MYMEMORY_URL, "Hello", "en", "ru", Deadline(0))
+
+        assert result["error"] == "deadline_exceeded"
+        mock_translate.assert_not_called()
+        assert get_cache_stats()["size"] == 0
+
+    def test_rate_limit_wait_stops_at_deadline(self) -> None:
+        """Тест: ожидание токена не выходит за срок, а просроченные вызовы не тратят токены.
+
+        Что делаю:
+            Отправляю 8 разных текстов из 8 потоков в MyMemory с лимитом
+            2 запроса в секунду без запаса и сроком 0.7 секунды: успеть могут
+            только запросы с токенами на 0 и 0.5 секунде.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        configure_endpoint(MYMEMORY_URL, "mymemory", max_requests_per_second=2, burst=1)
+        results: List[Dict[str, Any]] = []
+        durations: List[float] = []
+        lock = threading.Lock()
+
+        def call(index: int) -> None:
+            started = time.monotonic()
+            result = translate_text(MYMEMORY_URL, f"Hello {index}", "en", "ru", Deadline(0.7))
+            with lock:
+                results.append(result)
+                durations.append(time.monotonic() - started)
+
+        with patch("api_client.rapidapi_client._translate_mymemory", return_value=OK) as mock_translate:
+            threads = [threading.Thread(target=call, args=(index,)) for index in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        stats = get_rate_limit_stats()["mymemory"]
+
+        assert max(durations) < 0.95
+        assert mock_translate.call_count == 2
+        assert sum(1 for result in results if result.get("error") == "deadline_exceeded") == 6
+        assert stats["requests"] == 2
+        assert stats["in_flight"] == 0
+        assert stats["tokens"] > -1
+
+    def test_retries_stop_at_deadline(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Тест: повтор, который не успевает до срока, не начинается.
+
+        Что делаю:
+            Провайдер отвечает 503, задержка повтора заведомо больше срока.
+
+        Вход:
+            monkeypatch: фикстура pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        monkeypatch.setattr(_RETRY_POLICY, "retries", 5)
+        monkeypatch.setattr(_RETRY_POLICY, "delay", lambda attempt: 10)
+        error = {"error": "api_error", "status": 503, "api": "MyMemory"}
+
+        with patch("api_client.rapidapi_client._translate_mymemory", return_value=error) as mock_translate:
+            started = time.monotonic()
+            result = translate_text(MYMEMORY_URL, "Hello", "en", "ru", Deadline(1))
+
+        assert time.monotonic() - started < 0.5
+        assert result["status"] == 503
+        assert mock_translate.call_count == 1
+
+    def test_timeout_at_deadline_does_not_trip_breaker(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Тест: таймаут, сокращённый сроком, не считается сбоем сервера.
+
+        Что делаю:
+            Адаптер ждёт до конца срока и бросает ReadTimeout.
+
+        Вход:
+            monkeypatch: фикстура pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        monkeypatch.setattr(_RETRY_POLICY, "retries", 0)
+
+        def slow(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+            time.sleep(0.1)
+            raise requests.exceptions.ReadTimeout("read timed out")
+
+        with patch("api_client.rapidapi_client._translate_mymemory", side_effect=slow):
+            result = translate_text(MYMEMORY_URL, "Hello", "en", "ru", Deadline(0.05))
+
+        assert result["error"] == "deadline_exceeded"
+        assert get_breaker_stats()[MYMEMORY_URL]["consecutive_failures"] == 0
+
+    def test_batch_abandons_chunks_after_deadline(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Тест: чанки пачки, не начатые до срока, не отправляются.
+
+        Что делаю:
+            Перевожу 3 длинных сегмента (по чанку на каждый) одним потоком,
+            каждый запрос занимает 0.2 секунды при сроке 0.3.
+
+        Вход:
+            monkeypatch: фикстура pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        calls: List[str] = []
+
+        def slow(api_url: str, headers: Dict[str, str], text: str, *args: Any) -> Dict[str, Any]:
+            calls.append(text)
+            time.sleep(0.2)
+            return dict(OK, translated_text=text.upper())
+
+        texts = [letter * 400 for letter in "abc"]
+        with patch("api_client.rapidapi_client._translate_mymemory", side_effect=slow):
+            results = translate_many(MYMEMORY_URL, texts, "en", "ru", max_workers=1, deadline=Deadline(0.3))
+
+        assert results[0]["translated_text"] == "A" * 400
+        assert results[2]["error"] == "deadline_exceeded"
+        assert len(calls) == 2
+        assert get_cache_stats()["size"] <= 2
+
+
+class TestMirrorDeadline:
+    """Тесты для срока в гонке зеркал."""
+
+    def test_race_stops_waiting_at_deadline(self) -> None:
+        """Тест: гонка зеркал не ждёт ответа дольше срока.
+
+        Что делаю:
+            Оба зеркала зависают, срок 0.1 секунды.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        release = threading.Event()
+
+        def hang(url: str, text: str, source_lang: str, target_lang: str, deadline: Any) -> Dict[str, Any]:
+            release.wait(2)
+            return dict(OK)
+
+        group = MirrorGroup(["a", "b"], hang, initial_delay=0.02)
+        started = time.monotonic()
+        result = group.translate("Hello", "en", "ru", Deadline(0.1))
+        elapsed = time.monotonic() - started
+        release.set()
+        group.close()
+
+        assert result["error"] == "deadline_exceeded"
+        assert elapsed < 0.5
@@ -0,0 +1,128 @@
+"""Тесты для дискового кэша переводов."""
+
+from pathlib import Path
+from conftest import FakeClock
+from api_client.cache import make_cache_key
+from api_client.disk_cache import DiskTranslationCache
+
+
+def _key(text: str) -> bytes:
+    """Ключ кэша Lingva en->ru для текста."""
+    return make_cache_key("lingva", text, "en", "ru")
+
+
+class TestDiskTranslationCache:
+    """Тесты для DiskTranslationCache."""
+
+    def test_shared_between_instances(self, tmp_path: Path) -> None:
+        """Тест: запись одного экземпляра видна другому (как другому процессу).
+
+        Что делаю:
+            Открываю один файл двумя экземплярами, пишу через первый, читаю через второй.
+
+        Вход:
+            tmp_path: временная папка pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        path = str(tmp_path / "cache" / "translations.sqlite")
+        writer = DiskTranslationCache(path)
+        reader = DiskTranslationCache(path)
+
+        writer.put(_key("Hello"), {"translated_text": "Привет", "api": "Lingva"})
+
+        assert reader.get(_key("Hello")) == {"translated_text": "Привет", "api": "Lingva"}
+        assert reader.get(_key("Bye")) is None
+        assert reader.stats()["hits"] == 1
+        assert reader.stats()["misses"] == 1
+
+    def test_errors_are_not_stored(self, tmp_path: Path) -> None:
+        """Тест: ошибки не пишутся на диск.
+
+        Что делаю:
+            Сохраняю ошибку request_failed и проверяю промах.
+
+        Вход:
+            tmp_path: временная папка pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        cache = DiskTranslationCache(str(tmp_path / "c.sqlite"))
+        cache.put(_key("Hello"), {"error": "request_failed", "api": "Lingva"})
+
+        assert cache.get(_key("Hello")) is None
+        assert cache.stats()["size"] == 0
+
+    def test_ttl_expiration(self, tmp_path: Path) -> None:
+        """Тест истечения срока жизни записи.
+
+        Что делаю:
+            Сдвигаю часы за TTL и проверяю промах.
+
+        Вход:
+            tmp_path: временная папка pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock(1000.0)
+        cache = DiskTranslationCache(str(tmp_path / "c.sqlite"), ttl=60, clock=clock)
+        cache.put(_key("Hello"), {"translated_text": "Привет"})
+
+        clock.now += 61
+
+        assert cache.get(_key("Hello")) is None
+        assert cache.trim() == 1
+
+    def test_size_bounded_eviction(self, tmp_path: Path) -> None:
+        """Тест вытеснения давно использованных записей сверх лимита.
+
+        Что делаю:
+            Записываю больше max_entries записей, читаю самую старую и подрезаю базу.
+
+        Вход:
+            tmp_path: временная папка pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock(1000.0)
+        cache = DiskTranslationCache(str(tmp_path / "c.sqlite"), max_entries=3, clock=clock)
+        for index in range(3):
+            clock.now += 1
+            cache.put(_key(str(index)), {"translated_text": str(index)})
+        clock.now += 1
+        cache.get(_key("0"))
+        clock.now += 1
+        cache.put(_key("3"), {"translated_text": "3"})
+        cache.trim()
+
+        assert cache.stats()["size"] == 3
+        assert cache.get(_key("1")) is None
+        assert cache.get(_key("0")) is not None
+
+    def test_warm_up_returns_most_recent_first(self, tmp_path: Path) -> None:
+        """Тест выборки записей для прогрева.
+
+        Что делаю:
+            Записываю три перевода и беру два самых свежих.
+
+        Вход:
+            tmp_path: временная папка pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock(1000.0)
+        cache = DiskTranslationCache(str(tmp_path / "c.sqlite"), ttl=100, clock=clock)
+        for text in ("a", "b", "c"):
+            clock.now += 1
+            cache.put(_key(text), {"translated_text": text})
+
+        entries = cache.warm_up(2)
+
+        assert [result["translated_text"] for _, result, _ in entries] == ["c", "b"]
+        assert entries[0][0] == _key("c")
+        assert entries[0][2] == 100
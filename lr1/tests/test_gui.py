@@ -0,0 +1,135 @@
+"""Тесты для GUI: фоновый опрос API и форматирование результатов в главном окне."""
+
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Set, Tuple
+import pytest
+
+# Окно создаётся без дисплея
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+from PySide6 import QtCore  # noqa: E402
+from gui.main_window import MainWindow  # noqa: E402
+from gui.workers import TranslationFanOut  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app() -> Iterator["QtWidgets.QApplication"]:
+    """Возвращает единственный на процесс QApplication."""
+    yield QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def _run_fan_out(fan_out: TranslationFanOut, api_urls: List[str]) -> Tuple[List[Tuple[int, Any]], Any]:
+    """Запускает fan_out и крутит цикл событий, пока не придёт all_finished (не дольше 5 секунд)."""
+    loop = QtCore.QEventLoop()
+    ready: List[Tuple[int, Any]] = []
+    finished: List[Any] = []
+    fan_out.result_ready.connect(lambda index, result: ready.append((index, result)))
+    fan_out.all_finished.connect(finished.append)
+    fan_out.all_finished.connect(loop.quit)
+    QtCore.QTimer.singleShot(5000, loop.quit)
+
+    fan_out.start(api_urls, "Hello", "en", "ru")
+    if not finished:
+        loop.exec()
+
+    assert finished, "all_finished не пришёл за 5 секунд"
+    return ready, finished[0]
+
+
+class TestTranslationFanOut:
+    """Тесты для параллельного опроса API в пуле потоков."""
+
+    def test_every_result_arrives_and_errors_are_reported(self, app: "QtWidgets.QApplication",
+                                                          monkeypatch: pytest.MonkeyPatch) -> None:
+        """Тест: каждый API отвечает ровно один раз, исключение превращается в ошибку.
+
+        Что делаю:
+            Подменяю translate_text: четыре URL отвечают переводом, один возвращает
+            ошибку API, один бросает исключение. Все шесть ждут друг друга на барьере,
+            так что запросы обязаны выполняться в пуле одновременно.
+
+        Вход:
+            app: экземпляр QApplication,
+            monkeypatch: фикстура pytest для подмены translate_text.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        api_urls = [f"https://api{index}.local/translate" for index in range(6)]
+        barrier = threading.Barrier(len(api_urls), timeout=5)
+        threads: Set[int] = set()
+
+        def fake_translate(api_url: str, text: str, source_lang: str, target_lang: str,
+                           deadline: Any = None) -> Dict[str, Any]:
+            threads.add(threading.get_ident())
+            barrier.wait()
+            if api_url == api_urls[4]:
+                return {"error": "api_error", "status": 503, "api": "api4"}
+            if api_url == api_urls[5]:
+                raise RuntimeError("boom")
+            return {"translated_text": f"{text} -> {api_url}", "api": api_url}
+
+        monkeypatch.setattr("gui.workers.translate_text", fake_translate)
+        fan_out = TranslationFanOut(pool=QtCore.QThreadPool())
+
+        ready, results = _run_fan_out(fan_out, api_urls)
+
+        assert sorted(index for index, _ in ready) == list(range(6))
+        assert [result for _, result in sorted(ready, key=lambda item: item[0])] == results
+        assert [result["translated_text"] for result in results[:4]] == [f"Hello -> {url}" for url in api_urls[:4]]
+        assert results[4] == {"error": "api_error", "status": 503, "api": "api4"}
+        assert results[5] == {"error": "unexpected_error", "message": "boom", "api": "Unknown"}
+        assert len(threads) == len(api_urls)
+        assert not fan_out.is_running()
+
+    def test_empty_url_list_finishes_immediately(self, app: "QtWidgets.QApplication") -> None:
+        """Тест: без настроенных API all_finished приходит сразу с пустым списком.
+
+        Что делаю:
+            Запускаю опрос с пустым списком URL.
+
+        Вход:
+            app: экземпляр QApplication.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        ready, results = _run_fan_out(TranslationFanOut(), [])
+
+        assert ready == []
+        assert results == []
+
+
+class TestMainWindowFormatting:
+    """Тесты для HTML, который главное окно показывает в блоке сравнения."""
+
+    def test_multi_comparison_escapes_provider_text(self, app: "QtWidgets.QApplication") -> None:
+        """Тест: текст перевода и имена API экранируются перед вставкой в HTML.
+
+        Что делаю:
+            Форматирую сравнение, где консенсусный перевод и имя API содержат разметку.
+
+        Вход:
+            app: экземпляр QApplication.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        window = MainWindow()
+        comparison = {
+            "api_names": ["<i>Lingva</i>", "MyMemory"],
+            "similarity_matrix": [[1.0, 0.5], [0.5, 1.0]],
+            "successful": [True, True],
+            "successful_count": 2,
+            "consensus_index": 0,
+            "consensus_text": '<img src="x"> & <b>привет</b>',
+        }
+
+        html = window._format_multi_comparison(comparison)
+
+        assert "&lt;img src=&quot;x&quot;&gt; &amp; &lt;b&gt;привет&lt;/b&gt;" in html
+        assert "1. &lt;i&gt;Lingva&lt;/i&gt;" in html
+        assert "<img" not in html and "<i>" not in html
+        window.deleteLater()
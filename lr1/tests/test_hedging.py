@@ -0,0 +1,379 @@
+"""Тесты для гонки зеркал с хедж-запросами."""
+
+import threading
+import time
+from typing import Any, Dict, List
+import pytest
+from unittest.mock import patch
+from api_client.hedging import LatencyTracker, MirrorGroup, is_mirror_failure, mark_request_started
+from api_client.rapidapi_client import translate_text, translate_many, configure_mirrors, get_mirror_stats
+
+
+def _fake_mirrors(delays: Dict[str, float], errors: Dict[str, Dict[str, Any]] = None) -> Any:
+    """Строит функцию перевода, которая отвечает с заданной задержкой для каждого зеркала."""
+    errors = errors or {}
+    calls: List[str] = []
+
+    def translate(url: str, text: str, source_lang: str, target_lang: str, deadline: Any = None) -> Dict[str, Any]:
+        calls.append(url)
+        time.sleep(delays.get(url, 0))
+        if url in errors:
+            return dict(errors[url])
+        return {"translated_text": f"{text}@{url}", "source_language": source_lang, "confidence": 100, "api": "Lingva"}
+
+    translate.calls = calls
+    return translate
+
+
+class TestLatencyTracker:
+    """Тесты для статистики задержек зеркала."""
+
+    def test_quantile_and_ewma(self) -> None:
+        """Тест квантиля окна и EWMA со штрафом за ошибку.
+
+        Что делаю:
+            Записываю 100 задержек и одну ошибку.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        tracker = LatencyTracker(window=100, alpha=0.5)
+        assert tracker.quantile(0.95) is None
+
+        for millis in range(1, 101):
+            tracker.record(millis / 1000, ok=True)
+        assert tracker.quantile(0.95) == pytest.approx(0.096)
+        assert tracker.sample_count == 100
+
+        before = tracker.ewma
+        tracker.record(10.0, ok=False)
+        assert tracker.ewma > before
+        assert tracker.failures == 1 and tracker.sample_count == 100
+
+    def test_mirror_failure_classification(self) -> None:
+        """Тест разделения сбоев зеркала и ошибок самого запроса.
+
+        Что делаю:
+            Проверяю сетевую ошибку, 5xx, 403, 429, исчерпанную квоту, 400 и успешный ответ.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        assert is_mirror_failure({"error": "request_failed"})
+        assert is_mirror_failure({"error": "api_error", "status": 502})
+        assert is_mirror_failure({"error": "api_error", "status": 403})
+        assert is_mirror_failure({"error": "api_error", "status": 429})
+        assert not is_mirror_failure({"error": "quota_exceeded", "status": 429})
+        assert not is_mirror_failure({"error": "api_error", "status": 400})
+        assert not is_mirror_failure({"error": "empty_text"})
+        assert not is_mirror_failure({"translated_text": "ok"})
+
+
+class TestMirrorGroup:
+    """Тесты для гонки зеркал."""
+
+    def test_hedge_wins_over_slow_primary(self) -> None:
+        """Тест: медленное первое зеркало не задерживает ответ дольше задержки хеджа.
+
+        Что делаю:
+            Первое зеркало отвечает за 1 с, второе - сразу; задержка хеджа 50 мс.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        translate = _fake_mirrors({"slow": 1.0, "fast": 0.0})
+        group = MirrorGroup(["slow", "fast"], translate, initial_delay=0.05)
+
+        started = time.monotonic()
+        result = group.translate("Hello", "en", "ru")
+        elapsed = time.monotonic() - started
+        group.close()
+
+        assert result["translated_text"] == "Hello@fast"
+        assert elapsed < 0.5
+        assert group.stats()["hedges_sent"] == 1
+        assert group.stats()["hedge_wins"] == 1
+
+    def test_no_hedge_when_primary_is_fast(self) -> None:
+        """Тест: быстрый ответ первого зеркала не порождает лишних запросов.
+
+        Что делаю:
+            Первое зеркало отвечает сразу, задержка хеджа 0.5 с.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        translate = _fake_mirrors({})
+        group = MirrorGroup(["a", "b", "c"], translate, initial_delay=0.5)
+
+        assert group.translate("Hi", "en", "ru")["translated_text"] == "Hi@a"
+        group.close()
+        assert translate.calls == ["a"]
+        assert group.stats()["hedges_sent"] == 0
+
+    def test_concurrent_callers_do_not_queue(self) -> None:
+        """Тест: одновременные вызовы не ждут друг друга в пуле и не порождают хеджей.
+
+        Что делаю:
+            Запускаю 8 одновременных переводов через группу из двух зеркал,
+            каждое отвечает за 0.2 с, задержка хеджа 0.3 с.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        group = MirrorGroup(["a", "b"], _fake_mirrors({"a": 0.2, "b": 0.2}), initial_delay=0.3)
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=group.translate, args=(f"Hi {index}", "en", "ru")) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        group.close()
+
+        assert elapsed < 0.5
+        assert group.stats()["hedges_sent"] == 0
+
+    def test_hedge_timer_starts_with_request(self) -> None:
+        """Тест: ожидание свободного потока пула не считается задержкой зеркала.
+
+        Что делаю:
+            Ограничиваю пул одним вызовом на зеркало и запускаю 4 одновременных
+            перевода по 0.2 с с задержкой хеджа 0.3 с: половина ждёт в очереди
+            0.2 с, но сам запрос укладывается в задержку.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        group = MirrorGroup(["a", "b"], _fake_mirrors({"a": 0.2, "b": 0.2}), initial_delay=0.3, max_concurrency=1)
+
+        threads = [threading.Thread(target=group.translate, args=(f"Hi {index}", "en", "ru")) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        group.close()
+
+        assert group.stats()["hedges_sent"] == 0
+
+    def test_limiter_wait_is_not_mirror_latency(self) -> None:
+        """Тест: ожидание слота ограничителя не запускает хедж и не входит в задержку зеркала.
+
+        Что делаю:
+            Функция перевода 0.3 с ждёт «слот», затем отмечает начало запроса
+            через mark_request_started и отвечает за 0.05 с; задержка хеджа 0.2 с.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        calls: List[str] = []
+
+        def translate(url: str, text: str, source_lang: str, target_lang: str, deadline: Any = None) -> Dict[str, Any]:
+            calls.append(url)
+            time.sleep(0.3)
+            mark_request_started()
+            time.sleep(0.05)
+            return {"translated_text": f"{text}@{url}", "api": "Lingva"}
+
+        group = MirrorGroup(["a", "b"], translate, initial_delay=0.2, signals_start=True)
+
+        assert group.translate("Hi", "en", "ru")["translated_text"] == "Hi@a"
+        group.close()
+        assert calls == ["a"]
+        assert group.stats()["hedges_sent"] == 0
+        assert group.stats()["mirrors"]["a"]["ewma"] < 0.2
+
+    def test_failover_on_mirror_error(self) -> None:
+        """Тест перехода к следующему зеркалу при сбое.
+
+        Что делаю:
+            Первое зеркало отвечает 403, второе - 503, третье - успешно.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        errors = {"a": {"error": "api_error", "status": 403, "api": "Lingva"},
+                  "b": {"error": "api_error", "status": 503, "api": "Lingva"}}
+        translate = _fake_mirrors({}, errors)
+        group = MirrorGroup(["a", "b", "c"], translate, initial_delay=5.0, max_hedges=0)
+
+        assert group.translate("Hi", "en", "ru")["translated_text"] == "Hi@c"
+        group.close()
+        assert translate.calls == ["a", "b", "c"]
+
+    def test_request_error_is_not_retried(self) -> None:
+        """Тест: ошибка запроса (400) возвращается без обращения к другим зеркалам.
+
+        Что делаю:
+            Первое зеркало отвечает 400.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        translate = _fake_mirrors({}, {"a": {"error": "api_error", "status": 400, "api": "Lingva"}})
+        group = MirrorGroup(["a", "b"], translate, initial_delay=5.0)
+
+        assert group.translate("Hi", "en", "ru")["status"] == 400
+        group.close()
+        assert translate.calls == ["a"]
+
+    def test_all_mirrors_fail(self) -> None:
+        """Тест: при сбое всех зеркал возвращается последняя ошибка.
+
+        Что делаю:
+            Оба зеркала отвечают 502.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        error = {"error": "api_error", "status": 502, "api": "Lingva"}
+        group = MirrorGroup(["a", "b"], _fake_mirrors({}, {"a": error, "b": error}), initial_delay=5.0)
+
+        assert group.translate("Hi", "en", "ru")["status"] == 502
+        group.close()
+
+    def test_ranking_follows_observed_latency(self) -> None:
+        """Тест пересчёта рейтинга зеркал по наблюдаемым задержкам.
+
+        Что делаю:
+            Гоняю запросы, пока хедж к быстрому зеркалу не сделает его первым.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        translate = _fake_mirrors({"slow": 0.3, "fast": 0.01})
+        group = MirrorGroup(["slow", "fast"], translate, initial_delay=0.02, min_samples=1)
+
+        assert group.ranked_urls() == ["slow", "fast"]
+        group.translate("one", "en", "ru")
+        time.sleep(0.4)  # даю медленному запросу завершиться и попасть в статистику
+
+        assert group.ranked_urls() == ["fast", "slow"]
+        assert group.translate("two", "en", "ru")["translated_text"] == "two@fast"
+        assert group.hedge_delay("fast") == group.min_delay
+        group.close()
+
+    def test_hedge_delay_uses_quantile(self) -> None:
+        """Тест расчёта задержки хеджа по квантилю задержек зеркала.
+
+        Что делаю:
+            Проверяю задержку до и после набора min_samples наблюдений.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        group = MirrorGroup(["a", "b"], _fake_mirrors({}), initial_delay=0.7, min_delay=0.01, min_samples=3)
+        assert group.hedge_delay("a") == 0.7
+
+        for _ in range(3):
+            group.translate("x", "en", "ru")
+        group.close()
+        assert group.hedge_delay("a") == 0.01
+
+
+class TestClientMirrors:
+    """Тесты для гонки зеркал через translate_text."""
+
+    def test_translate_text_races_mirrors(self) -> None:
+        """Тест: translate_text использует зеркала, настроенные для основного URL.
+
+        Что делаю:
+            Первое зеркало зависает, второе отвечает; проверяю результат и кэш.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        release = threading.Event()
+
+        def fake_lingva(api_url: str, headers: Dict[str, str], text: str, source_lang: str,
+                        target_lang: str, timeout: Any = None) -> Dict[str, Any]:
+            if "lingva.ml" in api_url:
+                release.wait(2)
+            return {"translated_text": api_url, "source_language": source_lang, "confidence": 100, "api": "Lingva"}
+
+        primary, mirror = "https://lingva.ml/api/v1", "https://lingva.mirror.example/api/v1"
+        with patch("api_client.rapidapi_client._translate_lingva", side_effect=fake_lingva):
+            group = configure_mirrors(primary, [mirror])
+            group.initial_delay = 0.05
+
+            result = translate_text(primary, "Hello", "en", "ru")
+            cached = translate_text(primary, "Hello", "en", "ru")
+            release.set()
+
+        assert result["translated_text"] == mirror
+        assert cached["translated_text"] == result["translated_text"]
+        assert cached["timing"]["cache"] == "memory"
+
+    def test_translate_many_races_mirrors(self) -> None:
+        """Тест: чанки translate_many идут через гонку зеркал, как и translate_text.
+
+        Что делаю:
+            Первое зеркало зависает, второе переводит чанк; проверяю результаты сегментов.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        release = threading.Event()
+
+        def fake_lingva(api_url: str, headers: Dict[str, str], text: str, source_lang: str,
+                        target_lang: str, timeout: Any = None) -> Dict[str, Any]:
+            if "lingva.ml" in api_url:
+                release.wait(2)
+            return {"translated_text": text.upper(), "source_language": source_lang, "confidence": 100,
+                    "api": api_url}
+
+        primary, mirror = "https://lingva.ml/api/v1", "https://lingva.mirror.example/api/v1"
+        with patch("api_client.rapidapi_client._translate_lingva", side_effect=fake_lingva):
+            group = configure_mirrors(primary, [mirror])
+            group.initial_delay = 0.05
+
+            results = translate_many(primary, ["one", "two"], "en", "ru")
+            release.set()
+
+        assert [result["translated_text"] for result in results] == ["ONE", "TWO"]
+        assert all(result["api"] == mirror for result in results)
+        assert get_mirror_stats()[primary]["hedges_sent"] == 1
+        assert get_mirror_stats()[primary]["hedges_sent"] == 1
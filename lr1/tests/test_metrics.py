@@ -0,0 +1,361 @@
+"""Тесты для метрик запросов и поля timing."""
+
+import json
+import socket
+import threading
+from dataclasses import replace
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator
+import pytest
+from unittest.mock import patch
+from config import CONFIG
+from urllib3.exceptions import NewConnectionError
+from api_client.metrics import (
+    MetricsRegistry, RequestTiming, TimedHTTPConnection, TimedHTTPSConnection, current_timing, record_response,
+    track_timing,
+)
+from api_client.providers import configure_endpoint
+from api_client.rapidapi_client import translate_text, translate_many, get_metrics, render_metrics, _RETRY_POLICY
+
+MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+OK = {"translated_text": "Привет", "source_language": "en", "confidence": 100, "api": "MyMemory"}
+
+
+@pytest.fixture(autouse=True)
+def _no_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Отключает повторы и паузу ведра токенов, чтобы каждый вызов давал одну попытку."""
+    monkeypatch.setattr(_RETRY_POLICY, "retries", 0)
+    monkeypatch.setattr("api_client.rapidapi_client.CONFIG", replace(CONFIG, rate_limit_backoff=0))
+
+
+class _MyMemoryHandler(BaseHTTPRequestHandler):
+    """Локальный сервер с ответом в формате MyMemory."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps({"responseStatus": 200, "responseData": {"translatedText": "Привет"}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def local_api(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    """Запускает локальный HTTP-сервер и возвращает его URL, привязанный к MyMemory."""
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MyMemoryHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/get"
+    configure_endpoint(url, "mymemory")
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def silent_server() -> Iterator[int]:
+    """Открывает TCP-порт, который принимает соединения и молчит (TLS-рукопожатие не завершится)."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(4)
+    yield server.getsockname()[1]
+    server.close()
+
+
+class TestMetricsRegistry:
+    """Тесты для реестра метрик."""
+
+    def test_prometheus_text(self) -> None:
+        """Тест выгрузки счётчиков и гистограмм в формате Prometheus.
+
+        Что делаю:
+            Увеличиваю счётчик и добавляю три наблюдения в гистограмму.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        registry = MetricsRegistry(buckets=(0.1, 1.0))
+        registry.inc("requests_total", provider="lingva", status=200)
+        registry.inc("requests_total", provider="lingva", status=200)
+        for value in (0.05, 0.5, 5.0):
+            registry.observe("phase_seconds", value, provider="lingva", phase="ttfb")
+
+        lines = registry.render_prometheus().splitlines()
+
+        assert "# TYPE translation_requests_total counter" in lines
+        assert 'translation_requests_total{provider="lingva",status="200"} 2' in lines
+        assert "# TYPE translation_phase_seconds histogram" in lines
+        assert 'translation_phase_seconds_bucket{phase="ttfb",provider="lingva",le="0.1"} 1' in lines
+        assert 'translation_phase_seconds_bucket{phase="ttfb",provider="lingva",le="1"} 2' in lines
+        assert 'translation_phase_seconds_bucket{phase="ttfb",provider="lingva",le="+Inf"} 3' in lines
+        assert 'translation_phase_seconds_sum{phase="ttfb",provider="lingva"} 5.55' in lines
+        assert 'translation_phase_seconds_count{phase="ttfb",provider="lingva"} 3' in lines
+
+    def test_label_escaping_and_reset(self) -> None:
+        """Тест экранирования значений меток и обнуления реестра.
+
+        Что делаю:
+            Пишу счётчик с кавычкой и переводом строки в метке, затем сбрасываю.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        registry = MetricsRegistry()
+        registry.inc("errors_total", provider='a"b\nc', error="x")
+
+        assert 'provider="a\\"b\\nc"' in registry.render_prometheus()
+        registry.reset()
+        assert registry.render_prometheus() == ""
+
+    def test_timing_merge(self) -> None:
+        """Тест сложения замеров попыток в замеры вызова.
+
+        Что делаю:
+            Вкладываю две попытки в один вызов через track_timing.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        with track_timing() as call:
+            for _ in range(2):
+                with track_timing() as attempt:
+                    attempt.add("ttfb", 0.01)
+                    attempt.status = 503
+                    attempt.bytes_received = 10
+                call.merge(attempt)
+            assert current_timing() is call
+        assert current_timing() is None
+
+        timing = call.as_dict()
+        assert timing["attempts"] == 2
+        assert timing["ttfb_ms"] == pytest.approx(20)
+        assert timing["status"] == 503
+        assert timing["bytes_received"] == 20
+        assert timing["cache"] == "miss"
+        assert RequestTiming().as_dict()["attempts"] == 0
+
+
+class TestConnectionPhases:
+    """Тесты для замера фаз соединения и времени до первого байта."""
+
+    def test_http_connect_phase(self, silent_server: int) -> None:
+        """Тест: TimedHTTPConnection записывает только фазу connect.
+
+        Что делаю:
+            Соединяюсь с локальным портом обычным HTTP.
+
+        Вход:
+            silent_server: порт молчащего сервера.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        conn = TimedHTTPConnection("localhost", silent_server, timeout=1)
+        with track_timing() as timing:
+            conn.connect()
+        conn.close()
+
+        assert set(timing.phases) == {"connect"}
+        assert timing.phases["connect"] < 0.5
+
+    def test_tls_phase_excludes_tcp(self, silent_server: int) -> None:
+        """Тест: TimedHTTPSConnection делит время соединения на connect и tls.
+
+        Что делаю:
+            Соединяюсь с сервером, который не отвечает на рукопожатие, при тайм-ауте 0.2 с:
+            TCP устанавливается сразу, всё ожидание приходится на TLS.
+
+        Вход:
+            silent_server: порт молчащего сервера.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        conn = TimedHTTPSConnection("localhost", silent_server, timeout=0.2)
+        with track_timing() as timing:
+            with pytest.raises(OSError):
+                conn.connect()
+        conn.close()
+
+        assert set(timing.phases) == {"connect", "tls"}
+        assert timing.phases["tls"] >= 0.15
+        assert timing.phases["connect"] < 0.1
+
+    def test_failed_connect_has_no_tls(self) -> None:
+        """Тест: при отказе в TCP-соединении всё время уходит в фазу connect.
+
+        Что делаю:
+            Соединяюсь HTTPS с закрытым портом.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        probe = socket.socket()
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+        probe.close()
+
+        conn = TimedHTTPSConnection("127.0.0.1", port, timeout=0.5)
+        with track_timing() as timing:
+            with pytest.raises(NewConnectionError):
+                conn.connect()
+        conn.close()
+
+        assert set(timing.phases) == {"connect"}
+
+    def test_ttfb_excludes_connection_setup(self, silent_server: int) -> None:
+        """Тест: из response.elapsed вычитаются фазы соединения, установленного за этот запрос.
+
+        Что делаю:
+            Устанавливаю соединение, затем передаю хуку ответ с elapsed = время
+            соединения + 0.3 с; второй ответ по тому же соединению вычета не получает.
+
+        Вход:
+            silent_server: порт молчащего сервера.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        conn = TimedHTTPConnection("localhost", silent_server, timeout=1)
+        with track_timing() as timing:
+            conn.connect()
+            conn.close()
+            connect = timing.phases["connect"]
+            request = SimpleNamespace(url="", body=None)
+            record_response(SimpleNamespace(status_code=200, elapsed=timedelta(seconds=connect + 0.3),
+                                            request=request, content=b""))
+            assert timing.phases["ttfb"] == pytest.approx(0.3, abs=1e-5)
+            record_response(SimpleNamespace(status_code=200, elapsed=timedelta(seconds=0.3),
+                                            request=request, content=b""))
+
+        assert timing.phases["ttfb"] == pytest.approx(0.6, abs=1e-5)
+
+
+class TestClientMetrics:
+    """Тесты для метрик translate_text и translate_many."""
+
+    def test_real_request_phases(self, local_api: str) -> None:
+        """Тест: запрос через пул сессий замеряет соединение и первый байт.
+
+        Что делаю:
+            Дважды перевожу разные тексты через локальный сервер.
+
+        Вход:
+            local_api: URL локального сервера.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        first = translate_text(local_api, "Hello", "en", "ru")
+        second = translate_text(local_api, "World", "en", "ru")
+
+        assert first["translated_text"] == "Привет"
+        timing = first["timing"]
+        assert timing["status"] == 200
+        assert timing["attempts"] == 1
+        assert {"connect_ms", "ttfb_ms", "request_ms"} <= set(timing)
+        assert "dns_ms" not in timing
+        assert timing["connect_ms"] + timing["ttfb_ms"] <= timing["request_ms"]
+        assert timing["bytes_sent"] > 0 and timing["bytes_received"] > 0
+        # Второй запрос идёт по открытому соединению
+        assert "connect_ms" not in second["timing"]
+
+        counters = get_metrics()["counters"]
+        assert counters["requests_total"][(("provider", "mymemory"), ("status", "200"))] == 2
+        text = render_metrics()
+        assert 'translation_phase_seconds_count{phase="connect",provider="mymemory"} 1' in text
+        assert 'translation_phase_seconds_count{phase="call",provider="mymemory"} 2' in text
+
+    def test_rate_limits_are_exported(self) -> None:
+        """Тест: состояние ограничителя провайдера попадает в метрики Prometheus.
+
+        Что делаю:
+            Перевожу два текста через MyMemory и выгружаю метрики.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        with patch("api_client.rapidapi_client._translate_mymemory", return_value=OK):
+            translate_text(MYMEMORY_URL, "Hello", "en", "ru")
+            translate_text(MYMEMORY_URL, "World", "en", "ru")
+
+        text = render_metrics()
+        assert "# TYPE translation_rate_limit_concurrency_limit gauge" in text
+        assert "# TYPE translation_rate_limit_requests_total counter" in text
+        assert 'translation_rate_limit_requests_per_second{provider="mymemory"} 2' in text
+        assert 'translation_rate_limit_requests_total{provider="mymemory"} 2' in text
+        assert 'translation_rate_limit_in_flight{provider="mymemory"} 0' in text
+        assert get_metrics()["gauges"]["rate_limit_quota_retry_after_seconds"][(("provider", "mymemory"),)] == 0
+
+    def test_cache_hits_and_retries(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Тест счётчиков кэша и повторов.
+
+        Что делаю:
+            Первая попытка падает с 503, вторая успешна; затем повторяю запрос из кэша.
+
+        Вход:
+            monkeypatch: фикстура pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        monkeypatch.setattr(_RETRY_POLICY, "retries", 1)
+        monkeypatch.setattr(_RETRY_POLICY, "base_delay", 0)
+        responses = [{"error": "api_error", "status": 503, "api": "MyMemory"}, OK]
+
+        with patch("api_client.rapidapi_client._translate_mymemory", side_effect=responses):
+            result = translate_text(MYMEMORY_URL, "Hello", "en", "ru")
+            cached = translate_text(MYMEMORY_URL, "Hello", "en", "ru")
+
+        assert result["timing"]["attempts"] == 2
+        assert cached["timing"] == {"total_ms": cached["timing"]["total_ms"], "cache": "memory", "attempts": 0}
+        counters = get_metrics()["counters"]
+        provider = (("provider", "mymemory"),)
+        assert counters["retries_total"][provider] == 1
+        assert counters["cache_misses_total"][provider] == 1
+        assert counters["cache_hits_total"][(("level", "memory"),) + provider] == 1
+        assert counters["errors_total"][(("error", "api_error"),) + provider] == 1
+
+    def test_timing_field_can_be_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Тест: при RESULT_TIMING=0 результат не содержит поля timing, и в кэш оно не попадает.
+
+        Что делаю:
+            Перевожу текст с выключенным полем, затем пачкой из кэша.
+
+        Вход:
+            monkeypatch: фикстура pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        monkeypatch.setattr("api_client.rapidapi_client.CONFIG", replace(CONFIG, result_timing=False))
+        with patch("api_client.rapidapi_client._translate_mymemory", return_value=dict(OK)):
+            assert translate_text(MYMEMORY_URL, "Hello", "en", "ru") == OK
+            batch = translate_many(MYMEMORY_URL, ["Hello"], "en", "ru")
+
+        assert batch == [OK]
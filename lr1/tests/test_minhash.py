@@ -0,0 +1,154 @@
+"""Тесты для индекса MinHash/LSH похожих переводов."""
+
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from analizer.minhash import MinHashIndex, shingle_hashes
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+TEXT = "The quick brown fox jumps over the lazy dog near the river bank"
+
+
+class TestSignatures:
+    """Тесты для шинглов и сигнатур."""
+
+    def test_shingles_are_normalized(self) -> None:
+        """Тест: шинглы не зависят от регистра и пробелов, пустой текст без шинглов.
+
+        Что делаю:
+            Сравниваю хеши шинглов двух написаний одного текста.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        assert set(shingle_hashes("Hello  World")) == set(shingle_hashes(" hello world "))
+        assert shingle_hashes("   ").size == 0
+        assert shingle_hashes("abc").size == 1
+
+    def test_signature_is_stable_across_processes(self) -> None:
+        """Тест: сигнатура одинакова в другом процессе (не зависит от PYTHONHASHSEED).
+
+        Что делаю:
+            Считаю сигнатуру здесь и в дочернем процессе с другим PYTHONHASHSEED.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        code = ("from analizer.minhash import MinHashIndex;"
+                f"print(MinHashIndex(num_perm=16, bands=4).signature({TEXT!r}).tolist())")
+        env = dict(os.environ, PYTHONHASHSEED="12345", PYTHONPATH=SRC)
+        output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+        assert output.stdout.strip() == str(MinHashIndex(num_perm=16, bands=4).signature(TEXT).tolist())
+
+    def test_signature_estimates_jaccard(self) -> None:
+        """Тест: доля совпадений сигнатур близка к коэффициенту Жаккара шинглов.
+
+        Что делаю:
+            Сравниваю оценку по 256 хеш-функциям с точным значением.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        other = TEXT.replace("lazy dog", "sleepy cat")
+        index = MinHashIndex(num_perm=256, bands=32)
+        shingles_a, shingles_b = set(shingle_hashes(TEXT)), set(shingle_hashes(other))
+        exact = len(shingles_a & shingles_b) / len(shingles_a | shingles_b)
+
+        estimate = float(np.mean(index.signature(TEXT) == index.signature(other)))
+
+        assert estimate == pytest.approx(exact, abs=0.1)
+        with pytest.raises(ValueError):
+            MinHashIndex(num_perm=100, bands=16)
+
+
+class TestMinHashIndex:
+    """Тесты для вставки, поиска и хранения индекса."""
+
+    def test_query_finds_near_duplicates(self) -> None:
+        """Тест: поиск находит почти совпадающий текст и не находит непохожие.
+
+        Что делаю:
+            Индексирую текст и 200 посторонних фраз, ищу слегка изменённый текст.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        index = MinHashIndex()
+        added = index.add_many([(f"noise-{number}", f"Unrelated phrase number {number} about weather", None)
+                                for number in range(200)])
+        index.add("target", TEXT, {"similarity": 0.93})
+
+        results = index.query(TEXT.replace("river", "lake"), k=3)
+
+        assert added == 200
+        assert results[0]["key"] == "target"
+        assert results[0]["payload"] == {"similarity": 0.93}
+        assert results[0]["similarity"] > 0.6
+        assert all(not result["key"].startswith("noise") or result["similarity"] < 0.5 for result in results)
+        assert index.query("Совершенно другой текст на русском языке", min_similarity=0.5) == []
+        assert not index.add("empty", "  ")
+        assert "target" in index and "empty" not in index
+
+    def test_replace_key(self) -> None:
+        """Тест: повторная вставка ключа заменяет текст и данные записи.
+
+        Что делаю:
+            Добавляю ключ дважды с разными текстами.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        index = MinHashIndex()
+        index.add("key", TEXT, 1)
+        index.add("key", "Something completely different from the fox sentence", 2)
+
+        assert len(index) == 1
+        assert index.query(TEXT, min_similarity=0.5) == []
+        assert index.query("Something completely different from the fox sentence")[0]["payload"] == 2
+
+    def test_persistence(self, tmp_path) -> None:
+        """Тест: записи сохраняются на диск и находятся после повторного открытия.
+
+        Что делаю:
+            Добавляю записи в индекс с файлом, закрываю и открываю его заново,
+            затем открываю файл с другими параметрами.
+
+        Вход:
+            tmp_path: временная директория pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        path = str(tmp_path / "history" / "index.sqlite")
+        index = MinHashIndex(path=path)
+        index.add_many([("1", TEXT, {"api": "Lingva"}), ("2", "Another sentence entirely", None)])
+        index.close()
+
+        reopened = MinHashIndex(path=path)
+        results = reopened.query(TEXT)
+
+        assert len(reopened) == 2
+        assert results[0] == {"key": "1", "similarity": 1.0, "payload": {"api": "Lingva"}}
+        reopened.add("3", TEXT + " again")
+        reopened.close()
+        assert len(MinHashIndex(path=path)) == 3
+        with pytest.raises(ValueError):
+            MinHashIndex(num_perm=64, bands=16, path=path)
@@ -0,0 +1,100 @@
+"""Тесты для разобранного текста перевода."""
+
+from unittest.mock import patch
+from analizer.comparator import compare_translations, get_translation_quality_score
+from analizer.normalized import NormalizedText, as_normalized, normalize_translation
+from pipeline.corpus import compare_segment
+
+TRANSLATION_A = {"translated_text": "  Привет, как дела?  ", "confidence": 95, "api": "Lingva"}
+TRANSLATION_B = {"translated_text": "привет, как ты?", "confidence": 90, "api": "MyMemory"}
+
+
+class TestNormalizedText:
+    """Тесты для NormalizedText."""
+
+    def test_fields(self) -> None:
+        """Тест полей разобранного текста.
+
+        Что делаю:
+            Разбираю текст с пробелами по краям и заглавными буквами.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        text = NormalizedText("  Привет, Мир  ")
+
+        assert text.normalized == "привет, мир"
+        assert text.tokens == ["привет,", "мир"]
+        assert text.char_count == 15
+        assert text.word_count == 2
+        assert text.token_hashes == (hash("привет,"), hash("мир"))
+        assert not text.is_blank
+        assert NormalizedText("   ").is_blank
+        assert NormalizedText(None).text == ""
+
+    def test_same_as_and_helpers(self) -> None:
+        """Тест сравнения разобранных текстов и вспомогательных функций.
+
+        Что делаю:
+            Сравниваю тексты, различающиеся регистром и пробелами, и разбираю ошибку.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        text = NormalizedText("Hello ")
+
+        assert text.same_as(NormalizedText(" hello"))
+        assert not text.same_as(NormalizedText("hello!"))
+        assert as_normalized(text) is text
+        assert as_normalized("Hello").same_as(text)
+        assert normalize_translation({"error": "api_error", "translated_text": "x"}).is_blank
+        assert normalize_translation(TRANSLATION_B).normalized == "привет, как ты?"
+
+
+class TestSharedNormalization:
+    """Тесты для передачи разобранного текста в функции сравнения."""
+
+    def test_precomputed_matches_inline(self) -> None:
+        """Тест: результаты с готовым разобранным текстом совпадают с обычными.
+
+        Что делаю:
+            Сравниваю и оцениваю переводы с NormalizedText и без него.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        normalized_a = normalize_translation(TRANSLATION_A)
+        normalized_b = normalize_translation(TRANSLATION_B)
+
+        assert compare_translations(TRANSLATION_A, TRANSLATION_B, normalized_a, normalized_b) == \
+            compare_translations(TRANSLATION_A, TRANSLATION_B)
+        assert get_translation_quality_score(TRANSLATION_A, normalized_a) == \
+            get_translation_quality_score(TRANSLATION_A)
+
+    def test_pipeline_segment_parses_each_translation_once(self) -> None:
+        """Тест: запись конвейера разбирает каждый перевод один раз.
+
+        Что делаю:
+            Считаю созданные NormalizedText при построении записи сегмента.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        with patch("analizer.normalized.NormalizedText", side_effect=NormalizedText) as mock_normalized:
+            record = compare_segment(0, "Hello, how are you?", TRANSLATION_A, TRANSLATION_B)
+
+        assert mock_normalized.call_count == 2
+        assert record["word_count_diff"] == 0
+        assert 0 < record["similarity"] < 1
@@ -0,0 +1,82 @@
+"""Тесты для параллельного сравнения переводов."""
+
+import random
+import numpy as np
+import pytest
+from analizer.parallel import compare_translations_parallel, compare_translations_batch_parallel
+from analizer.comparator import compare_translations
+from analizer.batch import compare_translations_batch
+
+
+def _translations(seed: int, count: int) -> list:
+    """Генерирует результаты перевода, часть из них с ошибками."""
+    rng = random.Random(seed)
+    words = ["привет", "как", "дела", "мир", "ты"]
+    result = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            result.append({"error": "api_error", "api": "Lingva"})
+        else:
+            text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+            result.append({"translated_text": text, "confidence": rng.randint(50, 100), "api": "Lingva"})
+    return result
+
+
+class TestParallelComparison:
+    """Тесты для compare_translations_parallel и compare_translations_batch_parallel."""
+
+    def test_same_result_and_order_as_sequential(self) -> None:
+        """Тест совпадения с последовательным сравнением.
+
+        Что делаю:
+            Сравниваю 500 пар в 2 процессах мелкими чанками.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        translations_a = _translations(1, 500)
+        translations_b = _translations(2, 500)
+
+        result = compare_translations_parallel(translations_a, translations_b, workers=2, chunk_size=37)
+
+        assert result == [compare_translations(a, b) for a, b in zip(translations_a, translations_b)]
+
+    def test_batch_parallel_matches_batch(self) -> None:
+        """Тест колоночного режима.
+
+        Что делаю:
+            Сравниваю результат 2 процессов с однопроцессным compare_translations_batch.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        texts_a = [t.get("translated_text", "") for t in _translations(3, 300)]
+        texts_b = [t.get("translated_text", "") for t in _translations(4, 300)]
+
+        result = compare_translations_batch_parallel(texts_a, texts_b, workers=2, chunk_size=50, score_cutoff=0.3)
+        expected = compare_translations_batch(texts_a, texts_b, score_cutoff=0.3)
+
+        assert set(result) == set(expected)
+        for name in expected:
+            np.testing.assert_array_equal(result[name], expected[name])
+
+    def test_length_mismatch(self) -> None:
+        """Тест входов разной длины.
+
+        Что делаю:
+            Передаю списки разной длины.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        with pytest.raises(ValueError):
+            compare_translations_parallel([{}], [], workers=2)
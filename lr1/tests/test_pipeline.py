@@ -0,0 +1,172 @@
+"""Тесты для потокового сравнения корпуса."""
+
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import patch, Mock
+import pytest
+from pipeline.corpus import read_segments, run_pipeline, resume_offset
+
+
+def _fake_translate_many(api_url: str, texts: List[str], source_lang: str, target_lang: str,
+                         **kwargs: Any) -> List[Dict[str, Any]]:
+    """Имитирует translate_many: 'перевод' - текст в верхнем регистре."""
+    api = "Lingva" if "lingva" in api_url else "MyMemory"
+    return [{"translated_text": text.upper(), "source_language": source_lang, "confidence": 100, "api": api}
+            for text in texts]
+
+
+class TestCorpusPipeline:
+    """Тесты для read_segments и run_pipeline."""
+
+    def test_read_segments_formats(self, tmp_path: Path) -> None:
+        """Тест чтения txt, jsonl и tsv.
+
+        Что делаю:
+            Читаю корпуса разных форматов с пустыми строками и смещением.
+
+        Вход:
+            tmp_path: временная папка pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        txt = tmp_path / "corpus.txt"
+        txt.write_text("one\n\ntwo\nthree\n", encoding="utf-8")
+        jsonl = tmp_path / "corpus.jsonl"
+        jsonl.write_text('{"text": "one"}\n{"text": "two"}\n', encoding="utf-8")
+        tsv = tmp_path / "corpus.tsv"
+        tsv.write_text("1\tone\n2\ttwo\n", encoding="utf-8")
+
+        assert list(read_segments(str(txt))) == [(0, "one"), (2, "two"), (3, "three")]
+        assert list(read_segments(str(txt), offset=3)) == [(3, "three")]
+        assert list(read_segments(str(jsonl))) == [(0, "one"), (1, "two")]
+        assert list(read_segments(str(tsv), column=1)) == [(0, "one"), (1, "two")]
+
+    def test_read_segments_csv(self, tmp_path: Path) -> None:
+        """Тест чтения csv через csv.reader.
+
+        Что делаю:
+            Читаю csv, где текст в кавычках содержит запятую и перенос строки,
+            и проверяю нумерацию записей и смещение.
+
+        Вход:
+            tmp_path: временная папка pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        corpus = tmp_path / "corpus.csv"
+        with open(corpus, "w", encoding="utf-8", newline="") as handle:
+            csv.writer(handle).writerows([[1, "one, two"], [2, "three\nfour"], [3, ""], [4, "five"]])
+
+        assert list(read_segments(str(corpus), column=1)) == [(0, "one, two"), (1, "three\nfour"), (3, "five")]
+        assert list(read_segments(str(corpus), column=1, offset=2)) == [(3, "five")]
+
+    def test_read_segments_jsonl_rejects_non_objects(self, tmp_path: Path) -> None:
+        """Тест: строка jsonl, которая валидный JSON, но не объект, даёт ValueError с номером строки.
+
+        Что делаю:
+            Читаю jsonl, где вторая строка - JSON-список.
+
+        Вход:
+            tmp_path: временная папка pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        corpus = tmp_path / "corpus.jsonl"
+        corpus.write_text('{"text": "one"}\n["two"]\n', encoding="utf-8")
+
+        segments = read_segments(str(corpus))
+        assert next(segments) == (0, "one")
+        with pytest.raises(ValueError, match="Строка 1"):
+            next(segments)
+
+    @patch('pipeline.corpus.translate_many', side_effect=_fake_translate_many)
+    def test_jsonl_output_in_batches(self, mock_translate_many: Mock, tmp_path: Path) -> None:
+        """Тест записи результата JSONL пачками.
+
+        Что делаю:
+            Прогоняю 5 сегментов пачками по 2 и проверяю результат.
+
+        Вход:
+            mock_translate_many: мок для translate_many,
+            tmp_path: временная папка pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        corpus = tmp_path / "corpus.txt"
+        corpus.write_text("a\nb\nc\nd\ne\n", encoding="utf-8")
+        output = tmp_path / "out.jsonl"
+
+        processed = run_pipeline(str(corpus), str(output), "https://lingva.ml/api/v1",
+                                 "https://api.mymemory.translated.net/get", "en", "ru", batch_size=2)
+
+        records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+        assert processed == 5
+        assert [record["index"] for record in records] == [0, 1, 2, 3, 4]
+        assert records[0]["translation_a"] == "A"
+        assert records[0]["similarity"] == 1.0
+        assert records[0]["api_b"] == "MyMemory"
+        # 3 пачки по 2 API
+        assert mock_translate_many.call_count == 6
+
+    @patch('pipeline.corpus.translate_many', side_effect=_fake_translate_many)
+    def test_resume_after_partial_write(self, mock_translate_many: Mock, tmp_path: Path) -> None:
+        """Тест продолжения после обрыва посреди записи.
+
+        Что делаю:
+            Оставляю в результате две полные строки и одну недописанную, затем продолжаю.
+
+        Вход:
+            mock_translate_many: мок для translate_many,
+            tmp_path: временная папка pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        corpus = tmp_path / "corpus.txt"
+        corpus.write_text("a\nb\nc\nd\n", encoding="utf-8")
+        output = tmp_path / "out.jsonl"
+        output.write_text('{"index": 0}\n{"index": 1}\n{"index": 2, "te', encoding="utf-8")
+
+        assert resume_offset(str(output), "jsonl") == 2
+
+        processed = run_pipeline(str(corpus), str(output), "https://lingva.ml/api/v1",
+                                 "https://api.mymemory.translated.net/get", "en", "ru", resume=True)
+
+        records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+        assert processed == 2
+        assert [record["index"] for record in records] == [0, 1, 2, 3]
+
+    @patch('pipeline.corpus.translate_many', side_effect=_fake_translate_many)
+    def test_csv_resume_writes_header_once(self, mock_translate_many: Mock, tmp_path: Path) -> None:
+        """Тест CSV-результата при продолжении.
+
+        Что делаю:
+            Обрабатываю первые две записи, затем продолжаю с --resume.
+
+        Вход:
+            mock_translate_many: мок для translate_many,
+            tmp_path: временная папка pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        corpus = tmp_path / "corpus.txt"
+        corpus.write_text("a\nb\nc\n", encoding="utf-8")
+        first_part = tmp_path / "first.txt"
+        first_part.write_text("a\nb\n", encoding="utf-8")
+        output = tmp_path / "out.csv"
+        urls = ("https://lingva.ml/api/v1", "https://api.mymemory.translated.net/get")
+
+        run_pipeline(str(first_part), str(output), *urls, "en", "ru")
+        run_pipeline(str(corpus), str(output), *urls, "en", "ru", resume=True)
+
+        with open(output, encoding="utf-8", newline="") as handle:
+            rows = list(csv.DictReader(handle))
+        assert [row["index"] for row in rows] == ["0", "1", "2"]
+        assert rows[2]["translation_b"] == "C"
@@ -0,0 +1,120 @@
+"""Тесты для профилирования этапов сравнения."""
+
+import json
+import os
+import tempfile
+import time
+import pytest
+from analizer.comparator import compare_translations, get_translation_quality_score
+from analizer.profiling import PROFILER, Profiler, profiling
+
+TRANSLATION_A = {"translated_text": "Привет, как дела?", "confidence": 95, "api": "Lingva"}
+TRANSLATION_B = {"translated_text": "Привет, как ты?", "confidence": 90, "api": "MyMemory"}
+
+
+class TestProfiler:
+    """Тесты для накопителя замеров этапов."""
+
+    def test_disabled_profiler_records_nothing(self) -> None:
+        """Тест: выключенный профилировщик отдаёт общий пустой контекст и ничего не копит.
+
+        Что делаю:
+            Сравниваю переводы без профилирования.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        profiler = Profiler()
+        assert profiler.stage("a") is profiler.stage("b")
+        with profiler.stage("a"):
+            pass
+        assert profiler.report() == {}
+
+        PROFILER.reset()
+        compare_translations(TRANSLATION_A, TRANSLATION_B)
+        assert PROFILER.report() == {}
+
+    def test_comparator_stages(self) -> None:
+        """Тест: сравнение и оценка качества записывают свои этапы.
+
+        Что делаю:
+            Сравниваю 10 пар и оцениваю 10 переводов внутри profiling().
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        with profiling() as profiler:
+            for _ in range(10):
+                compare_translations(TRANSLATION_A, TRANSLATION_B)
+                get_translation_quality_score(TRANSLATION_A)
+            report = profiler.report()
+
+        assert not PROFILER.enabled
+        assert report["normalization"]["calls"] == 20
+        assert report["similarity"]["calls"] == 10
+        assert report["scoring"]["calls"] == 10
+        assert sum(row["share"] for row in report.values()) == pytest.approx(1.0)
+        assert all(row["alloc_blocks"] == 0 and row["peak_bytes"] == 0 for row in report.values())
+        assert list(report) == sorted(report, key=lambda name: -report[name]["total_ms"])
+
+    def test_nested_stages_are_not_counted_twice(self) -> None:
+        """Тест: время вложенного этапа входит в total_ms внешнего, но не в его self_ms и share.
+
+        Что делаю:
+            Запускаю этап inner (20 мс) внутри outer (ещё 10 мс своего времени).
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        profiler = Profiler(enabled=True)
+        with profiler.stage("outer"):
+            time.sleep(0.01)
+            with profiler.stage("inner"):
+                time.sleep(0.02)
+        report = profiler.report()
+
+        outer, inner = report["outer"], report["inner"]
+        assert outer["total_ms"] >= outer["self_ms"] + inner["total_ms"] - 0.1
+        assert outer["self_ms"] == pytest.approx(outer["total_ms"] - inner["total_ms"], abs=0.1)
+        assert inner["self_ms"] == inner["total_ms"]
+        assert outer["share"] + inner["share"] == pytest.approx(1.0)
+        assert inner["share"] > outer["share"]
+
+    def test_allocations_and_dump(self) -> None:
+        """Тест режима подсчёта памяти и записи сводки в JSON.
+
+        Что делаю:
+            Профилирую этап, создающий список, и записываю сводку в файл.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        profiler = Profiler(enabled=True, allocations=True)
+        kept = []
+        with profiler.stage("build"):
+            kept.append([str(index) for index in range(1000)])
+        profiler.disable()
+
+        row = profiler.report()["build"]
+        assert row["alloc_blocks"] > 500
+        assert row["peak_bytes"] > 10000
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            profiler.dump(path)
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        assert data["stages"]["build"]["calls"] == 1
+        assert "build" in profiler.format_report()
@@ -0,0 +1,130 @@
+"""Тесты для реестра провайдеров перевода."""
+
+from typing import Any, Dict
+import pytest
+from unittest.mock import patch, Mock
+from api_client.providers import (
+    TranslationProvider, register_provider, configure_endpoint, resolve_provider, available_providers,
+    _PROVIDER_CLASSES,
+)
+from api_client.rapidapi_client import translate_text, LingvaProvider, MyMemoryProvider
+
+
+class EchoProvider(TranslationProvider):
+    """Тестовый локальный провайдер, возвращающий текст в верхнем регистре."""
+
+    name = "echo"
+    display_name = "Echo"
+    url_hints = ("echo.local",)
+
+    def translate(self, text: str, source_lang: str, target_lang: str, timeout: Any = None) -> Dict[str, Any]:
+        return {"translated_text": text.upper(), "source_language": source_lang, "confidence": 100, "api": "Echo"}
+
+
+class TestProviderRegistry:
+    """Тесты для регистрации и разрешения провайдеров."""
+
+    def test_builtin_providers_detected_by_url(self) -> None:
+        """Тест распознавания встроенных провайдеров по URL.
+
+        Что делаю:
+            Разрешаю публичные URL MyMemory и Lingva и неизвестный URL.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        assert {"mymemory", "lingva"} <= set(available_providers())
+        assert isinstance(resolve_provider("https://api.mymemory.translated.net/get"), MyMemoryProvider)
+        assert isinstance(resolve_provider("https://lingva.ml/api/v1"), LingvaProvider)
+        assert resolve_provider("https://translate.example.org/api/v1") is None
+
+    def test_self_hosted_lingva_by_explicit_name(self) -> None:
+        """Тест self-hosted Lingva на произвольном хосте.
+
+        Что делаю:
+            Привязываю URL без слова lingva к провайдеру lingva и перевожу.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        url = "https://translate.example.org/api/v1"
+        configure_endpoint(url, "lingva", connect_timeout=1, read_timeout=3)
+
+        with patch('api_client.rapidapi_client.get_session') as mock_get_session:
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {"translation": "Привет"}
+            mock_get_session.return_value.get.return_value = response
+
+            result = translate_text(url, "Hello", "en", "ru")
+
+        assert result["translated_text"] == "Привет"
+        assert result["api"] == "Lingva"
+        assert mock_get_session.return_value.get.call_args.kwargs["timeout"] == (1, 3)
+
+    def test_resolution_happens_once_per_url(self) -> None:
+        """Тест: URL распознаётся один раз, дальше берётся из словаря.
+
+        Что делаю:
+            Разрешаю один URL дважды и считаю вызовы matches.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        with patch.object(LingvaProvider, "matches", return_value=True) as mock_matches:
+            first = resolve_provider("https://lingva.ml/api/v1")
+            second = resolve_provider("https://lingva.ml/api/v1")
+
+        assert first is second
+        assert mock_matches.call_count == 1
+
+    def test_custom_provider_plugs_into_translate_text(self) -> None:
+        """Тест подключения нового провайдера без правки translate_text.
+
+        Что делаю:
+            Регистрирую EchoProvider и перевожу через его URL.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        register_provider(EchoProvider)
+        try:
+            result = translate_text("http://echo.local/translate", "hello", "en", "ru")
+        finally:
+            _PROVIDER_CLASSES.pop("echo")
+
+        assert result["translated_text"] == "HELLO"
+        assert result["api"] == "Echo"
+
+    def test_settings_are_validated(self) -> None:
+        """Тест проверки имени провайдера и настроек.
+
+        Что делаю:
+            Передаю неизвестное имя провайдера и неизвестную настройку.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        with pytest.raises(ValueError):
+            configure_endpoint("https://example.org", "deepl")
+        with pytest.raises(ValueError):
+            configure_endpoint("https://lingva.ml/api/v1", "lingva", retries=3)
+
+        provider = configure_endpoint("https://lingva.ml/api/v1", "lingva", batch_limit=100)
+        assert provider.batch_limit == 100
+        assert LingvaProvider.batch_limit == 1500
@@ -0,0 +1,478 @@
+"""Тесты для ограничения частоты и адаптивной конкурентности."""
+
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Dict
+import pytest
+from unittest.mock import Mock, patch
+from conftest import FakeClock
+from config import CONFIG
+from api_client.rate_limit import AdaptiveConcurrencyLimiter, ProviderLimiter, TokenBucket, is_overload
+from api_client.providers import configure_endpoint
+from api_client.rapidapi_client import translate_text, configure_mirrors, get_rate_limit_stats, _RETRY_POLICY
+
+
+class TestTokenBucket:
+    """Тесты для ведра токенов."""
+
+    def test_burst_then_steady_rate(self) -> None:
+        """Тест: burst запросов проходят сразу, дальше - по одному на 1/rate секунд.
+
+        Что делаю:
+            Беру 5 токенов из ведра rate=2, burst=3.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=clock.sleep)
+
+        delays = [bucket.acquire() for _ in range(5)]
+
+        assert delays[:3] == [0.0, 0.0, 0.0]
+        assert delays[3] == pytest.approx(0.5)
+        assert delays[4] == pytest.approx(0.5)
+        assert clock.now == pytest.approx(1.0)
+
+    def test_refill_is_capped_by_burst(self) -> None:
+        """Тест: за время простоя копится не больше burst токенов.
+
+        Что делаю:
+            Жду 100 секунд и беру 3 токена из ведра burst=2.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, burst=2, clock=clock, sleep=clock.sleep)
+        clock.now = 100.0
+
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, pytest.approx(1.0)]
+
+    def test_unlimited_and_pause(self) -> None:
+        """Тест ведра без лимита и паузы после перегрузки.
+
+        Что делаю:
+            Беру токены из ведра rate=0, ставлю паузу на 2 секунды.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        bucket = TokenBucket(rate=0, clock=clock, sleep=clock.sleep)
+
+        assert [bucket.acquire() for _ in range(100)] == [0.0] * 100
+        bucket.pause(2.0)
+        assert bucket.acquire() == pytest.approx(2.0)
+        assert bucket.acquire() == 0.0
+
+    def test_timeout_leaves_token(self) -> None:
+        """Тест: если токена не дождаться за timeout, он не забирается.
+
+        Что делаю:
+            Беру токен из ведра rate=2, burst=1, затем прошу следующий с
+            таймаутом меньше и больше времени его появления.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=1, clock=clock, sleep=clock.sleep)
+
+        assert bucket.acquire(timeout=0) == 0.0
+        assert bucket.acquire(timeout=0.2) is None
+        assert bucket.available == pytest.approx(0.0)
+        assert bucket.acquire(timeout=1.0) == pytest.approx(0.5)
+        assert clock.sleeps == [pytest.approx(0.5)]
+
+
+class TestAdaptiveConcurrency:
+    """Тесты для AIMD-конкурентности."""
+
+    def test_additive_increase_multiplicative_decrease(self) -> None:
+        """Тест роста лимита на успехах и падения на перегрузке.
+
+        Что делаю:
+            Отпускаю 4 успешных запроса, затем две перегрузки подряд.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(initial=4, minimum=1, maximum=8, cooldown=1.0, clock=clock)
+
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release(overloaded=False)
+        assert limiter.limit == pytest.approx(4.92, abs=0.01)
+
+        limiter.acquire()
+        limiter.release(overloaded=True)
+        limiter.acquire()
+        limiter.release(overloaded=True)
+        assert limiter.limit == pytest.approx(2.46, abs=0.01)
+        assert limiter.overloads == 2
+
+        clock.now = 2.0
+        limiter.acquire()
+        limiter.release(overloaded=True)
+        assert limiter.limit == pytest.approx(1.23, abs=0.01)
+
+    def test_limit_bounds_in_flight(self) -> None:
+        """Тест: одновременно выполняется не больше limit запросов.
+
+        Что делаю:
+            Запускаю 6 потоков при лимите 2 и считаю максимум одновременных.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        limiter = AdaptiveConcurrencyLimiter(initial=2, minimum=2, maximum=2)
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def work() -> None:
+            limiter.acquire()
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            limiter.release(overloaded=False)
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak[0] == 2
+        assert limiter.in_flight == 0
+
+    def test_acquire_timeout(self) -> None:
+        """Тест: занятый слот не ждётся дольше timeout, а неизвестный исход не меняет лимит.
+
+        Что делаю:
+            Занимаю единственный слот и пытаюсь занять ещё один с таймаутом.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        limiter = AdaptiveConcurrencyLimiter(initial=1, minimum=1, maximum=4)
+
+        assert limiter.acquire(timeout=0.05)
+        started = time.monotonic()
+        assert not limiter.acquire(timeout=0.05)
+        assert time.monotonic() - started < 0.5
+        limiter.release(overloaded=None)
+
+        assert limiter.limit == 1
+        assert limiter.in_flight == 0
+
+
+class TestProviderLimiter:
+    """Тесты для ограничителя провайдера."""
+
+    def test_overload_detection(self) -> None:
+        """Тест распознавания ответов о квоте и лимите.
+
+        Что делаю:
+            Проверяю 429, квоту MyMemory с HTTP 200 и обычные ошибки.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        quota = {"error": "api_error", "status": 403,
+                 "body": "MYMEMORY WARNING: YOU USED ALL AVAILABLE FREE TRANSLATIONS FOR TODAY"}
+        assert is_overload({"error": "api_error", "status": 429})
+        assert is_overload({"error": "api_error", "status": "429"})
+        assert is_overload(quota)
+        assert not is_overload({"error": "api_error", "status": 400, "body": "bad request"})
+        assert not is_overload({"error": "api_error", "status": 503})
+        assert not is_overload({"translated_text": "quota"})
+
+    def test_overload_backs_off(self) -> None:
+        """Тест: перегрузка уменьшает конкурентность и ставит ведро на паузу.
+
+        Что делаю:
+            Выполняю успешный запрос и запрос с ответом 429.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        limiter = ProviderLimiter(rate=0, initial_concurrency=8, backoff=3.0, clock=clock, sleep=clock.sleep)
+
+        with limiter.slot():
+            limiter.record({"translated_text": "ok"})
+        with limiter.slot():
+            limiter.record({"error": "api_error", "status": 429})
+        stats = limiter.stats()
+
+        assert stats["concurrency_limit"] == pytest.approx(4.0625, abs=0.001)
+        assert stats["overloads"] == 1
+        assert stats["requests"] == 2
+        assert stats["in_flight"] == 0
+
+        with limiter.slot():
+            pass
+        assert clock.sleeps == [pytest.approx(3.0)]
+
+    def test_quota_exhaustion_pauses_provider(self) -> None:
+        """Тест: исчерпанная квота закрывает провайдера на retry_after из ответа или на quota_pause.
+
+        Что делаю:
+            Записываю ответ quota_exceeded с retry_after, затем без него, и сдвигаю часы.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        limiter = ProviderLimiter(rate=0, backoff=0, quota_pause=600.0, clock=clock, sleep=clock.sleep)
+
+        with limiter.slot():
+            limiter.record({"error": "quota_exceeded", "status": 429, "retry_after": 90})
+        assert limiter.quota_retry_after() == pytest.approx(90)
+        clock.now += 90
+        assert limiter.quota_retry_after() == 0
+
+        with limiter.slot():
+            limiter.record({"error": "quota_exceeded", "status": 429})
+        stats = limiter.stats()
+        assert stats["quota_retry_after"] == pytest.approx(600)
+        assert stats["quota_exhaustions"] == 2
+        assert stats["overloads"] == 2
+
+    def test_failures_do_not_raise_limit(self) -> None:
+        """Тест: ошибки, кроме перегрузки, и исключения не меняют лимит конкурентности.
+
+        Что делаю:
+            Выполняю запрос с ответом 503 и запрос, упавший с исключением.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        limiter = ProviderLimiter(rate=0, initial_concurrency=4, backoff=3.0, clock=clock, sleep=clock.sleep)
+
+        with limiter.slot():
+            limiter.record({"error": "api_error", "status": 503})
+        with pytest.raises(RuntimeError):
+            with limiter.slot():
+                raise RuntimeError("connection reset")
+        stats = limiter.stats()
+
+        assert stats["concurrency_limit"] == 4
+        assert stats["overloads"] == 0
+        assert limiter.bucket.acquire() == 0.0
+
+    def test_slot_timeout(self) -> None:
+        """Тест: slot() с таймаутом меньше паузы ведра поднимает TimeoutError, ничего не занимая.
+
+        Что делаю:
+            Ставлю ведро на паузу и прошу слот с таймаутом меньше паузы.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        limiter = ProviderLimiter(rate=0, initial_concurrency=4, clock=clock, sleep=clock.sleep)
+        limiter.bucket.pause(2.0)
+
+        with pytest.raises(TimeoutError):
+            with limiter.slot(timeout=1.0):
+                pass
+        stats = limiter.stats()
+
+        assert stats["requests"] == 0
+        assert stats["in_flight"] == 0
+        assert stats["concurrency_limit"] == 4
+        assert clock.sleeps == []
+
+
+class TestClientRateLimit:
+    """Тесты для ограничения запросов в translate_text."""
+
+    @pytest.fixture(autouse=True)
+    def _no_retries(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Отключает повторы, чтобы каждый вызов давал одну попытку."""
+        monkeypatch.setattr(_RETRY_POLICY, "retries", 0)
+
+    def test_provider_rate_is_enforced(self) -> None:
+        """Тест: max_requests_per_second провайдера ограничивает частоту translate_text.
+
+        Что делаю:
+            Настраиваю MyMemory на 20 запросов в секунду без запаса и отправляю 5 разных текстов.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        url = "https://api.mymemory.translated.net/get"
+        configure_endpoint(url, "mymemory", max_requests_per_second=20, burst=1)
+        ok = {"translated_text": "x", "source_language": "en", "confidence": 100, "api": "MyMemory"}
+
+        with patch("api_client.rapidapi_client._translate_mymemory", return_value=ok):
+            started = time.monotonic()
+            for index in range(5):
+                translate_text(url, f"text {index}", "en", "ru")
+            elapsed = time.monotonic() - started
+
+        stats = get_rate_limit_stats()["mymemory"]
+        assert elapsed >= 0.19
+        assert stats["rate"] == 20
+        assert stats["requests"] == 5
+
+    def test_builtin_providers_have_rate_limits(self) -> None:
+        """Тест: встроенные провайдеры ограничены по частоте без явной настройки.
+
+        Что делаю:
+            Перевожу текст через MyMemory и Lingva и смотрю лимиты их ограничителей.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        ok = {"translated_text": "x", "source_language": "en", "confidence": 100, "api": "MyMemory"}
+        with patch("api_client.rapidapi_client._translate_mymemory", return_value=ok), \
+                patch("api_client.rapidapi_client._translate_lingva", return_value=ok):
+            translate_text("https://api.mymemory.translated.net/get", "Hello", "en", "ru")
+            translate_text("https://lingva.ml/api/v1", "Hello", "en", "ru")
+
+        stats = get_rate_limit_stats()
+        assert stats["mymemory"]["rate"] == 2 and stats["mymemory"]["burst"] == 5
+        assert stats["lingva"]["rate"] == 5 and stats["lingva"]["burst"] == 10
+
+    def test_mymemory_daily_quota_is_not_retried(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Тест: предупреждение MyMemory о квоте не повторяется и закрывает провайдера до её восстановления.
+
+        Что делаю:
+            Включаю повторы, отвечаю HTTP 200 с responseStatus 429 и текстом MYMEMORY WARNING,
+            затем перевожу другой текст.
+
+        Вход:
+            monkeypatch: фикстура pytest.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        monkeypatch.setattr(_RETRY_POLICY, "retries", 2)
+        url = "https://api.mymemory.translated.net/get"
+        response = Mock(status_code=200)
+        response.json.return_value = {
+            "responseStatus": 429,
+            "responseDetails": "MYMEMORY WARNING: YOU USED ALL AVAILABLE FREE TRANSLATIONS FOR TODAY. "
+                               "NEXT AVAILABLE IN  1 HOURS 00 MINUTES 05 SECONDS",
+        }
+
+        with patch("api_client.rapidapi_client.get_session") as mock_get_session:
+            mock_get_session.return_value.get.return_value = response
+            first = translate_text(url, "Hello", "en", "ru")
+            second = translate_text(url, "World", "en", "ru")
+            calls = mock_get_session.return_value.get.call_count
+
+        assert first["error"] == "quota_exceeded"
+        assert first["retry_after"] == 3605
+        assert second["error"] == "quota_exceeded"
+        assert calls == 1
+        stats = get_rate_limit_stats()["mymemory"]
+        assert stats["quota_exhaustions"] == 1
+        assert 3600 < stats["quota_retry_after"] <= 3605
+
+    def test_quota_response_reduces_concurrency(self) -> None:
+        """Тест: ответ MyMemory о квоте уменьшает лимит конкурентности.
+
+        Что делаю:
+            Отвечаю на запрос ошибкой 429 и смотрю метрики ограничителя.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        url = "https://api.mymemory.translated.net/get"
+        quota: Dict[str, Any] = {"error": "api_error", "status": 429, "body": "QUOTA EXCEEDED", "api": "MyMemory"}
+
+        config = replace(CONFIG, rate_limit_initial_concurrency=4, rate_limit_backoff=0)
+        with patch("api_client.rapidapi_client._translate_mymemory", return_value=quota), \
+                patch("api_client.rapidapi_client.CONFIG", config):
+            result = translate_text(url, "Hello", "en", "ru")
+
+        stats = get_rate_limit_stats()["mymemory"]
+        assert result["status"] == 429
+        assert stats["concurrency_limit"] == 2
+        assert stats["overloads"] == 1
+
+    def test_mirror_503_does_not_pause_other_mirrors(self) -> None:
+        """Тест: 503 одного зеркала не ставит на паузу запросы к другим зеркалам провайдера.
+
+        Что делаю:
+            Настраиваю Lingva с зеркалом; основной URL отвечает 503, зеркало - успешно.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        primary, mirror = "https://lingva.ml/api/v1", "https://lingva.mirror.local/api/v1"
+
+        def lingva(api_url: str, headers: Dict[str, str], text: str, source_lang: str, target_lang: str,
+                   timeout: Any = None) -> Dict[str, Any]:
+            if api_url == primary:
+                return {"error": "api_error", "status": 503, "api": "Lingva"}
+            return {"translated_text": "Привет", "source_language": "en", "confidence": 100, "api": "Lingva"}
+
+        configure_mirrors(primary, [mirror])
+        started = time.monotonic()
+        with patch("api_client.rapidapi_client._translate_lingva", side_effect=lingva):
+            results = [translate_text(primary, f"Hello {index}", "en", "ru") for index in range(3)]
+        elapsed = time.monotonic() - started
+
+        assert all(result["translated_text"] == "Привет" for result in results)
+        assert elapsed < 0.5
+        assert get_rate_limit_stats()["lingva"]["overloads"] == 0
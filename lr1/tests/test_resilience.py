@@ -0,0 +1,288 @@
+"""Тесты для повторов запросов и автоматического выключателя."""
+
+import random
+from dataclasses import replace
+from typing import Any, Dict, List
+import pytest
+import requests
+from unittest.mock import patch
+from conftest import FakeClock
+from config import CONFIG
+from api_client.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, RetryPolicy, is_retryable
+from api_client.providers import configure_endpoint
+from api_client.rapidapi_client import translate_text, configure_mirrors, get_breaker_stats, _RETRY_POLICY
+
+MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+OK = {"translated_text": "Привет", "source_language": "en", "confidence": 100, "api": "MyMemory"}
+
+
+class TestRetryPolicy:
+    """Тесты для политики повторов."""
+
+    def test_delay_is_jittered_and_capped(self) -> None:
+        """Тест: задержка случайна в пределах экспоненциального потолка.
+
+        Что делаю:
+            Считаю 200 задержек для каждой попытки.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        policy = RetryPolicy(retries=5, base_delay=0.1, max_delay=0.5, rng=random.Random(1))
+
+        for attempt, ceiling in enumerate([0.1, 0.2, 0.4, 0.5, 0.5]):
+            delays = [policy.delay(attempt) for _ in range(200)]
+            assert all(0 <= delay <= ceiling for delay in delays)
+            assert max(delays) > ceiling * 0.8
+            assert len(set(delays)) > 100
+
+    def test_retryable_results(self) -> None:
+        """Тест разделения временных и постоянных ошибок.
+
+        Что делаю:
+            Проверяю сетевую ошибку, 5xx, 408, 429, исчерпанную квоту, 400, 403 и успех.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        assert is_retryable({"error": "request_failed"})
+        assert is_retryable({"error": "api_error", "status": 502})
+        assert is_retryable({"error": "api_error", "status": "503"})
+        assert is_retryable({"error": "api_error", "status": 429})
+        assert not is_retryable({"error": "quota_exceeded", "status": 429})
+        assert not is_retryable({"error": "api_error", "status": 400})
+        assert not is_retryable({"error": "api_error", "status": 403})
+        assert not is_retryable({"error": "empty_text"})
+        assert not is_retryable(OK)
+
+
+class TestCircuitBreaker:
+    """Тесты для автоматического выключателя."""
+
+    def test_opens_after_threshold_and_recovers(self) -> None:
+        """Тест полного цикла closed -> open -> half_open -> closed.
+
+        Что делаю:
+            Регистрирую 3 сбоя, жду recovery_timeout и выполняю успешную пробу.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10, clock=clock)
+
+        for _ in range(2):
+            assert breaker.allow()
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.retry_after() == 10
+
+        clock.now = 10.0
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+
+        assert breaker.state == CLOSED
+        assert breaker.stats() == {"state": CLOSED, "consecutive_failures": 0, "trips": 1, "rejected": 2}
+
+    def test_failed_probe_reopens(self) -> None:
+        """Тест: неудачная проба снова размыкает выключатель на recovery_timeout.
+
+        Что делаю:
+            Размыкаю выключатель, жду и регистрирую сбой пробы.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=5, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 5.0
+        assert breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        clock.now = 9.0
+        assert not breaker.allow()
+        clock.now = 10.0
+        assert breaker.allow()
+
+    def test_success_resets_failure_count(self) -> None:
+        """Тест: успех между сбоями обнуляет счётчик подряд идущих сбоев.
+
+        Что делаю:
+            Чередую сбои и успехи при пороге 2.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        breaker = CircuitBreaker(failure_threshold=2)
+        for _ in range(5):
+            breaker.record_failure()
+            breaker.record_success()
+        assert breaker.state == CLOSED
+
+
+class TestClientResilience:
+    """Тесты для повторов и выключателя в translate_text."""
+
+    @pytest.fixture(autouse=True)
+    def _fast_retries(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Разрешает два повтора без задержек и отключает паузу ведра токенов."""
+        monkeypatch.setattr(_RETRY_POLICY, "retries", 2)
+        monkeypatch.setattr(_RETRY_POLICY, "base_delay", 0)
+        monkeypatch.setattr("api_client.rapidapi_client.CONFIG", replace(CONFIG, rate_limit_backoff=0))
+
+    def test_transient_error_is_retried(self) -> None:
+        """Тест: временный сбой повторяется и не попадает к вызывающему.
+
+        Что делаю:
+            Первая попытка падает с 503, вторая успешна.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        responses = [{"error": "api_error", "status": 503, "api": "MyMemory"}, OK]
+
+        with patch("api_client.rapidapi_client._translate_mymemory", side_effect=responses) as mock_translate:
+            result = translate_text(MYMEMORY_URL, "Hello", "en", "ru")
+
+        assert result.pop("timing")["attempts"] == 2
+        assert result == OK
+        assert mock_translate.call_count == 2
+        assert get_breaker_stats()[MYMEMORY_URL]["consecutive_failures"] == 0
+
+    def test_permanent_error_is_not_retried(self) -> None:
+        """Тест: ошибка запроса (400) возвращается с первой попытки.
+
+        Что делаю:
+            Провайдер отвечает 400.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        error = {"error": "api_error", "status": 400, "api": "MyMemory"}
+        with patch("api_client.rapidapi_client._translate_mymemory", return_value=error) as mock_translate:
+            assert translate_text(MYMEMORY_URL, "Hello", "en", "ru")["status"] == 400
+        assert mock_translate.call_count == 1
+
+    def test_exception_is_retried_until_exhausted(self) -> None:
+        """Тест: сетевое исключение повторяется retries раз, затем возвращается request_failed.
+
+        Что делаю:
+            Адаптер всегда бросает ConnectionError.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        down = requests.exceptions.ConnectionError("down")
+        with patch("api_client.rapidapi_client._translate_mymemory", side_effect=down) as mock_translate:
+            result = translate_text(MYMEMORY_URL, "Hello", "en", "ru")
+
+        assert result["error"] == "request_failed"
+        assert mock_translate.call_count == 3
+
+    def test_non_idempotent_provider_is_not_retried(self) -> None:
+        """Тест: запросы провайдера с idempotent=False не повторяются.
+
+        Что делаю:
+            Привязываю URL к MyMemory с idempotent=False и отвечаю 503.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        configure_endpoint(MYMEMORY_URL, "mymemory", idempotent=False)
+        error = {"error": "api_error", "status": 503, "api": "MyMemory"}
+        with patch("api_client.rapidapi_client._translate_mymemory", return_value=error) as mock_translate:
+            translate_text(MYMEMORY_URL, "Hello", "en", "ru")
+        assert mock_translate.call_count == 1
+
+    def test_open_breaker_fails_fast(self) -> None:
+        """Тест: после порога сбоев запросы к конечной точке не отправляются.
+
+        Что делаю:
+            Отправляю разные тексты, пока провайдер падает, и считаю вызовы адаптера.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        calls: List[str] = []
+
+        def down(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+            calls.append(args[2])
+            raise requests.exceptions.ConnectTimeout("timeout")
+
+        with patch("api_client.rapidapi_client._translate_mymemory", side_effect=down):
+            first = translate_text(MYMEMORY_URL, "one", "en", "ru")
+            second = translate_text(MYMEMORY_URL, "two", "en", "ru")
+            third = translate_text(MYMEMORY_URL, "three", "en", "ru")
+
+        assert first["error"] == "request_failed"
+        assert second["error"] == "request_failed"
+        assert third["error"] == "circuit_open"
+        assert len(calls) == 5
+        assert get_breaker_stats()[MYMEMORY_URL]["state"] == OPEN
+
+    def test_mirror_failure_fails_over_without_retry(self) -> None:
+        """Тест: в группе зеркал сбой зеркала сразу передаёт запрос следующему, без повторов.
+
+        Что делаю:
+            Настраиваю Lingva с зеркалом; основной URL отвечает 503, зеркало - успешно.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        primary, mirror = "https://lingva.ml/api/v1", "https://lingva.mirror.local/api/v1"
+        calls: List[str] = []
+
+        def lingva(api_url: str, headers: Dict[str, str], text: str, source_lang: str, target_lang: str,
+                   timeout: Any = None) -> Dict[str, Any]:
+            calls.append(api_url)
+            if api_url == primary:
+                return {"error": "api_error", "status": 503, "api": "Lingva"}
+            return {"translated_text": "Привет", "source_language": "en", "confidence": 100, "api": "Lingva"}
+
+        configure_mirrors(primary, [mirror])
+        with patch("api_client.rapidapi_client._translate_lingva", side_effect=lingva):
+            result = translate_text(primary, "Hello", "en", "ru")
+
+        assert result["translated_text"] == "Привет"
+        assert calls == [primary, mirror]
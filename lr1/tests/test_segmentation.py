@@ -0,0 +1,238 @@
+"""Тесты для разбиения длинных текстов и перевода по сегментам."""
+
+import threading
+import time
+from typing import Any, Dict, List
+from unittest.mock import patch
+from urllib.parse import quote
+from api_client.segmentation import join_segments, split_segments
+from api_client.rapidapi_client import translate_text, translate_many
+from analizer.comparator import compare_translations
+
+MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+LINGVA_URL = "https://lingva.ml/api/v1"
+SENTENCE = "This sentence is about sixty bytes long, give or take a bit."
+PARAGRAPH = " ".join([SENTENCE] * 12) + "\n\n" + " ".join([SENTENCE] * 3)
+
+
+def _echo(api: str, delay: float = 0.0) -> Any:
+    """Строит заменитель адаптера, который возвращает текст в верхнем регистре и запоминает запросы."""
+    calls: List[str] = []
+    lock = threading.Lock()
+
+    def translate(api_url: str, headers: Dict[str, str], text: str, source_lang: str, target_lang: str,
+                  timeout: Any = None) -> Dict[str, Any]:
+        with lock:
+            calls.append(text)
+        time.sleep(delay)
+        return {"translated_text": text.upper(), "source_language": source_lang, "confidence": 100, "api": api}
+
+    translate.calls = calls
+    return translate
+
+
+class TestSplitSegments:
+    """Тесты для split_segments и join_segments."""
+
+    def test_boundaries_and_limit(self) -> None:
+        """Тест: сегменты режутся по предложениям и абзацам и не превышают лимит.
+
+        Что делаю:
+            Разбиваю текст из двух абзацев и одного очень длинного слова с лимитом 25.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        text = "  First sentence here. Second one!  Third?\n\nNew para. " + "x" * 30 + " end.  \n"
+
+        spans = split_segments(text, 25)
+
+        assert [text[start:end] for start, end in spans] == [
+            "First sentence here.", "Second one!  Third?", "New para.", "x" * 25, "xxxxx end."]
+        assert join_segments(text, spans, [text[start:end] for start, end in spans]) == text.strip()
+        assert split_segments("   ", 10) == []
+        assert split_segments("Short.", 10) == [(0, 6)]
+
+    def test_paragraph_is_a_hard_break(self) -> None:
+        """Тест: предложения разных абзацев не склеиваются даже при большом лимите.
+
+        Что делаю:
+            Разбиваю два коротких абзаца с лимитом 1000.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        text = "One. Two.\nThree."
+        assert [text[start:end] for start, end in split_segments(text, 1000)] == ["One. Two.", "Three."]
+
+    def test_custom_size(self) -> None:
+        """Тест: лимит считается функцией size (длина URL-кодированного текста для Lingva).
+
+        Что делаю:
+            Разбиваю кириллицу (6 символов кодировки на букву) с лимитом 60.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        text = "Привет мир. Как дела? Всё хорошо."
+        spans = split_segments(text, 60, lambda part: len(quote(part)))
+        assert all(len(quote(text[start:end])) <= 60 for start, end in spans)
+        assert len(spans) > 1
+
+
+class TestSegmentedTranslation:
+    """Тесты для перевода длинных текстов по сегментам."""
+
+    def test_long_text_is_split_and_reassembled(self) -> None:
+        """Тест: длинный текст уходит запросами в пределах лимита и собирается по порядку.
+
+        Что делаю:
+            Перевожу через MyMemory (лимит 500 байт) два абзаца примерно на 900 байт.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        echo = _echo("MyMemory")
+        with patch("api_client.rapidapi_client._translate_mymemory", side_effect=echo):
+            result = translate_text(MYMEMORY_URL, PARAGRAPH, "en", "ru")
+
+        assert result["translated_text"] == PARAGRAPH.upper()
+        assert len(echo.calls) == 3
+        assert all(len(call.encode("utf-8")) <= 500 for call in echo.calls)
+        assert [(segment["start"], segment["end"]) for segment in result["segments"]][-1][1] == len(PARAGRAPH)
+        assert "\n" not in "".join(echo.calls)
+
+    def test_paragraph_breaks_are_not_served_from_cache(self) -> None:
+        """Тест: текст, отличающийся от переведённого только переводами строк, переводится заново.
+
+        Что делаю:
+            Перевожу текст в одну строку, затем тот же текст с абзацем.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        echo = _echo("MyMemory")
+        with patch("api_client.rapidapi_client._translate_mymemory", side_effect=echo):
+            flat = translate_text(MYMEMORY_URL, "first one. second one", "en", "ru")
+            paragraphs = translate_text(MYMEMORY_URL, "first one.\n\nsecond one", "en", "ru")
+
+        assert flat["translated_text"] == "FIRST ONE. SECOND ONE"
+        assert paragraphs["translated_text"] == "FIRST ONE.\n\nSECOND ONE"
+        assert len(echo.calls) == 2
+
+    def test_segments_run_in_parallel(self) -> None:
+        """Тест: сегменты переводятся одновременно.
+
+        Что делаю:
+            Каждый запрос длится 0.2 с; три сегмента должны уложиться меньше чем в 0.5 с.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        echo = _echo("MyMemory", delay=0.2)
+        with patch("api_client.rapidapi_client._translate_mymemory", side_effect=echo):
+            started = time.perf_counter()
+            result = translate_text(MYMEMORY_URL, PARAGRAPH, "en", "ru")
+            elapsed = time.perf_counter() - started
+
+        assert "error" not in result
+        assert len(echo.calls) == 3
+        assert elapsed < 0.5
+
+    def test_segment_error_is_returned(self) -> None:
+        """Тест: ошибка одного сегмента возвращается с его номером.
+
+        Что делаю:
+            Провайдер отвечает 400 на сегмент с «FAIL».
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        echo = _echo("MyMemory")
+
+        def translate(api_url: str, headers: Dict[str, str], text: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+            if "FAIL" in text:
+                return {"error": "api_error", "status": 400, "api": "MyMemory"}
+            return echo(api_url, headers, text, *args, **kwargs)
+
+        text = " ".join([SENTENCE] * 9) + "\nFAIL."
+        with patch("api_client.rapidapi_client._translate_mymemory", side_effect=translate):
+            result = translate_text(MYMEMORY_URL, text, "en", "ru")
+
+        assert result["error"] == "api_error"
+        assert result["segment"] == 2
+
+    def test_translate_many_splits_oversized_segment(self) -> None:
+        """Тест: слишком длинный элемент пачки переводится по частям.
+
+        Что делаю:
+            Перевожу пачку из короткой строки и длинного абзаца через MyMemory.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        echo = _echo("MyMemory")
+        with patch("api_client.rapidapi_client._translate_mymemory", side_effect=echo):
+            results = translate_many(MYMEMORY_URL, ["short", PARAGRAPH], "en", "ru")
+
+        assert [result["translated_text"] for result in results] == ["SHORT", PARAGRAPH.upper()]
+        assert all(len(call.encode("utf-8")) <= 500 for call in echo.calls)
+
+    def test_compare_aligns_segments_across_providers(self) -> None:
+        """Тест: сравнение сопоставляет сегменты провайдеров с разными лимитами.
+
+        Что делаю:
+            Перевожу один текст через MyMemory (500 байт) и Lingva (1500 символов
+            кодировки), портя в переводе Lingva только второй абзац.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        text = " ".join([SENTENCE] * 20) + "\n" + " ".join([SENTENCE] * 2)
+        lingva = _echo("Lingva")
+
+        def broken_lingva(api_url: str, headers: Dict[str, str], segment: str, *args: Any, **kwargs: Any):
+            result = lingva(api_url, headers, segment, *args, **kwargs)
+            if segment == " ".join([SENTENCE] * 2):
+                result["translated_text"] = "something else entirely"
+            return result
+
+        with patch("api_client.rapidapi_client._translate_mymemory", side_effect=_echo("MyMemory")), \
+                patch("api_client.rapidapi_client._translate_lingva", side_effect=broken_lingva):
+            result_a = translate_text(MYMEMORY_URL, text, "en", "ru")
+            result_b = translate_text(LINGVA_URL, text, "en", "ru")
+
+        comparison = compare_translations(result_a, result_b)
+        segments = comparison["segment_similarity"]
+
+        assert len(result_a["segments"]) > len(result_b["segments"])
+        assert [segment["end"] for segment in segments] == [text.index("\n"), len(text)]
+        assert segments[0]["similarity"] == 1.0
+        assert segments[1]["similarity"] < 0.5
@@ -0,0 +1,160 @@
+"""Тесты для алгоритмов схожести строк."""
+
+import difflib
+import random
+import pytest
+from analizer.similarity import (
+    lcs_length, lcs_length_batch, indel_distance, indel_ratio, indel_ratio_batch, quick_ratio, real_quick_ratio,
+    sequence_matcher_ratio, get_similarity_backend,
+)
+from analizer.comparator import _calculate_similarity
+
+
+def _lcs_dp(text_a: str, text_b: str) -> int:
+    """Эталонная LCS динамическим программированием."""
+    previous = [0] * (len(text_b) + 1)
+    for char_a in text_a:
+        current = [0]
+        for index, char_b in enumerate(text_b):
+            current.append(previous[index] + 1 if char_a == char_b else max(previous[index + 1], current[-1]))
+        previous = current
+    return previous[-1]
+
+
+class TestSimilarity:
+    """Тесты для analizer.similarity."""
+
+    def test_lcs_matches_dynamic_programming(self) -> None:
+        """Тест бит-параллельной LCS на случайных строках.
+
+        Что делаю:
+            Сравниваю lcs_length с эталонной реализацией на 200 парах строк.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        rng = random.Random(42)
+        for _ in range(200):
+            text_a = "".join(rng.choice("abcdе ") for _ in range(rng.randint(0, 70)))
+            text_b = "".join(rng.choice("abcdе ") for _ in range(rng.randint(0, 70)))
+            assert lcs_length(text_a, text_b) == _lcs_dp(text_a, text_b)
+
+    def test_lcs_batch_matches_scalar(self) -> None:
+        """Тест: lcs_length_batch и indel_ratio_batch совпадают со скалярными функциями.
+
+        Что делаю:
+            Сравниваю 600 пар длиной до 150 символов и их начала до 60 символов
+            (одно и несколько слов uint64, пустые строки, символ с кодом 0,
+            кириллица), а также 3 пары по 3000 символов.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        rng = random.Random(3)
+        alphabet = "abcdе \x00"
+        texts_a = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 150))) for _ in range(600)]
+        texts_b = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 150))) for _ in range(600)]
+        texts_a += ["".join(rng.choice("ab") for _ in range(3000)) for _ in range(3)]
+        texts_b += ["".join(rng.choice("abc") for _ in range(2900)) for _ in range(3)]
+
+        for limit in (60, 3000):
+            pairs = [(text_a[:limit], text_b[:limit]) for text_a, text_b in zip(texts_a, texts_b)]
+            expected = [lcs_length(text_a, text_b) for text_a, text_b in pairs]
+            assert lcs_length_batch(*zip(*pairs)).tolist() == expected
+        for cutoff in (0.0, 0.7):
+            expected = [indel_ratio(text_a, text_b, cutoff) for text_a, text_b in zip(texts_a, texts_b)]
+            assert indel_ratio_batch(texts_a, texts_b, cutoff).tolist() == expected
+        assert lcs_length_batch([], []).tolist() == []
+
+    def test_indel_ratio_values(self) -> None:
+        """Тест значений Indel-расстояния и схожести.
+
+        Что делаю:
+            Проверяю известные пары строк.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        assert indel_distance("kitten", "sitting") == 5
+        assert indel_ratio("kitten", "sitting") == pytest.approx(8 / 13)
+        assert indel_ratio("", "") == 1.0
+        assert indel_ratio("abc", "") == 0.0
+        assert indel_ratio("привет", "привет") == 1.0
+
+    def test_upper_bounds(self) -> None:
+        """Тест: quick_ratio и real_quick_ratio не меньше точной схожести.
+
+        Что делаю:
+            Проверяю порядок оценок на случайных строках.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        rng = random.Random(7)
+        for _ in range(100):
+            text_a = "".join(rng.choice("abc ") for _ in range(rng.randint(1, 40)))
+            text_b = "".join(rng.choice("abcd") for _ in range(rng.randint(1, 40)))
+            exact = indel_ratio(text_a, text_b)
+            assert exact <= quick_ratio(text_a, text_b) <= real_quick_ratio(text_a, text_b)
+
+    def test_score_cutoff(self) -> None:
+        """Тест отсечки по порогу схожести.
+
+        Что делаю:
+            Считаю схожесть с порогом выше и ниже точного значения.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        exact = indel_ratio("kitten", "sitting")
+
+        assert indel_ratio("kitten", "sitting", score_cutoff=0.9) == 0.0
+        assert indel_ratio("kitten", "sitting", score_cutoff=0.5) == exact
+        assert indel_ratio("a", "a" * 50, score_cutoff=0.5) == 0.0
+
+    def test_sequence_matcher_reference(self) -> None:
+        """Тест эталонного режима SequenceMatcher.
+
+        Что делаю:
+            Сравниваю с difflib напрямую и через _calculate_similarity.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        expected = difflib.SequenceMatcher(None, "привет, как дела?", "привет, как ты?").ratio()
+
+        assert sequence_matcher_ratio("привет, как дела?", "привет, как ты?") == expected
+        assert _calculate_similarity("Привет, как дела?", "Привет, как ты?", backend="sequence_matcher") == expected
+
+    def test_unknown_backend(self) -> None:
+        """Тест неизвестного имени алгоритма.
+
+        Что делаю:
+            Запрашиваю несуществующий алгоритм.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        with pytest.raises(ValueError):
+            get_similarity_backend("cosine")
@@ -0,0 +1,161 @@
+"""Тесты для объединения одинаковых одновременных запросов."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+import pytest
+from unittest.mock import patch
+from api_client.deadline import Deadline
+from api_client.singleflight import SingleFlight
+from api_client.rapidapi_client import translate_text, get_metrics, get_single_flight_stats
+
+MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+OK = {"translated_text": "Привет", "source_language": "en", "confidence": 100, "api": "MyMemory"}
+
+
+def _slow(result: Dict[str, Any], started: threading.Event, release: threading.Event) -> Any:
+    """Строит функцию, которая сообщает о старте и ждёт разрешения вернуть result."""
+    def call(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+        started.set()
+        release.wait(5)
+        return dict(result)
+    return call
+
+
+class TestSingleFlight:
+    """Тесты для SingleFlight."""
+
+    def test_concurrent_calls_share_one_execution(self) -> None:
+        """Тест: одновременные вызовы с одним ключом выполняют функцию один раз.
+
+        Что делаю:
+            Запускаю 8 вызовов, пока первый ждёт разрешения завершиться.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        group = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def work() -> str:
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "done"
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            leader = executor.submit(group.do, "key", work)
+            started.wait(5)
+            followers = [executor.submit(group.do, "key", work) for _ in range(7)]
+            time.sleep(0.1)
+            release.set()
+
+        assert leader.result() == ("done", False)
+        assert [f.result() for f in followers] == [("done", True)] * 7
+        assert len(calls) == 1
+        assert group.stats() == {"in_flight": 0, "leaders": 1, "shared": 7, "timeouts": 0}
+        assert group.do("key", lambda: "again") == ("again", False)
+
+    def test_error_and_timeout_propagate(self) -> None:
+        """Тест: исключение получают все ждущие, а ждущий с таймаутом выходит раньше.
+
+        Что делаю:
+            Один ждущий ждёт 10 мс и получает TimeoutError, другой ждёт
+            без ограничения и получает исключение ведущего.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        group = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def fail() -> None:
+            started.set()
+            release.wait(5)
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            leader = executor.submit(group.do, "key", fail)
+            started.wait(5)
+            impatient = executor.submit(group.do, "key", fail, 0.01)
+            patient = executor.submit(group.do, "key", fail)
+            with pytest.raises(TimeoutError):
+                impatient.result()
+            release.set()
+            for future in (leader, patient):
+                with pytest.raises(ValueError, match="boom"):
+                    future.result()
+
+        assert group.stats()["timeouts"] == 1
+        assert group.stats()["in_flight"] == 0
+
+
+class TestClientSingleFlight:
+    """Тесты для объединения одинаковых вызовов translate_text."""
+
+    def test_burst_sends_one_request(self) -> None:
+        """Тест: всплеск одинаковых вызовов отправляет один запрос.
+
+        Что делаю:
+            Запускаю 10 одинаковых переводов (с разными пробелами), пока
+            первый запрос не завершён, и ещё один после него.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        started, release = threading.Event(), threading.Event()
+        with patch("api_client.rapidapi_client._translate_mymemory",
+                   side_effect=_slow(OK, started, release)) as mock_translate:
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                first = executor.submit(translate_text, MYMEMORY_URL, "Hello", "en", "ru")
+                started.wait(5)
+                rest = [executor.submit(translate_text, MYMEMORY_URL, " Hello ", "en", "ru") for _ in range(9)]
+                time.sleep(0.1)
+                release.set()
+                results = [first.result()] + [future.result() for future in rest]
+            later = translate_text(MYMEMORY_URL, "Hello", "en", "ru")
+
+        assert mock_translate.call_count == 1
+        assert all(result["translated_text"] == "Привет" for result in results)
+        assert len({id(result) for result in results}) == 10
+        assert sorted(result["timing"]["cache"] for result in results) == ["miss"] + ["shared"] * 9
+        assert later["timing"]["cache"] == "memory"
+        assert get_single_flight_stats()["shared"] == 9
+        assert get_metrics()["counters"]["coalesced_total"] == {(("provider", "mymemory"),): 9}
+
+    def test_waiter_deadline_is_respected(self) -> None:
+        """Тест: ждущий с коротким сроком получает deadline_exceeded, а запрос продолжается.
+
+        Что делаю:
+            Второй вызов ждёт первый со сроком 20 мс.
+
+        Вход:
+            Нет параметров.
+
+        Возвращаю:
+            Ничего (void).
+        """
+        started, release = threading.Event(), threading.Event()
+        with patch("api_client.rapidapi_client._translate_mymemory",
+                   side_effect=_slow(OK, started, release)) as mock_translate:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                first = executor.submit(translate_text, MYMEMORY_URL, "Hello", "en", "ru")
+                started.wait(5)
+                hurried = translate_text(MYMEMORY_URL, "Hello", "en", "ru", Deadline(0.02))
+                release.set()
+                result = first.result()
+
+        assert hurried["error"] == "deadline_exceeded"
+        assert result["translated_text"] == "Привет"
+        assert mock_translate.call_count == 1